@@ -0,0 +1,447 @@
+"""
+Optional NumPy analytics engine.
+
+EventStore keeps Event_Creation in contiguous arrays (event row id, match, person, event type, game
+time and the player's team) together with a small table of matches, and answers score, box score,
+shooting-split, leaderboard and standings questions with vectorized group-bys (np.bincount over dense
+match and player indexes) instead of one SQL aggregation per question. It is loaded once and kept in
+sync by tailing new Event_Creation ids. Rows can commit out of id order (concurrent transactions, TiDB's
+per-server AUTO_INCREMENT caches), so every sync also re-checks the SYNC_ID_WINDOW ids below the highest
+one it has. Deleted events are only dropped by reload(). Seasons moved out of Event_Creation by
+archive.py are read from their archive files on load(), so their scores and box scores stay complete.
+
+The answers have the same shape as the model functions they mirror, so the two can be compared with
+`python benchmark.py --analytics`.
+
+Requires numpy.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+from pymysql.cursors import SSCursor
+
+import archive
+import model
+from event_catalog import BOX_SCORE_COLUMNS
+
+LOAD_BATCH_ROWS = 100000
+# Seconds between syncs of the store returned by get_store()
+SYNC_INTERVAL = 5
+# Ids below last_id that sync() checks for rows committed after higher ids
+SYNC_ID_WINDOW = 100000
+# Ids per IN (...) list when fetching rows found by that check
+FETCH_IDS_BATCH = 1000
+
+# model.LEADERBOARD_TOTALS / LEADERBOARD_PERCENTAGES as BOX_SCORE_COLUMNS sums
+LEADERBOARD_VALUES = {
+    'points': ('points',),
+    'rebounds': ('oreb', 'dreb'),
+    'assists': ('ast',),
+    'steals': ('stl',),
+    'blocks': ('blk',),
+}
+LEADERBOARD_SPLITS = {
+    'fg_pct': (('fg2m', 'fg3m'), ('fg2a', 'fg3a')),
+    'fg3_pct': (('fg3m',), ('fg3a',)),
+    'ft_pct': (('ftm',), ('fta',)),
+}
+# Shooting splits of shooting_splits(): (label, made column, attempts column)
+SHOT_SPLITS = (
+    ('ft', 'ftm', 'fta'),
+    ('fg2', 'fg2m', 'fg2a'),
+    ('fg3', 'fg3m', 'fg3a'),
+)
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _membership_keys(person_ids, team_ids):
+    return (np.asarray(person_ids, dtype=np.int64) << 32) | np.asarray(team_ids, dtype=np.int64)
+
+
+def _round_half_up(values, decimals=1):
+    """Rounds like MySQL's ROUND() on exact values (halves away from zero, values here are >= 0)."""
+    scale = 10 ** decimals
+    return np.floor(values * scale + 0.5) / scale
+
+
+class EventStore:
+    """
+    Column store of the play-by-play. All methods are thread-safe.
+
+    The match table is reloaded on every sync, because status changes (e.g. to Completed) do not add
+    events. Team memberships are read on load() and reload() only.
+
+    :param catalog: The EventCatalog that scores events (model.get_event_catalog()).
+    """
+
+    def __init__(self, catalog):
+        self._lock = threading.RLock()
+        self.catalog = catalog
+        size = max([e.id for e in catalog] + [0]) + 1
+        # (len(BOX_SCORE_COLUMNS), max event id + 1): what one event adds to each box score column
+        self._increments = np.zeros((len(BOX_SCORE_COLUMNS), size), dtype=np.int64)
+        for event_id, steps in catalog.box_score_increments().items():
+            for index, amount in steps:
+                self._increments[index, event_id] += amount
+        self._column = {name: i for i, name in enumerate(BOX_SCORE_COLUMNS)}
+
+        self._membership = _EMPTY
+        self._last_id = 0
+        self.ids = np.empty(0, dtype=np.int32)
+        self.match = np.empty(0, dtype=np.int32)
+        self.person = np.empty(0, dtype=np.int32)
+        self.event = np.empty(0, dtype=np.int16)
+        self.game_time = np.empty(0, dtype='datetime64[s]')
+        self.team = np.empty(0, dtype=np.int32)
+        self._on_home = np.zeros(0, dtype=bool)
+        self._on_away = np.zeros(0, dtype=bool)
+        self._midx = np.empty(0, dtype=np.int64)
+        self._pidx = np.empty(0, dtype=np.int64)
+        self.person_ids = _EMPTY
+        self.match_ids = None
+        self.set_matches(_EMPTY, _EMPTY, _EMPTY, np.zeros(0, dtype=bool), _EMPTY, _EMPTY)
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def last_id(self):
+        """Highest event id in the store. Events are stored in the order they were read, not by id."""
+        return self._last_id
+
+    # ----- loading -----
+
+    def set_matches(self, match_ids, home, away, completed, year, phase):
+        """Replaces the match table. year and phase (Phase.id) are -1 for matches without a round."""
+        with self._lock:
+            order = np.argsort(match_ids, kind='stable')
+            match_ids = np.asarray(match_ids, dtype=np.int64)[order]
+            previous = self.match_ids
+            self.match_ids = match_ids
+            self.match_home = np.asarray(home, dtype=np.int64)[order]
+            self.match_away = np.asarray(away, dtype=np.int64)[order]
+            self.match_completed = np.asarray(completed, dtype=bool)[order]
+            self.match_year = np.asarray(year, dtype=np.int64)[order]
+            self.match_phase = np.asarray(phase, dtype=np.int64)[order]
+            if previous is not None and np.array_equal(match_ids[:len(previous)], previous):
+                # Only new matches: existing indexes stay valid, the new matches have no points yet
+                grow = len(match_ids) - len(previous)
+                self.home_score = np.concatenate([self.home_score, np.zeros(grow, dtype=np.int64)])
+                self.away_score = np.concatenate([self.away_score, np.zeros(grow, dtype=np.int64)])
+            else:
+                self._reindex()
+
+    def set_memberships(self, person_ids, team_ids):
+        """Replaces the Person_Team pairs that decide which team an event scores for."""
+        with self._lock:
+            self._membership = np.unique(_membership_keys(person_ids, team_ids))
+            self._reindex()
+
+    def _match_index(self, match_ids):
+        midx = np.searchsorted(self.match_ids, match_ids)
+        if len(midx) and (midx.max() >= len(self.match_ids) or not np.array_equal(self.match_ids[midx], match_ids)):
+            raise ValueError("Events refer to matches missing from the match table")
+        return midx
+
+    def _teams(self, midx, person):
+        """(on_home, on_away, team) of events, as the score queries' Person_Team join decides it."""
+        if not len(midx):
+            return np.zeros(0, dtype=bool), np.zeros(0, dtype=bool), np.empty(0, dtype=np.int32)
+        home, away = self.match_home[midx], self.match_away[midx]
+        on_home = np.isin(_membership_keys(person, home), self._membership)
+        on_away = np.isin(_membership_keys(person, away), self._membership)
+        team = np.where(on_home, home, np.where(on_away, away, -1)).astype(np.int32)
+        return on_home, on_away, team
+
+    def _reindex(self):
+        """Recomputes everything derived from the match table and memberships."""
+        self._midx = self._match_index(self.match)
+        self._on_home, self._on_away, self.team = self._teams(self._midx, self.person)
+        self._rescore()
+
+    def _rescore(self):
+        points = self.points()
+        size = len(self.match_ids)
+        self.home_score = np.bincount(self._midx, weights=points * self._on_home, minlength=size).astype(np.int64)
+        self.away_score = np.bincount(self._midx, weights=points * self._on_away, minlength=size).astype(np.int64)
+
+    def append(self, ids, match_ids, person_ids, event_ids, game_times):
+        """Adds Event_Creation rows that are not in the store yet. The matches must be in the match table."""
+        with self._lock:
+            ids = np.asarray(ids, dtype=np.int32)
+            if not len(ids):
+                return 0
+            match_ids = np.asarray(match_ids, dtype=np.int32)
+            person_ids = np.asarray(person_ids, dtype=np.int32)
+            event_ids = np.asarray(event_ids, dtype=np.int16)
+            midx = self._match_index(match_ids)
+            on_home, on_away, team = self._teams(midx, person_ids)
+
+            self.ids = np.concatenate([self.ids, ids])
+            self._last_id = max(self._last_id, int(ids.max()))
+            self.match = np.concatenate([self.match, match_ids])
+            self.person = np.concatenate([self.person, person_ids])
+            self.event = np.concatenate([self.event, event_ids])
+            self.game_time = np.concatenate([self.game_time, np.asarray(game_times, dtype='datetime64[s]')])
+            self.team = np.concatenate([self.team, team])
+            self._on_home = np.concatenate([self._on_home, on_home])
+            self._on_away = np.concatenate([self._on_away, on_away])
+            self._midx = np.concatenate([self._midx, midx])
+
+            new_persons = np.setdiff1d(person_ids, self.person_ids)
+            if len(new_persons):
+                self.person_ids, self._pidx = np.unique(self.person, return_inverse=True)
+            else:
+                self._pidx = np.concatenate([self._pidx, np.searchsorted(self.person_ids, person_ids)])
+
+            points = self._increments[self._column['points'], event_ids]
+            size = len(self.match_ids)
+            self.home_score += np.bincount(midx, weights=points * on_home, minlength=size).astype(np.int64)
+            self.away_score += np.bincount(midx, weights=points * on_away, minlength=size).astype(np.int64)
+            return len(ids)
+
+    def _load_matches(self):
+        rows = model.query("""
+            SELECT m.id, COALESCE(m.home_team_id, -1) AS home_team_id, COALESCE(m.away_team_id, -1) AS away_team_id,
+                   COALESCE(m.status = 'Completed', 0) AS completed,
+                   COALESCE(ph.year, -1) AS year, COALESCE(ph.id, -1) AS phase
+            FROM `Match` m
+            LEFT JOIN `Round` r ON m.round_id = r.id
+            LEFT JOIN Phase ph ON r.phase_id = ph.id
+        """)
+        columns = ('id', 'home_team_id', 'away_team_id', 'completed', 'year', 'phase')
+        self.set_matches(*(np.array([r[c] for r in rows], dtype=np.int64) for c in columns))
+
+    def _read_events(self, where, params, batch_rows=LOAD_BATCH_ROWS):
+        """Streams the Event_Creation rows matching where into the arrays. Returns the number of new rows."""
+        added = 0
+        with model.get_connection() as con:
+            cur = con.cursor(SSCursor)
+            try:
+                cur.execute(f"""
+                    SELECT id, match_id, COALESCE(person_id, -1), event_id, game_time
+                    FROM Event_Creation
+                    WHERE {where}
+                    ORDER BY id
+                """, params)
+                while True:
+                    rows = cur.fetchmany(batch_rows)
+                    if not rows:
+                        break
+                    ids, matches, persons, events, times = zip(*rows)
+                    added += self.append(ids, matches, persons, events, times)
+            finally:
+                cur.close()
+        return added
+
+    def _read_archives(self):
+        """
+        Adds the events of archived seasons (see archive.py) from their files. Rows an interrupted
+        archive run left in Event_Creation are already in the store and skipped. Returns the number of new rows.
+        """
+        added = 0
+        for _, file_name in sorted(model.get_archived_seasons().items()):
+            season = archive.open_season(os.path.join(model.ARCHIVE_DIR, file_name))
+            records = season.records
+            new = ~np.isin(records['id'], self.ids)
+            game_times = season.clock().astype('datetime64[s]')
+            game_times[(records['flags'] & archive.NO_GAME_TIME).astype(bool)] = np.datetime64('NaT')
+            added += self.append(records['id'][new], records['match_id'][new], records['person_id'][new],
+                                 records['event_id'][new], game_times[new])
+        return added
+
+    def _tail_events(self):
+        """Reads the events after last_id. Returns the number of new rows."""
+        return self._read_events("id > %s", (self.last_id,))
+
+    def _window_ids(self, low, high):
+        """Ids of the Event_Creation rows with low < id <= high."""
+        with model.get_connection() as con:
+            with con.cursor() as cur:
+                cur.execute("SELECT id FROM Event_Creation WHERE id > %s AND id <= %s", (low, high))
+                return np.fromiter((row[0] for row in cur.fetchall()), dtype=np.int64)
+
+    def missed_ids(self, window=SYNC_ID_WINDOW):
+        """Ids within window below last_id that are in Event_Creation but not in the store."""
+        low = max(0, self.last_id - window)
+        return np.setdiff1d(self._window_ids(low, self.last_id), self.ids[self.ids > low])
+
+    def _catch_up(self, window=SYNC_ID_WINDOW):
+        """Reads the events missed_ids() finds. Returns the number of new rows."""
+        missed = self.missed_ids(window).tolist()
+        added = 0
+        for start in range(0, len(missed), FETCH_IDS_BATCH):
+            chunk = missed[start:start + FETCH_IDS_BATCH]
+            added += self._read_events(f"id IN ({', '.join(['%s'] * len(chunk))})", chunk)
+        return added
+
+    def load(self):
+        """Reads the match table, memberships and every event, archived seasons included. Returns the number of events."""
+        with self._lock:
+            self._load_matches()
+            rows = model.query("SELECT person_id, team_id FROM Person_Team")
+            self.set_memberships([r['person_id'] for r in rows], [r['team_id'] for r in rows])
+            self._tail_events()
+            self._read_archives()
+            self.synced_at = time.monotonic()
+            return len(self)
+
+    def sync(self):
+        """
+        Picks up new events, including ones committed below last_id since the last sync (see missed_ids()),
+        and match status changes. Returns the number of new events. A deleted match leaves events behind that can no longer be placed, so the store is reloaded then.
+        """
+        with self._lock:
+            try:
+                self._load_matches()
+            except ValueError:
+                previous = len(self)
+                return self.reload() - previous
+            added = self._catch_up() + self._tail_events()
+            self.synced_at = time.monotonic()
+            return added
+
+    def reload(self):
+        """Starts over from an empty store, dropping events deleted from the database."""
+        with self._lock:
+            self.__init__(self.catalog)
+            return self.load()
+
+    # ----- queries -----
+
+    def points(self):
+        """Points of every event."""
+        return self._increments[self._column['points'], self.event]
+
+    def _mask(self, year=None, completed=False, person_id=None, match_id=None):
+        with self._lock:
+            mask = np.ones(len(self), dtype=bool)
+            if completed:
+                mask &= self.match_completed[self._midx]
+            if year is not None:
+                mask &= self.match_year[self._midx] == year
+            if person_id is not None:
+                mask &= self.person == person_id
+            if match_id is not None:
+                mask &= self.match == match_id
+            return mask
+
+    def _player_sums(self, mask, columns):
+        """Per player (dense index) sum of the given BOX_SCORE_COLUMNS over the masked events."""
+        weights = self._increments[[self._column[c] for c in columns]].sum(axis=0)[self.event[mask]]
+        return np.bincount(self._pidx[mask], weights=weights, minlength=len(self.person_ids)).astype(np.int64)
+
+    def _player_games(self, mask):
+        """Per player (dense index) number of matches with an event among the masked events."""
+        pairs = np.unique(self._pidx[mask] * max(1, len(self.match_ids)) + self._midx[mask])
+        return np.bincount(pairs // max(1, len(self.match_ids)), minlength=len(self.person_ids))
+
+    def scores(self, match_ids):
+        """{match_id: {home_team_id: score, away_team_id: score}} like model.get_scores_for_matches()."""
+        with self._lock:
+            wanted = np.unique(np.asarray(list(match_ids), dtype=np.int64))
+            midx = np.searchsorted(self.match_ids, wanted)
+            found = midx < len(self.match_ids)
+            found[found] = self.match_ids[midx[found]] == wanted[found]
+            midx = midx[found]
+            return {
+                int(self.match_ids[i]): {int(self.match_home[i]): int(self.home_score[i]),
+                                         int(self.match_away[i]): int(self.away_score[i])}
+                for i in midx
+            }
+
+    def box_score(self, person_id, year=None, match_id=None):
+        """A player's 'games' and BOX_SCORE_COLUMNS totals, like model.get_player_box_score()."""
+        with self._lock:
+            mask = self._mask(year=year, person_id=person_id, match_id=match_id)
+            events = self.event[mask]
+            line = {'games': int(len(np.unique(self._midx[mask])))}
+            for name, index in self._column.items():
+                line[name] = int(self._increments[index, events].sum())
+            return line
+
+    def shooting_splits(self, person_id, year=None):
+        """{'<split>_made', '<split>_attempts', '<split>_pct'} for free throws, 2- and 3-pointers."""
+        line = self.box_score(person_id, year=year)
+        splits = {}
+        for label, made, attempts in SHOT_SPLITS:
+            splits[f'{label}_made'] = line[made]
+            splits[f'{label}_attempts'] = line[attempts]
+            splits[f'{label}_pct'] = round(100 * line[made] / line[attempts], 1) if line[attempts] else None
+        return splits
+
+    def leaderboard(self, stat, year=None, limit=10, min_attempts=None):
+        """Top players for one stat over completed matches, like model.get_leaderboard()."""
+        with self._lock:
+            mask = self._mask(year=year, completed=True)
+            games = self._player_games(mask)
+            if stat in LEADERBOARD_VALUES:
+                values = self._player_sums(mask, LEADERBOARD_VALUES[stat])
+                qualified = games > 0
+                extra = {}
+            elif stat in LEADERBOARD_SPLITS:
+                made_columns, attempt_columns = LEADERBOARD_SPLITS[stat]
+                made = self._player_sums(mask, made_columns)
+                attempts = self._player_sums(mask, attempt_columns)
+                default_min = model.LEADERBOARD_PERCENTAGES[stat][3]
+                qualified = (games > 0) & (attempts >= max(1, default_min if min_attempts is None else min_attempts))
+                values = _round_half_up(100 * made / np.maximum(attempts, 1))
+                extra = {'made': made, 'attempts': attempts}
+            else:
+                raise ValueError(f"Unknown leaderboard stat: {stat}")
+
+            # Events without a person (NULL person_id) do not rank
+            candidates = np.flatnonzero(qualified & (self.person_ids >= 0))
+            person_ids = self.person_ids[candidates]
+            top = candidates[np.lexsort((person_ids, -values[candidates]))][:limit]
+            rows = [
+                {'person_id': int(self.person_ids[i]), 'games': int(games[i]), 'value': values[i].item(),
+                 **{k: int(v[i]) for k, v in extra.items()}}
+                for i in top
+            ]
+        if rows:
+            names = {r['id']: r for r in model.query(
+                f"SELECT id, first_name, last_name FROM Person WHERE id IN ({', '.join(['%s'] * len(rows))})",
+                [r['person_id'] for r in rows])}
+            for row in rows:
+                person = names.get(row['person_id'], {})
+                row['first_name'], row['last_name'] = person.get('first_name'), person.get('last_name')
+        return rows
+
+    def phase_matches(self, phase_id):
+        """Completed matches of a phase as dicts with team ids and scores."""
+        with self._lock:
+            idx = np.flatnonzero((self.match_phase == phase_id) & self.match_completed)
+            return [
+                {'id': int(self.match_ids[i]), 'home_team_id': int(self.match_home[i]), 'away_team_id': int(self.match_away[i]),
+                 'home_score': int(self.home_score[i]), 'away_score': int(self.away_score[i])}
+                for i in idx
+            ]
+
+    def group_standings(self, phase_id):
+        """Group stage standings of a phase, like model.calculate_group_stage_standings()."""
+        matches = self.phase_matches(phase_id)
+        names = {r['id']: r['name'] for r in model.cached_query("SELECT id, name FROM Team", tables=('Team',))}
+        for m in matches:
+            m['home_name'], m['away_name'] = names.get(m['home_team_id']), names.get(m['away_team_id'])
+        return model.compute_group_standings(matches)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store(sync_interval=SYNC_INTERVAL):
+    """The process-wide EventStore: loaded on first use and synced when older than sync_interval seconds."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EventStore(model.get_event_catalog())
+            _store.load()
+        elif time.monotonic() - _store.synced_at > sync_interval:
+            _store.sync()
+        return _store
@@ -0,0 +1,406 @@
+"""
+Compact archive of finished seasons' events.
+
+Archiving a season moves its Event_Creation rows into one binary file, ARCHIVE_DIR/season_<year>.evt,
+and records it in Archived_Season. Match_Score and Player_Match_Stats keep their rows, so scores,
+standings, box scores and leaderboards do not change. The model reads archived play-by-play from the
+files (see model.get_match_stats_page and model.get_player_stats_page), and so does the NumPy
+analytics.EventStore when it loads.
+
+A file is a HEADER_SIZE-byte header followed by fixed-width RECORD_DTYPE records, sorted like the
+match event pages: by match, game clock, event type and id. The clock is delta-encoded. The first event
+of a match stores its offset from the header's base time, and every other event stores its distance to
+the previous event of the match. Events recorded without a game clock store their recording time
+instead and are flagged NO_GAME_TIME. The recording time (real_time) is kept as its offset from the
+clock, so a restored season gets it back. Files are opened with mmap and read as zero-copy NumPy views.
+
+    python archive.py --finished
+    python archive.py 2003 2004
+    python archive.py --restore 2003
+
+Requires numpy.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+
+import numpy as np
+import pymysql
+from pymysql.cursors import SSCursor
+
+import model
+
+MAGIC = b'BBEVARCH'
+FORMAT_VERSION = 2
+# magic, format version, record size, season year, record count, base time (epoch seconds)
+HEADER = struct.Struct('<8sHHiqq')
+HEADER_SIZE = 64
+RECORD_DTYPE = np.dtype([
+    ('id', '<i4'),
+    ('match_id', '<i4'),
+    ('person_id', '<i4'),
+    ('clock', '<i4'),
+    ('real_offset', '<i4'),
+    ('event_id', 'u1'),
+    ('flags', 'u1'),
+])
+# Version 1 files have no real_offset: their real_time reads back as the clock
+RECORD_DTYPES = {
+    1: np.dtype([(name, RECORD_DTYPE.fields[name][0]) for name in RECORD_DTYPE.names if name != 'real_offset']),
+    FORMAT_VERSION: RECORD_DTYPE,
+}
+NO_GAME_TIME = 1
+NO_REAL_TIME = 2
+
+LOAD_BATCH_ROWS = 100000
+DELETE_MATCH_BATCH = 50
+DELETE_CHUNK_ROWS = 5000
+RESTORE_CHUNK_ROWS = 5000
+
+
+def season_file_name(year):
+    return f'season_{year}.evt'
+
+
+def _seconds(times):
+    """Naive datetimes (or None) -> int64 epoch seconds, NaT as the int64 minimum."""
+    return np.asarray(times, dtype='datetime64[s]').astype(np.int64)
+
+
+def encode_records(ids, match_ids, person_ids, event_ids, game_times, real_times):
+    """
+    Sorts and delta-encodes events. Returns (records, base_time).
+    Events without a game clock are placed at their real_time, like COALESCE(game_time, real_time).
+    """
+    game = _seconds(game_times)
+    no_game_time = np.isnat(np.asarray(game_times, dtype='datetime64[s]'))
+    real = _seconds(real_times)
+    no_real_time = np.isnat(np.asarray(real_times, dtype='datetime64[s]'))
+    clock = np.where(no_game_time, real, game)
+    unknown = clock == np.iinfo(np.int64).min
+    if unknown.any():
+        # Neither clock nor recording time: placed at the start of the season
+        clock[unknown] = clock[~unknown].min() if (~unknown).any() else 0
+    ids = np.asarray(ids, dtype=np.int64)
+    match_ids = np.asarray(match_ids, dtype=np.int64)
+    event_ids = np.asarray(event_ids, dtype=np.int64)
+
+    order = np.lexsort((ids, event_ids, clock, match_ids))
+    records = np.zeros(len(order), dtype=RECORD_DTYPE)
+    records['id'] = ids[order]
+    records['match_id'] = match_ids[order]
+    records['person_id'] = np.asarray(person_ids, dtype=np.int64)[order]
+    records['event_id'] = event_ids[order]
+    records['flags'] = np.where(no_game_time[order], NO_GAME_TIME, 0) | np.where(no_real_time[order], NO_REAL_TIME, 0)
+    if not len(records):
+        return records, 0
+
+    clock = clock[order]
+    real_offset = np.where(no_real_time[order], clock, real[order]) - clock
+    if np.abs(real_offset).max() > np.iinfo(np.int32).max:
+        raise ValueError("An event was recorded too long after its game clock to encode")
+    records['real_offset'] = real_offset
+    base_time = int(clock.min())
+    first = np.ones(len(clock), dtype=bool)
+    first[1:] = records['match_id'][1:] != records['match_id'][:-1]
+    delta = np.empty(len(clock), dtype=np.int64)
+    delta[first] = clock[first] - base_time
+    rest = np.flatnonzero(~first)
+    delta[rest] = clock[rest] - clock[rest - 1]
+    if delta.max() > np.iinfo(np.int32).max:
+        raise ValueError("The season's events span too long a time to encode")
+    records['clock'] = delta
+    return records, base_time
+
+
+def write_season_file(path, year, records, base_time):
+    """Writes an archive file. It is written next to path and renamed, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    partial = path + '.partial'
+    with open(partial, 'wb') as f:
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_DTYPE.itemsize, year, len(records), base_time)
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        records.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+
+class SeasonArchive:
+    """Read-only, memory-mapped view of one season file. records is a zero-copy view of the file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, record_size, self.year, count, self.base_time = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            magic = None
+        dtype = RECORD_DTYPES.get(version) if magic == MAGIC else None
+        if dtype is None or record_size != dtype.itemsize:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a season archive this version can read")
+        if len(self._mmap) != HEADER_SIZE + count * record_size:
+            self._mmap.close()
+            raise ValueError(f"{path} is truncated")
+        self.records = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=HEADER_SIZE)
+        self._clock = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmaps the file. The views into it are dropped first, as mmap cannot close while they exist."""
+        self.records = self._clock = None
+        self._mmap.close()
+
+    def match_range(self, match_id):
+        """(start, stop) of a match's records."""
+        matches = self.records['match_id']
+        return (int(np.searchsorted(matches, match_id, 'left')),
+                int(np.searchsorted(matches, match_id, 'right')))
+
+    def clock(self):
+        """Absolute clock (epoch seconds) of every record. Decoded once, then kept."""
+        if self._clock is None:
+            delta = self.records['clock'].astype(np.int64)
+            first = np.ones(len(delta), dtype=bool)
+            first[1:] = self.records['match_id'][1:] != self.records['match_id'][:-1]
+            starts = np.flatnonzero(first)
+            total = np.cumsum(delta)
+            before = total[starts] - delta[starts]
+            self._clock = self.base_time + total - np.repeat(before, np.diff(np.append(starts, len(delta))))
+        return self._clock
+
+    def _rows(self, index, clock):
+        """(id, match_id, person_id, event_id, sort_time, game_time) tuples for record indexes, with datetimes."""
+        records = self.records[index]
+        times = clock.astype('datetime64[s]').tolist()
+        no_game_time = (records['flags'] & NO_GAME_TIME).astype(bool).tolist()
+        return [
+            (int(r['id']), int(r['match_id']), int(r['person_id']), int(r['event_id']), t, None if missing else t)
+            for r, t, missing in zip(records, times, no_game_time)
+        ]
+
+    def real_times(self, index, clock):
+        """real_time (datetime or None) of record indexes whose absolute clock is given."""
+        records = self.records[index]
+        if 'real_offset' not in records.dtype.names:
+            return clock.astype('datetime64[s]').tolist()
+        times = (clock + records['real_offset']).astype('datetime64[s]').tolist()
+        missing = (records['flags'] & NO_REAL_TIME).astype(bool).tolist()
+        return [None if m else t for t, m in zip(times, missing)]
+
+    def match_events(self, match_id):
+        """A match's events in page order; only the match's own clock deltas are decoded."""
+        start, stop = self.match_range(match_id)
+        clock = self.base_time + np.cumsum(self.records['clock'][start:stop].astype(np.int64))
+        return self._rows(np.arange(start, stop), clock)
+
+    def person_events(self, person_id, after_id=0, limit=None):
+        """A person's events with ids above after_id, in id order (at most limit of them)."""
+        index = np.flatnonzero((self.records['person_id'] == person_id) & (self.records['id'] > after_id))
+        index = index[np.argsort(self.records['id'][index], kind='stable')][:limit]
+        return self._rows(index, self.clock()[index])
+
+
+_open = {}
+_open_lock = threading.Lock()
+
+
+def open_season(path):
+    """The SeasonArchive of a file, opened once per process."""
+    with _open_lock:
+        season = _open.get(path)
+        if season is None:
+            season = _open[path] = SeasonArchive(path)
+        return season
+
+
+def _forget(path):
+    """Drops a file from open_season() before it is replaced or its season is restored."""
+    with _open_lock:
+        _open.pop(path, None)
+
+
+def finished_seasons():
+    """Seasons that are not the latest one, have matches and have none Scheduled or Ongoing, not yet archived."""
+    return [row['year'] for row in model.query("""
+        SELECT p.year
+        FROM Phase p
+        JOIN `Round` r ON r.phase_id = p.id
+        JOIN `Match` m ON m.round_id = r.id
+        WHERE p.year < (SELECT MAX(year) FROM Season)
+          AND p.year NOT IN (SELECT year FROM Archived_Season)
+        GROUP BY p.year
+        HAVING SUM(m.status IN ('Scheduled', 'Ongoing')) = 0
+        ORDER BY p.year
+    """)]
+
+
+def _season_match_ids(year):
+    return [row['id'] for row in model.query("""
+        SELECT m.id FROM `Match` m
+        JOIN `Round` r ON m.round_id = r.id
+        JOIN Phase p ON r.phase_id = p.id
+        WHERE p.year = %s
+        ORDER BY m.id
+    """, (year,))]
+
+
+def _read_season_events(match_ids):
+    """Streams the events of the given matches into six columns."""
+    columns = [[] for _ in range(6)]
+    with model.get_connection() as con:
+        cur = con.cursor(SSCursor)
+        try:
+            for start in range(0, len(match_ids), DELETE_MATCH_BATCH):
+                batch = match_ids[start:start + DELETE_MATCH_BATCH]
+                cur.execute(f"""
+                    SELECT id, match_id, COALESCE(person_id, -1), event_id, game_time, real_time
+                    FROM Event_Creation
+                    WHERE match_id IN ({', '.join(['%s'] * len(batch))})
+                """, batch)
+                while True:
+                    rows = cur.fetchmany(LOAD_BATCH_ROWS)
+                    if not rows:
+                        break
+                    for column, values in zip(columns, zip(*rows)):
+                        column.extend(values)
+        finally:
+            cur.close()
+    return columns
+
+
+def _delete_archived_events(event_creation_ids):
+    """
+    Deletes the archived rows from Event_Creation, one short transaction per DELETE_CHUNK_ROWS ids.
+    Only ids that are in the file are deleted, so nothing inserted after it was written is lost.
+    """
+    for start in range(0, len(event_creation_ids), DELETE_CHUNK_ROWS):
+        batch = event_creation_ids[start:start + DELETE_CHUNK_ROWS]
+        with model.get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                cur.execute(f"DELETE FROM Event_Creation WHERE id IN ({', '.join(['%s'] * len(batch))})", batch)
+            con.commit()
+    model.invalidate_tables('Event_Creation')
+
+
+def archive_season(year, directory=None):
+    """
+    Moves a season's events into its archive file. The file is written and verified, the season is
+    recorded in Archived_Season (from then on reads go to the file) and only then are the rows deleted.
+    Running it again for an archived season finishes an interrupted delete.
+    Returns the number of archived events, or None on failure.
+    """
+    directory = directory or model.ARCHIVE_DIR
+    archived = model.get_archived_seasons()
+    try:
+        unfinished = model.query("""
+            SELECT COUNT(*) AS n FROM `Match` m
+            JOIN `Round` r ON m.round_id = r.id
+            JOIN Phase p ON r.phase_id = p.id
+            WHERE p.year = %s AND m.status IN ('Scheduled', 'Ongoing')
+        """, (year,))[0]['n']
+        if unfinished:
+            return None
+        if year in archived:
+            season = open_season(os.path.join(directory, archived[year]))
+            _delete_archived_events(season.records['id'].tolist())
+            return len(season)
+
+        columns = _read_season_events(_season_match_ids(year))
+        records, base_time = encode_records(*columns)
+        path = os.path.join(directory, season_file_name(year))
+        _forget(path)
+        write_season_file(path, year, records, base_time)
+        with SeasonArchive(path) as season:
+            count = len(season)
+            if count != len(columns[0]) or set(season.records['id'].tolist()) != set(columns[0]):
+                raise ValueError(f"{path} does not read back the events written to it")
+
+        with model.get_connection() as con:
+            with con.cursor() as cur:
+                cur.execute(model.ARCHIVED_SEASON_DDL)
+                cur.execute(
+                    "INSERT INTO Archived_Season (year, file_name, events) VALUES (%s, %s, %s)",
+                    (year, season_file_name(year), count)
+                )
+        model.invalidate_tables('Archived_Season')
+        _delete_archived_events(list(columns[0]))
+        return count
+    except (pymysql.Error, OSError, ValueError):
+        return None
+
+
+def restore_season(year, directory=None):
+    """
+    Moves an archived season's events back into Event_Creation and forgets the archive. Events keep
+    their ids and times; only files of format version 1 did not store real_time, which then comes back
+    as the game clock. Returns the number of events, or None on failure.
+    """
+    directory = directory or model.ARCHIVE_DIR
+    archived = model.get_archived_seasons()
+    if year not in archived:
+        return None
+    try:
+        season = open_season(os.path.join(directory, archived[year]))
+        index = np.arange(len(season))
+        clock = season.clock()
+        rows = [
+            (event_creation_id, match_id, None if person_id < 0 else person_id, event_id, real_time, game_time)
+            for (event_creation_id, match_id, person_id, event_id, _, game_time), real_time
+            in zip(season._rows(index, clock), season.real_times(index, clock))
+        ]
+        with model.get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                for start in range(0, len(rows), RESTORE_CHUNK_ROWS):
+                    cur.executemany(
+                        "INSERT IGNORE INTO Event_Creation (id, match_id, person_id, event_id, real_time, game_time) "
+                        "VALUES (%s, %s, %s, %s, %s, %s)",
+                        rows[start:start + RESTORE_CHUNK_ROWS]
+                    )
+                cur.execute("DELETE FROM Archived_Season WHERE year = %s", (year,))
+            con.commit()
+        model.invalidate_tables('Event_Creation', 'Archived_Season')
+        _forget(season.path)
+        return len(rows)
+    except (pymysql.Error, OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move finished seasons' events into compact archive files.")
+    parser.add_argument('years', type=int, nargs='*', metavar='YEAR', help="Seasons to archive")
+    parser.add_argument('--finished', action='store_true', help="Archive every finished season but the latest")
+    parser.add_argument('--restore', type=int, nargs='+', metavar='YEAR', help="Move archived seasons back into the database")
+    args = parser.parse_args(argv)
+
+    if args.restore:
+        results = {year: restore_season(year) for year in args.restore}
+        verb = 'restored'
+    else:
+        years = sorted(set(args.years) | set(finished_seasons() if args.finished else []))
+        if not years:
+            parser.error("name the seasons to archive or pass --finished")
+        results = {year: archive_season(year) for year in years}
+        verb = 'archived'
+    for year, events in results.items():
+        print(f"{year}: {'failed' if events is None else f'{events} events {verb}'}")
+    return 1 if None in results.values() else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from flask import Flask
+from pymysql.cursors import DictCursor
 from config import Config
 from . import db
 from .extensions import login_manager, bcrypt
@@ -16,7 +17,7 @@ def create_app(config_class=Config):
     def load_user(user_id):
         from .models import User
         db_conn = db.get_db()
-        cursor = db_conn.cursor(dictionary=True)
+        cursor = db_conn.cursor(DictCursor)
         cursor.execute("SELECT * FROM admin WHERE id = %s", (user_id,))
         user_data = cursor.fetchone()
         cursor.close()
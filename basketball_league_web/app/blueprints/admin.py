@@ -3,12 +3,27 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session, abort, flash
 from flask_login import login_required
-from app import db
-from model import get_seasons, get_phases_by_season, get_rounds_by_phase, get_teams, create_match as create_match_model, create_player
+from model import get_seasons, get_phases_by_season, get_rounds_by_phase, get_teams, create_match as create_match_model, create_match_event, create_match_events_bulk, create_player, create_team as create_team_model, get_event_catalog, get_match_roster, get_match_with_teams, get_scores, run_concurrently
+from app.live import publish_match_update
 
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Shorthands the scorer page sends, mapped to Event names.
+SCORER_EVENT_TYPES = {
+    '2pt': '2-Point Field Goal Made',
+    '3pt': '3-Point Field Goal Made',
+    'foul': 'Personal Foul'
+}
+
+MAX_BULK_EVENTS = 5000
+
+def announce_events(match_id, events):
+    """Pushes newly recorded events and the match's new score to the live streams (one score lookup per write)."""
+    scores = get_scores(match_id)
+    if scores:
+        publish_match_update(match_id, events, list(scores.items()))
+
 @admin_bp.before_request
 @login_required
 def before_request():
@@ -23,11 +38,9 @@ def create_team():
     if request.method == 'POST':
         name = request.form['name']
         
-        db_conn = db.get_db()
-        cursor = db_conn.cursor()
-        cursor.execute("INSERT INTO Team (name) VALUES (%s)", (name,))
-        db_conn.commit()
-        cursor.close()
+        # Through the model so cached team lists are invalidated.
+        if not create_team_model(name):
+            flash('Error creating team.', 'danger')
         
         return redirect(url_for('admin.dashboard'))
     return render_template('admin/create_team.html')
@@ -35,38 +48,15 @@ def create_team():
 
 @admin_bp.route('/match/<int:id>/scorer')
 def match_scorer(id):
-    db_conn = db.get_db()
-    cursor = db_conn.cursor(dictionary=True)
-    cursor.execute("""
-        SELECT m.*, ht.name as home_team_name, at.name as away_team_name
-        FROM `Match` m
-        JOIN Team ht ON m.home_team_id = ht.id
-        JOIN Team at ON m.away_team_id = at.id
-        WHERE m.id = %s
-    """, (id,))
-    match = cursor.fetchone()
-
+    # The rosters are looked up through the match, so all three queries run at once
+    match, home_players, away_players = run_concurrently(
+        (get_match_with_teams, id),
+        (get_match_roster, id, 'home'),
+        (get_match_roster, id, 'away'),
+    )
     if not match:
         abort(404)
 
-    cursor.execute("""
-        SELECT p.id, p.first_name, p.last_name, pt.shirt_num
-        FROM Person p
-        JOIN Person_Team pt ON p.id = pt.person_id
-        WHERE pt.team_id = %s AND p.speciality = 'Player'
-    """, (match['home_team_id'],))
-    home_players = cursor.fetchall()
-
-    cursor.execute("""
-        SELECT p.id, p.first_name, p.last_name, pt.shirt_num
-        FROM Person p
-        JOIN Person_Team pt ON p.id = pt.person_id
-        WHERE pt.team_id = %s AND p.speciality = 'Player'
-    """, (match['away_team_id'],))
-    away_players = cursor.fetchall()
-
-    cursor.close()
-
     return render_template('admin/match_scorer.html', match=match, home_players=home_players, away_players=away_players)
 
 @admin_bp.route('/api/event/add', methods=['POST'])
@@ -79,37 +69,65 @@ def add_event():
     if not all([match_id, player_id, event_type]):
         return jsonify({'error': 'Missing data'}), 400
 
-    event_map = {
-        '2pt': '2-Point Field Goal Made',
-        '3pt': '3-Point Field Goal Made',
-        'foul': 'Personal Foul'
-    }
-
-    event_name = event_map.get(event_type)
+    event_name = SCORER_EVENT_TYPES.get(event_type)
     if not event_name:
         return jsonify({'error': 'Invalid event type'}), 400
 
-    db_conn = db.get_db()
-    cursor = db_conn.cursor(dictionary=True)
-
-    cursor.execute("SELECT id FROM Event WHERE name = %s", (event_name,))
-    event = cursor.fetchone()
-    if not event:
-        cursor.close()
+    # Resolved from the in-memory event catalog instead of a SELECT per click.
+    event_id = get_event_catalog().id_of(event_name)
+    if not event_id:
         return jsonify({'error': 'Event type not found in database'}), 400
-    
-    event_id = event['id']
 
-    cursor.execute(
-        "INSERT INTO Event_Creation (match_id, person_id, event_id) VALUES (%s, %s, %s)",
-        (match_id, player_id, event_id)
-    )
-    db_conn.commit()
-    new_event_id = cursor.lastrowid
-    cursor.close()
+    # Goes through the model so the match's stored score is updated in the same transaction.
+    new_event_id = create_match_event(match_id, player_id, event_id, None)
+    if not new_event_id:
+        return jsonify({'error': 'Could not record event'}), 500
+
+    announce_events(match_id, [{
+        'id': new_event_id, 'person_id': player_id, 'event': event_name,
+        'points': get_event_catalog().get(event_id).points, 'game_time': None,
+    }])
 
     return jsonify({'success': True, 'event_id': new_event_id}), 201
 
+@admin_bp.route('/api/match/<int:match_id>/events', methods=['POST'])
+def add_events_bulk(match_id):
+    """
+    Records many events for a match in one transaction.
+    Expects {"events": [{"player_id": ..., "event_type": "2pt" | "event": "<Event name>", "game_time": ...}, ...]}
+    """
+    data = request.get_json(silent=True) or {}
+    events = data.get('events')
+    if not isinstance(events, list) or not events:
+        return jsonify({'error': 'Missing data'}), 400
+    if len(events) > MAX_BULK_EVENTS:
+        return jsonify({'error': f'At most {MAX_BULK_EVENTS} events per request'}), 413
+
+    rows = []
+    for i, event in enumerate(events):
+        if not isinstance(event, dict) or not event.get('player_id'):
+            return jsonify({'error': f'Event #{i}: missing player_id'}), 400
+        event_name = event.get('event') or SCORER_EVENT_TYPES.get(event.get('event_type'))
+        if not event_name:
+            return jsonify({'error': f'Event #{i}: invalid event type'}), 400
+        rows.append({'person_id': event['player_id'], 'event': event_name, 'game_time': event.get('game_time')})
+
+    try:
+        new_event_ids = create_match_events_bulk(match_id, rows)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if new_event_ids is None:
+        return jsonify({'error': 'Could not record events'}), 500
+
+    catalog = get_event_catalog()
+    announce_events(match_id, [
+        {'id': new_id, 'person_id': row['person_id'], 'event': row['event'],
+         'points': catalog.by_name(row['event']).points, 'game_time': row['game_time']}
+        for new_id, row in zip(new_event_ids, rows)
+    ])
+
+    return jsonify({'success': True, 'event_ids': new_event_ids}), 201
+
 @admin_bp.route('/create/match', methods=['GET', 'POST'])
 def create_match():
     if request.method == 'POST':
@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required
+from pymysql.cursors import DictCursor
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
@@ -17,7 +18,7 @@ def login():
         password = request.form['password']
         
         db_conn = db.get_db()
-        cursor = db_conn.cursor(dictionary=True)
+        cursor = db_conn.cursor(DictCursor)
         cursor.execute("SELECT * FROM admin WHERE username = %s", (username,))
         user_data = cursor.fetchone()
         cursor.close()
@@ -1,25 +1,38 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
-from flask import Blueprint, render_template, abort
+from flask import Blueprint, Response, render_template, abort, jsonify, request
 from app import db
-from model import get_teams, get_players, get_all_matches_with_names, get_seasons, get_phases_by_season, calculate_group_stage_standings, calculate_standings_for_phase
+import model_async
+from app.live import LEAGUE_CHANNEL, hub, match_channel, score_message
+from model import (
+    LEADERBOARD_STATS, get_all_matches_page, get_foul_trouble, get_leaderboard, get_live_scoreboard,
+    get_match_box_score, get_players_page, get_match_with_teams, get_scores, get_seasons,
+    get_team_matches_page, get_team_name, get_teams_page, run_concurrently
+)
 
 public_bp = Blueprint('public', __name__)
 
+def fetch_page(page_fetcher, *args, **kwargs):
+    """Runs a keyset page fetcher with the ?after= cursor of the current request. Malformed cursors are a 400."""
+    try:
+        return page_fetcher(*args, after=request.args.get('after'), **kwargs)
+    except ValueError:
+        abort(400)
+
 @public_bp.route('/')
 def index():
     return render_template('public/index.html')
 
 @public_bp.route('/teams')
 def teams():
-    all_teams = get_teams(limit=100) # Get all teams fix with pagination
-    return render_template('public/teams.html', teams=all_teams)
+    all_teams, next_cursor = fetch_page(get_teams_page, limit=100)
+    return render_template('public/teams.html', teams=all_teams, next_cursor=next_cursor)
 
 @public_bp.route('/matches')
 def matches():
-    all_matches = get_all_matches_with_names(limit=100) # Get all matches
-    return render_template('public/matches.html', matches=all_matches)
+    all_matches, next_cursor = fetch_page(get_all_matches_page, limit=100)
+    return render_template('public/matches.html', matches=all_matches, next_cursor=next_cursor)
 
 @public_bp.route('/standings')
 def standings_index():
@@ -27,20 +40,9 @@ def standings_index():
     return render_template('public/standings_index.html', seasons=seasons)
 
 @public_bp.route('/standings/<int:year>')
-def standings(year):
-    phases = get_phases_by_season(year)
-    group_phase = next((p for p in phases if p['phase_id'] == 1), None)
-    knockout_phase = next((p for p in phases if p['phase_id'] == 2), None)
-
-    if group_phase:
-        group_standings = calculate_group_stage_standings(group_phase['id'])
-    else:
-        group_standings = []
-
-    if knockout_phase:
-        knockout_standings = calculate_standings_for_phase(knockout_phase['id'])
-    else:
-        knockout_standings = []
+async def standings(year):
+    # Group and knockout standings are read concurrently
+    group_phase, group_standings, _, knockout_standings = await model_async.get_season_standings(year)
 
     return render_template(
         'public/standings.html',
@@ -54,12 +56,68 @@ def standings(year):
 
 @public_bp.route('/stats/mvp/<int:year>')
 def mvp_stats(year):
-    # Logic to calculate MVP would go here
-    # For now, just a placeholder
-    return render_template('public/mvp_stats.html', year=year)
+    leaderboards = [
+        (label, get_leaderboard(stat, year, limit=10))
+        for stat, label in LEADERBOARD_STATS.items()
+    ]
+    mvp = leaderboards[0][1][0] if leaderboards[0][1] else None
+    return render_template('public/mvp_stats.html', year=year, mvp=mvp, leaderboards=leaderboards)
 
 @public_bp.route('/teams/<int:id>')
 def team_roster(id):
 
-    players = get_players(id)    
-    return render_template('public/team_roster.html', team=players, players=players)
+    players, next_cursor = fetch_page(get_players_page, id)
+    return render_template('public/team_roster.html', team=players, players=players, next_cursor=next_cursor)
+
+@public_bp.route('/teams/<int:id>/matches')
+def team_matches(id):
+    try:
+        team, (matches, next_cursor) = run_concurrently(
+            (get_team_name, id),
+            (get_team_matches_page, id, request.args.get('after'), 50)
+        )
+    except ValueError:
+        abort(400)
+    if not team:
+        abort(404)
+    return render_template('public/team_matches.html', team=team[0], matches=matches, next_cursor=next_cursor)
+
+def event_stream(channel, initial=None):
+    return Response(
+        hub.stream(channel, initial),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@public_bp.route('/live/matches')
+def live_league_stream():
+    """Server-Sent Events stream of every match's score updates."""
+    return event_stream(LEAGUE_CHANNEL)
+
+@public_bp.route('/live/matches/<int:id>')
+def live_match_stream(id):
+    """Server-Sent Events stream of one match: its current score, then every update."""
+    scores = get_scores(id)
+    if scores is None:
+        abort(404)
+    return event_stream(match_channel(id), ('score', score_message(id, [], list(scores.items()))))
+
+@public_bp.route('/live/matches/<int:id>/state')
+def live_match_state(id):
+    """Scoreboard, box score and foul trouble of an Ongoing match, served from the live state."""
+    scoreboard = get_live_scoreboard(id)
+    if scoreboard is None:
+        abort(404)
+    box_score = get_match_box_score(id) or {}
+    return jsonify({
+        **scoreboard,
+        'box_score': [{'person_id': pid, **line} for pid, line in box_score.items()],
+        'foul_trouble': get_foul_trouble(id) or [],
+    })
+
+@public_bp.route('/matches/<int:id>/live')
+def live_match(id):
+    match = get_match_with_teams(id)
+    if not match:
+        abort(404)
+    return render_template('public/live_match.html', match=match)
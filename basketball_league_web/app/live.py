@@ -0,0 +1,125 @@
+"""
+In-process publish/subscribe hub behind the live scoreboard streams.
+
+The scorer endpoints publish one message per write; every Server-Sent Events client gets it from its
+own queue, so viewers never query the database to follow a game. Channels are "match:<id>" for one
+match and "league" for every match.
+"""
+import json
+import queue
+import threading
+
+LEAGUE_CHANNEL = 'league'
+KEEPALIVE_SECONDS = 15
+
+
+def match_channel(match_id):
+    return f'match:{match_id}'
+
+
+def format_sse(data, event=None, event_id=None):
+    """Encodes one Server-Sent Events message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.extend(f'data: {line}' for line in json.dumps(data, default=str).splitlines())
+    return '\n'.join(lines) + '\n\n'
+
+
+class LiveHub:
+    """
+    Fans messages out to subscriber queues. A subscriber that falls more than max_queue messages
+    behind loses its oldest messages rather than slowing down publishers.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._sequence = 0
+
+    def subscribe(self, channel):
+        q = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(q)
+        return q
+
+    def unsubscribe(self, channel, q):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers:
+                subscribers.discard(q)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+    def publish(self, channels, event, data):
+        """Delivers (sequence, event, data) to every subscriber of the given channels. Returns the sequence number."""
+        with self._lock:
+            self._sequence += 1
+            message = (self._sequence, event, data)
+            targets = [q for channel in channels for q in self._subscribers.get(channel, ())]
+        for q in targets:
+            while True:
+                try:
+                    q.put_nowait(message)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+        return message[0]
+
+    def stream(self, channel, initial=None, keepalive=KEEPALIVE_SECONDS):
+        """
+        Generator of SSE text for one client: the optional initial (event, data) snapshot, then every
+        published message, with a comment line as keep-alive when nothing happened for a while.
+        Unsubscribes when the client goes away and the generator is closed.
+        """
+        q = self.subscribe(channel)
+        try:
+            if initial is not None:
+                yield format_sse(initial[1], event=initial[0])
+            while True:
+                try:
+                    sequence, event, data = q.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield format_sse(data, event=event, event_id=sequence)
+        finally:
+            self.unsubscribe(channel, q)
+
+
+hub = LiveHub()
+
+
+def score_message(match_id, events, score):
+    """
+    Body of a "score" message.
+
+    :param events: Dicts describing the newly recorded events.
+    :param score: [(team_id, score), ...] in home, away order, as in model.get_scores().items().
+    """
+    (home_team_id, home_score), (away_team_id, away_score) = score
+    return {
+        'match_id': match_id,
+        'events': events,
+        'score': {
+            'home_team_id': home_team_id, 'home_score': home_score,
+            'away_team_id': away_team_id, 'away_score': away_score,
+        },
+    }
+
+
+def publish_match_update(match_id, events, score):
+    """Announces new events of a match and its score afterwards, on the match channel and the league channel."""
+    return hub.publish([match_channel(match_id), LEAGUE_CHANNEL], 'score', score_message(match_id, events, score))
@@ -0,0 +1,321 @@
+"""
+Benchmark suite for the hot model functions.
+
+Every case is run against the database configured in .env - point DB_HOST/DB_PORT/DB_SSL at a local
+MySQL seeded with populate_huge.py to keep network jitter out of the numbers. Each case gets warm-up
+runs before it is timed, the query cache is cleared before every call so the database does the work,
+and results are reported as percentiles per query.
+
+    python benchmark.py --indexes both
+    python benchmark.py --runs 50 --save baseline.json
+    python benchmark.py --compare baseline.json
+    python benchmark.py --analytics
+
+--analytics also loads the NumPy EventStore from analytics.py (requires numpy), checks that it gives
+the same answers as the SQL versions and times it next to them as analytics_<case>.
+"""
+import argparse
+import json
+import sys
+from time import perf_counter
+
+import model
+
+INDEX_MODES = ('current', 'on', 'off', 'both')
+PERCENTILES = (50, 90, 95, 99)
+
+
+def pick_sample():
+    """Chooses the season, phases, match, team, player and referee every case runs against."""
+    rows = model.query("""
+        SELECT p.year, p.id AS phase_id
+        FROM Phase p
+        JOIN `Round` r ON r.phase_id = p.id
+        JOIN `Match` m ON m.round_id = r.id
+        WHERE p.phase_id = 1 AND m.status = 'Completed'
+        ORDER BY p.year DESC
+        LIMIT 1
+    """)
+    if not rows:
+        return None
+    sample = {'year': rows[0]['year'], 'group_phase_id': rows[0]['phase_id']}
+
+    knockout = model.query("SELECT id FROM Phase WHERE year = %s AND phase_id = 2", (sample['year'],))
+    sample['knockout_phase_id'] = knockout[0]['id'] if knockout else None
+
+    match = model.query("""
+        SELECT m.id, m.home_team_id
+        FROM `Match` m
+        JOIN `Round` r ON m.round_id = r.id
+        WHERE r.phase_id = %s AND m.status = 'Completed'
+        ORDER BY m.id
+        LIMIT 1
+    """, (sample['group_phase_id'],))[0]
+    sample['match_id'] = match['id']
+    sample['team_id'] = match['home_team_id']
+
+    player = model.query("SELECT person_id FROM Event_Creation WHERE match_id = %s LIMIT 1", (sample['match_id'],))
+    sample['player_id'] = player[0]['person_id'] if player else None
+    referee = model.query("SELECT referee_id FROM Match_Referee WHERE match_id = %s LIMIT 1", (sample['match_id'],))
+    sample['referee_id'] = referee[0]['referee_id'] if referee else None
+    return sample
+
+
+def build_cases(sample):
+    """Returns (name, callable) pairs. Cases whose sample value is missing are left out."""
+    s = sample
+    cases = [
+        ('group_standings', 'group_phase_id', lambda: model.calculate_group_stage_standings(s['group_phase_id'])),
+        ('group_standings_sql', 'group_phase_id', lambda: model.calculate_group_stage_standings_sql(s['group_phase_id'])),
+        ('standings_snapshot', 'group_phase_id', lambda: model.get_phase_standings(s['group_phase_id'])),
+        ('knockout_standings', 'knockout_phase_id', lambda: model.calculate_standings_for_phase(s['knockout_phase_id'])),
+        ('match_score', 'match_id', lambda: model.get_scores(s['match_id'])),
+        ('match_scores_batch', 'match_id', lambda: model.get_scores_for_matches(range(s['match_id'], s['match_id'] + 100))),
+        ('season_mvp', 'year', lambda: model.get_year_mvp(s['year'])),
+        ('season_leaders', 'year', lambda: model.get_leaderboard('fg3_pct', s['year'])),
+        ('career_leaders', 'year', lambda: model.get_leaderboard('points')),
+        ('all_matches_page', 'year', lambda: model.get_all_matches_page()),
+        ('team_matches', 'team_id', lambda: model.get_team_matches_page(s['team_id'])),
+        ('referee_matches_page', 'referee_id', lambda: model.get_matches_for_referee_page(s['referee_id'])),
+        ('match_events_page', 'match_id', lambda: model.get_match_stats_page(s['match_id'])),
+        ('player_stats_page', 'player_id', lambda: model.get_player_stats_page(s['player_id'])),
+        ('player_shot_stats', 'player_id', lambda: model.get_player_shot_stats(s['player_id'], '3-Point Field Goal')),
+    ]
+    return [(name, fn) for name, needs, fn in cases if s.get(needs) is not None]
+
+
+def build_analytics_cases(sample, store):
+    """EventStore counterparts of the SQL cases, named analytics_<case>."""
+    s = sample
+    cases = [
+        ('analytics_group_standings', 'group_phase_id', lambda: store.group_standings(s['group_phase_id'])),
+        ('analytics_match_score', 'match_id', lambda: store.scores([s['match_id']])),
+        ('analytics_match_scores_batch', 'match_id', lambda: store.scores(range(s['match_id'], s['match_id'] + 100))),
+        ('analytics_season_leaders', 'year', lambda: store.leaderboard('fg3_pct', s['year'])),
+        ('analytics_career_leaders', 'year', lambda: store.leaderboard('points')),
+        ('analytics_player_shot_stats', 'player_id', lambda: store.shooting_splits(s['player_id'])),
+    ]
+    return [(name, fn) for name, needs, fn in cases if s.get(needs) is not None]
+
+
+def _leaderboard_key(rows):
+    return [(r['person_id'], int(r['games']), float(r['value'])) for r in rows]
+
+
+def check_analytics(sample, store):
+    """Compares the EventStore's answers with the SQL versions. Returns the names of the checks that differ."""
+    s = sample
+    match_ids = range(s['match_id'], s['match_id'] + 100)
+    checks = [
+        ('match_scores_batch', lambda: store.scores(match_ids), lambda: model.get_scores_for_matches(match_ids)),
+        ('group_standings', lambda: _standings_key(store.group_standings(s['group_phase_id'])),
+         lambda: _standings_key(model.calculate_group_stage_standings(s['group_phase_id']))),
+    ]
+    if s.get('player_id') is not None:
+        checks.append(('player_box_score', lambda: store.box_score(s['player_id']),
+                       lambda: model.get_player_box_score(s['player_id'])))
+    for stat in model.LEADERBOARD_STATS:
+        for label, year in ((f'{stat}_season_leaders', s['year']), (f'{stat}_career_leaders', None)):
+            checks.append((label, lambda stat=stat, year=year: _leaderboard_key(store.leaderboard(stat, year)),
+                           lambda stat=stat, year=year: _leaderboard_key(model.get_leaderboard(stat, year))))
+    return [name for name, fast, reference in checks if fast() != reference()]
+
+
+def load_analytics_store():
+    """Loads the EventStore. Returns (store, seconds it took)."""
+    import analytics  # NumPy is only required for --analytics
+    store = analytics.EventStore(model.get_event_catalog())
+    start = perf_counter()
+    store.load()
+    return store, perf_counter() - start
+
+
+def _standings_key(rows):
+    return [(r['name'], int(r['wins']), int(r['losses']), int(r['group_identifier']), int(r['group_rank'])) for r in rows]
+
+
+def check_standings():
+    """
+    Compares calculate_group_stage_standings with the SQL reference for every group stage.
+    Returns the (year, phase id) pairs whose standings differ.
+    """
+    mismatches = []
+    for phase in model.query("SELECT id, year FROM Phase WHERE phase_id = 1 ORDER BY year"):
+        fast = model.calculate_group_stage_standings(phase['id'])
+        reference = model.calculate_group_stage_standings_sql(phase['id'])
+        if _standings_key(fast) != _standings_key(reference):
+            mismatches.append((phase['year'], phase['id']))
+    return mismatches
+
+
+def summarize(samples):
+    """Turns a list of durations in seconds into millisecond statistics."""
+    ordered = sorted(samples)
+    stats = {
+        'runs': len(ordered),
+        'min': ordered[0] * 1000,
+        'mean': sum(ordered) / len(ordered) * 1000,
+        'max': ordered[-1] * 1000,
+    }
+    for p in PERCENTILES:
+        # Nearest-rank percentile
+        index = min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))
+        stats[f'p{p}'] = ordered[index] * 1000
+    return stats
+
+
+def measure(fn, runs, warmup):
+    for _ in range(warmup):
+        model.clear_cache()
+        fn()
+    samples = []
+    for _ in range(runs):
+        model.clear_cache()
+        start = perf_counter()
+        fn()
+        samples.append(perf_counter() - start)
+    return summarize(samples)
+
+
+def run_cases(cases, runs, warmup):
+    results = {}
+    for name, fn in cases:
+        results[name] = measure(fn, runs, warmup)
+    return results
+
+
+def run_benchmarks(indexes='current', runs=20, warmup=3, only=None, store=None, sample=None):
+    """
+    Runs the suite and returns {label: {case: stats}}.
+
+    :param indexes: 'current' leaves the schema alone, 'on'/'off' apply or drop the indexes from
+                    model.apply_indexes() first, 'both' measures without and then with them.
+                    Indexes dropped for 'off' are created again before returning.
+    :param only: Optional list of case names to run.
+    :param store: An analytics.EventStore whose cases are run next to the SQL ones.
+    :param sample: The pick_sample() to run against (picked when not given).
+    """
+    if indexes not in INDEX_MODES:
+        raise ValueError(f"indexes must be one of {', '.join(INDEX_MODES)}")
+    if sample is None:
+        sample = pick_sample()
+    if sample is None:
+        raise RuntimeError("No completed group stage found - seed the database with populate_huge.py first")
+    cases = build_cases(sample)
+    if store is not None:
+        cases += build_analytics_cases(sample, store)
+    if only:
+        cases = [(name, fn) for name, fn in cases if name in only]
+
+    results = {}
+    dropped = []
+    try:
+        if indexes in ('off', 'both'):
+            dropped = model.drop_all_defined_indexes()
+            if dropped is None:
+                raise RuntimeError("Could not drop the indexes")
+            results['without_indexes'] = run_cases(cases, runs, warmup)
+        if indexes in ('on', 'both'):
+            model.apply_indexes()
+            results['with_indexes'] = run_cases(cases, runs, warmup)
+        if indexes == 'current':
+            results['current'] = run_cases(cases, runs, warmup)
+    finally:
+        # The indexes are part of the schema: whatever happens, put back the ones dropped above
+        if dropped and model.apply_indexes(dropped) is None:
+            print(f"WARNING: could not restore the indexes {', '.join(dropped)} - run model.apply_indexes()", file=sys.stderr)
+    return results
+
+
+def format_report(results):
+    lines = []
+    header = f"{'case':<30}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'mean':>10}  (ms)"
+    for label, cases in results.items():
+        lines.append(f"\n--- {label.replace('_', ' ')} ---")
+        lines.append(header)
+        for name, st in cases.items():
+            lines.append(f"{name:<30}{st['p50']:>10.2f}{st['p90']:>10.2f}{st['p95']:>10.2f}{st['p99']:>10.2f}{st['mean']:>10.2f}")
+
+    if 'without_indexes' in results and 'with_indexes' in results:
+        lines.append("\n--- index speedup (p50) ---")
+        for name, st in results['with_indexes'].items():
+            before = results['without_indexes'][name]['p50']
+            lines.append(f"{name:<30}{before / st['p50'] if st['p50'] else float('inf'):>10.2f}x")
+    return "\n".join(lines)
+
+
+def find_regressions(results, baseline, threshold=1.2):
+    """Returns (label, case, baseline_p50, p50) for every case whose p50 grew by more than threshold."""
+    regressions = []
+    for label, cases in results.items():
+        for name, st in cases.items():
+            old = baseline.get(label, {}).get(name)
+            if old and st['p50'] > old['p50'] * threshold:
+                regressions.append((label, name, old['p50'], st['p50']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot model queries.")
+    parser.add_argument('--indexes', choices=INDEX_MODES, default='current',
+                        help="Run with the current schema, with/without the model.apply_indexes() set, or both")
+    parser.add_argument('--runs', type=int, default=20, help="Timed runs per case (default: 20)")
+    parser.add_argument('--warmup', type=int, default=3, help="Untimed runs per case before timing (default: 3)")
+    parser.add_argument('--only', nargs='+', metavar='CASE', help="Only run these cases")
+    parser.add_argument('--check-standings', action='store_true',
+                        help="Verify the Python group standings against the SQL version for every season first")
+    parser.add_argument('--analytics', action='store_true',
+                        help="Also check and time the NumPy EventStore from analytics.py (requires numpy)")
+    parser.add_argument('--save', metavar='FILE', help="Write the results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="Fail if a case is slower than in this saved run")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="Slowdown factor of p50 that counts as a regression (default: 1.2)")
+    args = parser.parse_args(argv)
+    if args.runs < 1 or args.warmup < 0:
+        parser.error("--runs must be at least 1 and --warmup not negative")
+
+    if args.check_standings:
+        mismatches = check_standings()
+        for year, phase_id in mismatches:
+            print(f"MISMATCH group standings {year} (phase {phase_id})")
+        if mismatches:
+            return 1
+        print("Group standings match the SQL version for every season.")
+
+    store = sample = None
+    if args.analytics:
+        sample = pick_sample()
+        if sample is None:
+            print("No completed group stage found - seed the database with populate_huge.py first")
+            return 1
+        store, seconds = load_analytics_store()
+        print(f"Loaded {len(store)} events into the analytics store in {seconds:.2f} s")
+        mismatches = check_analytics(sample, store)
+        for name in mismatches:
+            print(f"MISMATCH analytics {name}")
+        if mismatches:
+            return 1
+        print("The analytics store matches the SQL versions.")
+
+    results = run_benchmarks(args.indexes, args.runs, args.warmup, args.only, store, sample)
+    print(format_report(results))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for label, name, old, new in regressions:
+            print(f"REGRESSION {label}/{name}: p50 {old:.2f} ms -> {new:.2f} ms")
+        if regressions:
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_table(name):
+    """Table names are compared case-insensitively and without backticks (`Match` == match)."""
+    return name.strip('`').lower()
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache for query results with per-entry TTLs and table tags.
+
+    Every entry is tagged with the tables its query reads. invalidate() drops every entry
+    tagged with one of the given tables. A read that started before an invalidation of one
+    of its tables is never stored, so a slow query cannot re-insert data a write just replaced.
+    """
+
+    def __init__(self, max_entries=256, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, tags, value)
+        self._version = 0
+        self._invalidated_at = {}  # table -> version of its latest invalidation
+        self._cleared_at = -1
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'invalidated': 0}
+
+    def get(self, key):
+        """
+        Returns (True, value) on a hit. On a miss returns (False, token); pass the token
+        back to set() so the result is discarded if a write invalidated it in the meantime.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return True, value
+                del self._entries[key]
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+            return False, self._version
+
+    def set(self, key, value, tables, ttl=None, token=None):
+        tags = frozenset(normalize_table(t) for t in tables)
+        with self._lock:
+            if token is not None and (self._cleared_at > token or any(self._invalidated_at.get(t, -1) > token for t in tags)):
+                return
+            ttl = self.default_ttl if ttl is None else ttl
+            self._entries[key] = (time.monotonic() + ttl, tags, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evicted'] += 1
+
+    def invalidate(self, *tables):
+        """Drops every entry that reads any of the given tables."""
+        tags = {normalize_table(t) for t in tables}
+        if not tags:
+            return
+        with self._lock:
+            self._version += 1
+            for t in tags:
+                self._invalidated_at[t] = self._version
+            stale = [key for key, (_, entry_tags, _) in self._entries.items() if entry_tags & tags]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidated'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._cleared_at = self._version
+            self._stats['invalidated'] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """Returns a snapshot of the hit/miss counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            lookups = snapshot['hits'] + snapshot['misses']
+            snapshot['entries'] = len(self._entries)
+            snapshot['max_entries'] = self.max_entries
+            snapshot['hit_rate'] = snapshot['hits'] / lookups if lookups else 0.0
+            return snapshot
@@ -1,24 +1,28 @@
 from model import (
-    add_admin_user, apply_indexes, calculate_group_stage_standings,
-    calculate_standings_for_phase, create_match, create_match_event,
+    LEADERBOARD_STATS, MATCH_STATUSES, add_admin_user, apply_indexes, create_match, create_match_event,
     create_phase, create_player, create_referee, create_round, create_season,
     create_stadium, create_team, delete_match, delete_match_event,
     delete_player, delete_referee, delete_stadium, delete_team,
-    drop_all_defined_indexes, get_all_events, get_all_matches_with_names,
-    get_match, get_match_stats, get_matches_by_team, get_matches_for_referee,
-    get_phases_by_season, get_player_details, get_player_shot_stats,
-    get_player_stats, get_players, get_referee_details, get_referees,
-    get_referees_in_match, get_rounds_by_phase, get_scores, get_seasons,
-    get_stadiums, get_team_name, get_team_stadiums, get_teams,
-    get_unassigned_referees, get_year_mvp, link_referee_to_match,
-    remove_admin_user, run_benchmark_query, unlink_referee_from_match,
-    update_entry, update_match_stadium, update_player_shirt_number,
-    update_team_home_stadium, verify_admin_credentials
+    get_all_events, get_all_matches_page,
+    get_leaderboard, get_match, get_match_stats_page, get_phase_standings,
+    get_matches_for_referee_page, get_phases_by_season, get_player_details,
+    get_player_box_score, get_player_shot_stats, get_player_stats_page, get_players_page,
+    get_referee_details, get_referees_page, get_referees_in_match,
+    get_rounds_by_phase, get_scores, get_seasons, get_stadiums,
+    get_team_matches_page, get_team_name, get_team_stadiums, get_teams_page,
+    get_unassigned_referees, get_year_mvp, link_referee_to_match, run_concurrently,
+    migrate_event_catalog,
+    rebuild_match_scores, rebuild_player_stats, rebuild_standings_snapshots,
+    remove_admin_user,
+    set_match_status,
+    unlink_referee_from_match, update_entry, update_match_stadium,
+    update_player_shirt_number, update_team_home_stadium,
+    verify_admin_credentials
 )
 from view_cmd import (
-    display_all_matches, display_event_types, display_match_score,
+    display_all_matches, display_event_types, display_leaderboard, display_match_score,
     display_match_stats, display_matches_for_referee, display_matches_for_team,
-    display_player_stats, display_players_paginated, display_referees_paginated,
+    display_player_box_score, display_player_stats, display_players_paginated, display_referees_paginated,
     display_season_mvp, display_shot_analysis, display_shot_percentage_menu,
     display_stadiums_paginated, display_standings, display_team_stadiums,
     display_teams, display_years, get_admin_password_input,
@@ -36,15 +40,15 @@ from view_cmd import (
     print_no_group_phase_found, print_no_knockout_rounds_found,
     print_no_more_found, print_no_phases_found, print_operation_cancelled,
     print_phases_creation_success, print_player_creation_success,
-    print_player_list_header, print_referee_creation_success,
-    print_removal_failed, print_rounds_creation_success,
+    print_player_list_header, print_rebuild_failed, print_rebuild_success,
+    print_referee_creation_success, print_removal_failed, print_rounds_creation_success,
     print_season_creation_failed, print_season_creation_success,
     print_select_away_team, print_select_from_list, print_select_home_team,
     print_stadium_creation_success, print_stadium_deletion_success,
     print_status_set_to, print_team_creation_success, print_unlink_success,
     print_update_failed, print_update_success, print_welcome
 )
-import time
+from benchmark import format_report, run_benchmarks
 
 def admin_login_menu():
     """
@@ -73,17 +77,28 @@ def admin_login_menu():
             print_login_failed()
             return False
 
+def offset_pages(fetch_page):
+    """
+    Adapts an offset-paginated fetcher (page number, *args -> data) to the
+    cursor protocol expected by handle_pagination/handle_pagination_view_only.
+    """
+    def data_fetcher(cursor, *args):
+        page = cursor or 0
+        return fetch_page(page, *args), page + 1
+    return data_fetcher
+
 def handle_pagination(data_fetcher, display_function, *args):
     """
     Generic handler for paginating through data.
-    - data_fetcher: A function that accepts a page number and other args, and returns data.
+    - data_fetcher: A function that accepts a page cursor (None for the first page) and other args,
+      and returns (data, next_cursor). next_cursor is None on the last page.
     - display_function: A function that displays the data.
     - *args: Arguments to pass to the data_fetcher function.
     """
-    page = 0
+    cursor = None
     all_ids = set()
     while True:
-        results = data_fetcher(page, *args)
+        results, next_cursor = data_fetcher(cursor, *args)
         if not results:
             print_no_more_found("items")
             return None
@@ -99,7 +114,10 @@ def handle_pagination(data_fetcher, display_function, *args):
         if user_input.lower() == 'q':
             return None
         if user_input == '':
-            page += 1
+            if next_cursor is None:
+                print_no_more_found("items")
+                return None
+            cursor = next_cursor
             continue
         if user_input.isdigit() and int(user_input) in all_ids:
             return int(user_input)
@@ -109,10 +127,11 @@ def handle_pagination_view_only(data_fetcher, display_function, *args):
     """
     A simplified pagination handler for display-only purposes.
     Allows paging through data without a selection prompt.
+    Uses the same (data, next_cursor) fetcher protocol as handle_pagination.
     """
-    page = 0
+    cursor = None
     while True:
-        results = data_fetcher(page, *args)
+        results, next_cursor = data_fetcher(cursor, *args)
         if not results:
             print_no_more_found("items")
             input("Press [Enter] to continue...")
@@ -124,36 +143,41 @@ def handle_pagination_view_only(data_fetcher, display_function, *args):
         if user_input.lower() == 'q':
             return
         if user_input == '':
-            page += 1
+            if next_cursor is None:
+                print_no_more_found("items")
+                input("Press [Enter] to continue...")
+                return
+            cursor = next_cursor
         else:
             invalid_input()
 
 def find_playerstats(player_id):
     if not player_id:
         return
-    handle_pagination_view_only(lambda page: get_player_stats(player_id, offset=page), display_player_stats)
+    display_player_box_score(player_id, get_player_box_score(player_id))
+    handle_pagination_view_only(lambda cursor: get_player_stats_page(player_id, after=cursor), display_player_stats)
 
 def view_teams():
     """Controller to view all teams or a single team."""
     team_id = select_team_for_action()
     if team_id:
         print_player_list_header(team_id)
-        handle_pagination_view_only(lambda page: get_players(team_id, offset=page), display_players_paginated)
+        handle_pagination_view_only(lambda cursor: get_players_page(team_id, after=cursor), display_players_paginated)
 
 def cmd_view_all_matches():
     """Controller to view all matches, paginated."""
-    handle_pagination_view_only(lambda page: get_all_matches_with_names(offset=page), display_all_matches)
+    handle_pagination_view_only(lambda cursor: get_all_matches_page(after=cursor), display_all_matches)
 
 def find_matches_for_team():
     team_id = select_team_for_action()
     if not team_id:
         return 
 
-    team_name, _ = get_matches_by_team(team_id, 0)
-    page = 0
+    # The team name and the first page of matches are independent, so they are loaded concurrently
+    team_name, first_page = run_concurrently((get_team_name, team_id), (get_team_matches_page, team_id))
     print_select_from_list("match")
 
-    match_fetcher = lambda page: get_matches_by_team(team_id, page)[1]
+    match_fetcher = lambda cursor: first_page if cursor is None else get_team_matches_page(team_id, after=cursor)
     display_func = lambda matches: display_matches_for_team(team_name, matches)
 
     selected_match_id = handle_pagination(match_fetcher, display_func)
@@ -164,10 +188,7 @@ def find_matchstats(match_id):
     if not match_id:
         return
     
-    handle_pagination_view_only(lambda page: get_match_stats(match_id, offset=page), display_match_stats)
-    start = time.time()
-    get_match_stats(match_id)
-    end = time.time()
+    handle_pagination_view_only(lambda cursor: get_match_stats_page(match_id, after=cursor), display_match_stats)
 
 def select_player():
     team_id = select_team_for_action()
@@ -175,7 +196,7 @@ def select_player():
         return None
 
     print_select_from_list("players")
-    return handle_pagination(lambda page: get_players(team_id, offset=page), display_players_paginated)
+    return handle_pagination(lambda cursor: get_players_page(team_id, after=cursor), display_players_paginated)
 
 def cmd_create_team():
     team_name = get_team_name_input()
@@ -248,14 +269,14 @@ def cmd_create_events_in_match():
 
         
         print_select_from_list("player involved in the event")
-        player_id = handle_pagination(lambda page: get_players(selected_team_id, offset=page), display_players_paginated)
+        player_id = handle_pagination(lambda cursor: get_players_page(selected_team_id, after=cursor), display_players_paginated)
         if not player_id:
             break
 
         
         print_select_from_list("event type")
         all_events = get_all_events()
-        event_id = handle_pagination(lambda page: all_events, display_event_types)
+        event_id = handle_pagination(lambda cursor: (all_events, None), display_event_types)
         if not event_id:
             break
 
@@ -295,7 +316,7 @@ def cmd_create_player_for_team():
 
 def select_stadium():
     print_select_from_list("stadium")
-    return handle_pagination(lambda page: get_stadiums(offset=page), display_stadiums_paginated)
+    return handle_pagination(offset_pages(lambda page: get_stadiums(offset=page)), display_stadiums_paginated)
 
 def cmd_create_stadium():
     info = get_stadium_info_input()
@@ -545,17 +566,17 @@ def cmd_view_matches_for_referee():
         return print_operation_cancelled()
 
     referee_details = get_referee_details(referee_id)
-    handle_pagination_view_only(lambda page: get_matches_for_referee(referee_id, offset=page), lambda matches: display_matches_for_referee(referee_details, matches))
+    handle_pagination_view_only(lambda cursor: get_matches_for_referee_page(referee_id, after=cursor), lambda matches: display_matches_for_referee(referee_details, matches))
 
 def select_referee():
     """Controller to select a referee and return their ID."""
     print_select_from_list("referee")
-    return handle_pagination(lambda page: get_referees(offset=page), display_referees_paginated)
+    return handle_pagination(lambda cursor: get_referees_page(after=cursor), display_referees_paginated)
 
 def select_match():
     """Controller to select a match and return its ID."""
     print_select_from_list("match")
-    return handle_pagination(lambda page: get_all_matches_with_names(offset=page), display_all_matches)
+    return handle_pagination(lambda cursor: get_all_matches_page(after=cursor), display_all_matches)
 
 def cmd_link_referee_to_match():
     """Controller to link a referee to a match."""
@@ -564,7 +585,7 @@ def cmd_link_referee_to_match():
         return print_operation_cancelled()
 
     print_select_from_list("unassigned referee")
-    referee_id = handle_pagination(lambda page: get_unassigned_referees(match_id, offset=page), display_referees_paginated)
+    referee_id = handle_pagination(offset_pages(lambda page: get_unassigned_referees(match_id, offset=page)), display_referees_paginated)
 
     if not referee_id:
         return print_operation_cancelled()
@@ -681,6 +702,22 @@ def cmd_change_match_stadium():
     else:
         print_update_failed(f"Match {match_id} stadium")
 
+def cmd_change_match_status():
+    """Controller to change a match's status, e.g. to mark it Completed."""
+    match_id = select_match()
+    if not match_id:
+        return print_operation_cancelled()
+
+    choice = get_menu_choice("Select the new status:", {str(i): status for i, status in enumerate(MATCH_STATUSES, start=1)})
+    if choice == 'q':
+        return print_operation_cancelled()
+
+    status = MATCH_STATUSES[int(choice) - 1]
+    if set_match_status(match_id, status):
+        print_update_success(f"Match {match_id} status")
+    else:
+        print_update_failed(f"Match {match_id} status")
+
 def cmd_delete_event_from_match():
     """Controller to delete a specific event from a match."""
     match_id = select_match()
@@ -688,7 +725,7 @@ def cmd_delete_event_from_match():
         return print_operation_cancelled()
 
     print_select_from_list("event to delete")
-    event_id_to_delete = handle_pagination(lambda page: get_match_stats(match_id, offset=page), display_match_stats)
+    event_id_to_delete = handle_pagination(lambda cursor: get_match_stats_page(match_id, after=cursor), display_match_stats)
 
     if not event_id_to_delete:
         return print_operation_cancelled()
@@ -709,7 +746,7 @@ def select_team_for_action():
     A dedicated controller for selecting a team and returning its ID for further actions.
     """
     print_select_from_list("team")
-    return handle_pagination(lambda page: get_teams(page), display_teams)
+    return handle_pagination(lambda cursor: get_teams_page(after=cursor), display_teams)
 
 
 def cmd_view_team_stadiums():
@@ -719,7 +756,7 @@ def cmd_view_team_stadiums():
         return print_operation_cancelled()
 
     print_select_from_list("team stadium history")
-    handle_pagination_view_only(lambda page: get_team_stadiums(team_id, offset=page), display_team_stadiums)
+    handle_pagination_view_only(offset_pages(lambda page: get_team_stadiums(team_id, offset=page)), display_team_stadiums)
 
 def find_player_shot_percentage(player_id, shot_type, match_id=None):
     stats = get_player_shot_stats(player_id, shot_type, match_id)
@@ -763,11 +800,26 @@ def shot_percentage_control():
     if choice in shot_map:
         find_player_shot_percentage(player_id, shot_map[choice])
 
+def leaderboard_control():
+    stats = list(LEADERBOARD_STATS)
+    choice = get_menu_choice("Which leaderboard?", {str(i): LEADERBOARD_STATS[stat] for i, stat in enumerate(stats, 1)})
+    if choice == 'q':
+        return
+    stat = stats[int(choice) - 1]
+
+    scope = get_menu_choice("Leaders for", {"1": "A season", "2": "Career"})
+    if scope == 'q':
+        return
+    year = None
+    if scope == "1":
+        year = get_year()
+        if not year:
+            print_operation_cancelled()
+            return
+    display_leaderboard(LEADERBOARD_STATS[stat], year, get_leaderboard(stat, year))
+
 def calculate_standings(phase_id):
-    if phase_id == 1: 
-        return calculate_group_stage_standings(phase_id)
-    else:
-        return calculate_standings_for_phase(phase_id)
+    return get_phase_standings(phase_id)
 
 def create_menu():
     """Handles the sub-menu for creating entities."""
@@ -842,7 +894,8 @@ def matches_events_menu():
                 "2": "Manage Referees",
                 "3": "Create events in a match",
                 "4": "Delete an event from a match",
-                "5": "Change match stadium"
+                "5": "Change match stadium",
+                "6": "Change match status"
             }
         )
         if choice == "1":
@@ -855,6 +908,8 @@ def matches_events_menu():
             cmd_delete_event_from_match()
         elif choice == "5":
             cmd_change_match_stadium()
+        elif choice == "6":
+            cmd_change_match_status()
         elif choice == 'q':
             return
 
@@ -894,7 +949,8 @@ def management_menu():
                 "3": "Match/Referees Menu",
                 "4": "Delete Menu",
                 "5": "Add admin user",
-                "6": "Remove admin user"
+                "6": "Remove admin user",
+                "7": "Maintenance Menu"
             }
         )
         if choice == 'q': return
@@ -910,6 +966,73 @@ def management_menu():
             cmd_add_admin_user()
         elif choice == "6":
             cmd_remove_admin_user()
+        elif choice == "7":
+            maintenance_menu()
+
+def maintenance_menu():
+    """Handles the sub-menu for rebuilding derived data."""
+    while True:
+        choice = get_menu_choice(
+            "--- Maintenance Menu ---",
+            {
+                "1": "Rebuild match scores",
+                "2": "Rebuild standings snapshots",
+                "3": "Rebuild player box scores",
+                "4": "Update event scoring columns",
+                "5": "Create missing indexes"
+            }
+        )
+        if choice == 'q': return
+        if choice == "1":
+            cmd_rebuild_match_scores()
+        elif choice == "2":
+            cmd_rebuild_standings_snapshots()
+        elif choice == "3":
+            cmd_rebuild_player_stats()
+        elif choice == "4":
+            cmd_migrate_event_catalog()
+        elif choice == "5":
+            cmd_apply_indexes()
+
+def cmd_rebuild_match_scores():
+    """Controller to recompute every stored match score from the match events."""
+    scored = rebuild_match_scores()
+    if scored is None:
+        print_rebuild_failed("match scores")
+    else:
+        print_rebuild_success("match scores", scored)
+
+def cmd_rebuild_standings_snapshots():
+    """Controller to recompute the stored standings of every phase."""
+    phases = rebuild_standings_snapshots()
+    if phases is None:
+        print_rebuild_failed("standings snapshots")
+    else:
+        print_rebuild_success("standings snapshots", phases)
+
+def cmd_rebuild_player_stats():
+    """Controller to recompute every player box score from the match events."""
+    rows = rebuild_player_stats()
+    if rows is None:
+        print_rebuild_failed("player box scores")
+    else:
+        print_rebuild_success("player box scores", rows)
+
+def cmd_migrate_event_catalog():
+    """Controller to add and fill the scoring columns of the Event table."""
+    updated = migrate_event_catalog()
+    if updated is None:
+        print_rebuild_failed("event scoring columns")
+    else:
+        print_rebuild_success("event scoring columns", updated)
+
+def cmd_apply_indexes():
+    """Controller to create the secondary indexes an older database is missing."""
+    created = apply_indexes()
+    if created is None:
+        print_rebuild_failed("indexes")
+    else:
+        print_rebuild_success("indexes", len(created))
 
 def cmd_add_admin_user():
     username, password = get_new_admin_credentials()
@@ -945,7 +1068,7 @@ def cmd_remove_admin_user():
 
 def get_year():
     print_select_from_list("season")
-    return handle_pagination(lambda page: get_seasons(offset=page), display_years)
+    return handle_pagination(offset_pages(lambda page: get_seasons(offset=page)), display_years)
 
 def view_menu():
     """Handles the sub-menu for viewing league and teams."""
@@ -984,9 +1107,7 @@ def league_menu():
             if group_phase is None:
                 print_no_group_phase_found()
                 continue
-            start = time.time()
-            standings = calculate_group_stage_standings(group_phase['id'])
-            end = time.time()
+            standings = get_phase_standings(group_phase['id'])
             display_standings(standings, is_group_stage=True)
             
 
@@ -1007,7 +1128,7 @@ def stats_menu():
     while True:
         choice = get_menu_choice(
             "What stats would you like to view?",
-            {"1": "Player Stats", "2": "Match Stats", "3": "Shot Analysis", "4": "Season MVP"}
+            {"1": "Player Stats", "2": "Match Stats", "3": "Shot Analysis", "4": "Season MVP", "5": "Leaderboards"}
         )
         if choice == 'q': return 
         index = int(choice)
@@ -1025,6 +1146,8 @@ def stats_menu():
             mvp_data = get_year_mvp(year)
             if mvp_data:
                 display_season_mvp(year, mvp_data)
+        elif index == 5:
+            leaderboard_control()
             
 
 
@@ -1034,34 +1157,18 @@ def main_menu(index):
             management_menu()
     elif index==2: view_menu()
     elif index==3: stats_menu()
-    elif index==4: check_time()
+    elif index==4: benchmark_menu()
     elif index==0: return True 
     return False
 
-def check_time():
-    """
-    This function is useless in TiDB cloud databases because the connection interferes with the time measurement
-    """
-    drop_all_defined_indexes()
-    start_no_idx = time.time()
-    run_benchmark_query()
-    end_no_idx = time.time()
-    time_no_idx = end_no_idx - start_no_idx
-
-    apply_indexes()
-    start_idx = time.time()
-    run_benchmark_query()
-    end_idx = time.time()
-    time_idx = end_idx - start_idx
-
-    if time_idx > 0:
-        speedup = time_no_idx / time_idx
-
-    print("Speed Test Results:")
-    print(f"Without Indexes: {time_no_idx:.4f} seconds")
-    print(f"With Indexes: {time_idx:.4f} seconds")
-    if time_idx > 0:
-        print(f"Speedup: {speedup:.2f}x")
+def benchmark_menu():
+    """Times the hot queries without and with the indexes from apply_indexes()."""
+    try:
+        results = run_benchmarks(indexes='both', runs=10, warmup=2)
+    except RuntimeError as e:
+        print(e)
+        return
+    print(format_report(results))
 
 if __name__ == "__main__":
     print_welcome()
@@ -1069,7 +1176,7 @@ if __name__ == "__main__":
     while not exit:
         choice = get_menu_choice(
             "Press one of the following options:",
-            {"1": "Management Menu", "2": "View League and Teams", "3": "Stats","4": "Check times"},
+            {"1": "Management Menu", "2": "View League and Teams", "3": "Stats","4": "Benchmark queries"},
             quit_text="Exit application"
         )
         if choice == 'q':
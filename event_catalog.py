@@ -0,0 +1,108 @@
+"""
+Event types of the league and what each one counts for.
+
+EVENT_DEFINITIONS is the canonical list used to seed the Event table. EventCatalog is the read-only
+lookup built from that table once per process, so name -> id resolution and scoring never need a
+round trip or a string comparison in SQL.
+"""
+from collections import namedtuple
+from types import MappingProxyType
+
+EventType = namedtuple('EventType', ['id', 'name', 'points', 'category', 'shot_value', 'made'])
+
+# Values of Event.category
+CATEGORIES = ('shot', 'oreb', 'dreb', 'ast', 'stl', 'blk', 'tov', 'foul', 'other')
+
+# (name, points, category, shot_value, made) - shot_value is 1/2/3 for free throws/2-pointers/3-pointers.
+# "Attempt" events are missed shots.
+EVENT_DEFINITIONS = (
+    ('Turnover', 0, 'tov', 0, False),
+    ('Steal', 0, 'stl', 0, False),
+    ('Block', 0, 'blk', 0, False),
+    ('Offensive Rebound', 0, 'oreb', 0, False),
+    ('Defensive Rebound', 0, 'dreb', 0, False),
+    ('Personal Foul', 0, 'foul', 0, False),
+    ('Technical Foul', 0, 'foul', 0, False),
+    ('Flagrant Foul', 0, 'foul', 0, False),
+    ('Offensive Foul', 0, 'foul', 0, False),
+    ('Substitution', 0, 'other', 0, False),
+    ('Free Throw Made', 1, 'shot', 1, True),
+    ('Free Throw Attempt', 0, 'shot', 1, False),
+    ('2-Point Field Goal Made', 2, 'shot', 2, True),
+    ('2-Point Field Goal Attempt', 0, 'shot', 2, False),
+    ('3-Point Field Goal Made', 3, 'shot', 3, True),
+    ('3-Point Field Goal Attempt', 0, 'shot', 3, False),
+    ('Assist', 0, 'ast', 0, False),
+    ('Time running out', 0, 'other', 0, False),
+)
+EVENT_NAMES = tuple(d[0] for d in EVENT_DEFINITIONS)
+# Ids 1..N in definition order, as populate_huge seeds them
+DEFAULT_EVENT_TYPES = tuple(EventType(i + 1, *d) for i, d in enumerate(EVENT_DEFINITIONS))
+
+# Player_Match_Stats counter -> the EventType fields an event needs to count for it.
+# Attempt counters match made and missed shots alike.
+BOX_SCORE_COUNTERS = (
+    ('fg2m', {'shot_value': 2, 'made': True}),
+    ('fg2a', {'shot_value': 2}),
+    ('fg3m', {'shot_value': 3, 'made': True}),
+    ('fg3a', {'shot_value': 3}),
+    ('ftm', {'shot_value': 1, 'made': True}),
+    ('fta', {'shot_value': 1}),
+    ('oreb', {'category': 'oreb'}),
+    ('dreb', {'category': 'dreb'}),
+    ('ast', {'category': 'ast'}),
+    ('stl', {'category': 'stl'}),
+    ('blk', {'category': 'blk'}),
+    ('tov', {'category': 'tov'}),
+    ('fouls', {'category': 'foul'}),
+)
+BOX_SCORE_COLUMNS = ('points',) + tuple(column for column, _ in BOX_SCORE_COUNTERS)
+
+
+class EventCatalog:
+    """Immutable lookup of event types by id and by name."""
+
+    def __init__(self, event_types):
+        event_types = tuple(event_types)
+        self._by_id = MappingProxyType({e.id: e for e in event_types})
+        self._by_name = MappingProxyType({e.name: e for e in event_types})
+        self.ids_by_name = MappingProxyType({e.name: e.id for e in event_types})
+        self.points_by_id = MappingProxyType({e.id: e.points for e in event_types if e.points})
+
+    @classmethod
+    def with_ids(cls, event_map):
+        """The default event types renumbered with a {name: id} map read from the database."""
+        return cls(e._replace(id=event_map[e.name]) for e in DEFAULT_EVENT_TYPES if e.name in event_map)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, event_id):
+        return self._by_id.get(event_id)
+
+    def by_name(self, name):
+        return self._by_name.get(name)
+
+    def id_of(self, name):
+        """Id of the named event type, or None if there is no such type."""
+        event = self._by_name.get(name)
+        return event.id if event else None
+
+    def ids(self, **fields):
+        """Sorted ids of the event types whose fields equal the given values, e.g. ids(shot_value=3, made=True)."""
+        return tuple(sorted(e.id for e in self if all(getattr(e, k) == v for k, v in fields.items())))
+
+    def box_score_increments(self):
+        """{event id: ((BOX_SCORE_COLUMNS index, amount), ...)} for every event that feeds a box score."""
+        increments = {}
+        for e in self:
+            steps = [(0, e.points)] if e.points else []
+            for i, (_, fields) in enumerate(BOX_SCORE_COUNTERS, 1):
+                if all(getattr(e, k) == v for k, v in fields.items()):
+                    steps.append((i, 1))
+            if steps:
+                increments[e.id] = tuple(steps)
+        return increments
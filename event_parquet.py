@@ -0,0 +1,269 @@
+"""
+Columnar export and import of the play-by-play.
+
+Event_Creation joined with its match, round, phase and the player's team is written to one Parquet
+file per season, laid out as <directory>/year=<year>/events.parquet (Hive partitioning, so pyarrow,
+pandas, DuckDB or Spark read the directory as one dataset). Rows are streamed with a server-side
+cursor and written EXPORT_BATCH_ROWS at a time, so memory stays flat whatever the size of a season.
+
+    python event_parquet.py export exports/events
+    python event_parquet.py export exports/events --years 2021 2022
+    python event_parquet.py import exports/events
+
+The importer restores Season, Phase, Round, Match and Event_Creation rows with their original ids
+(rows that already exist are kept) and then rebuilds Match_Score and Player_Match_Stats. Teams, people
+and stadiums are not part of the files and must exist in the target database.
+
+Requires pyarrow.
+"""
+import argparse
+import os
+import re
+import sys
+
+import pymysql
+from pymysql.cursors import SSCursor
+
+import model
+
+EXPORT_BATCH_ROWS = 50000
+IMPORT_CHUNK_ROWS = 5000
+SEASON_FILE = 'events.parquet'
+SEASON_DIR_RE = re.compile(r'^year=(\d+)$')
+
+# (column, SQL expression, Arrow type name) - see _arrow_type()
+EXPORT_COLUMNS = (
+    ('event_creation_id', 'ec.id', 'int32'),
+    ('match_id', 'ec.match_id', 'int32'),
+    ('person_id', 'ec.person_id', 'int32'),
+    ('team_id', 'pt.team_id', 'int32'),
+    ('event_id', 'ec.event_id', 'int32'),
+    ('event', 'e.name', 'string'),
+    ('points', 'e.points', 'int8'),
+    ('game_time', 'ec.game_time', 'timestamp'),
+    ('real_time', 'ec.real_time', 'timestamp'),
+    ('match_date', 'm.match_date', 'date32'),
+    ('match_status', 'm.status', 'string'),
+    ('stadium_id', 'm.stadium_id', 'int32'),
+    ('home_team_id', 'm.home_team_id', 'int32'),
+    ('away_team_id', 'm.away_team_id', 'int32'),
+    ('round_id', 'r.id', 'int32'),
+    ('round_number', 'r.round_id', 'int32'),
+    ('phase_id', 'p.id', 'int32'),
+    ('phase_number', 'p.phase_id', 'int32'),
+)
+COLUMN_NAMES = tuple(name for name, _, _ in EXPORT_COLUMNS)
+
+SEASON_EVENTS_SQL = f"""
+    SELECT {', '.join(expr for _, expr, _ in EXPORT_COLUMNS)}
+    FROM Event_Creation ec
+    JOIN `Match` m ON ec.match_id = m.id
+    JOIN `Round` r ON m.round_id = r.id
+    JOIN Phase p ON r.phase_id = p.id
+    JOIN Event e ON ec.event_id = e.id
+    LEFT JOIN Person_Team pt ON ec.person_id = pt.person_id AND pt.team_id IN (m.home_team_id, m.away_team_id)
+    WHERE p.year = %s
+    ORDER BY ec.id
+"""
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise RuntimeError("The Parquet export needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _arrow_type(pa, name):
+    if name == 'timestamp':
+        return pa.timestamp('s')
+    return getattr(pa, name)()
+
+
+def arrow_schema():
+    pa = _pyarrow()
+    return pa.schema([(name, _arrow_type(pa, type_name)) for name, _, type_name in EXPORT_COLUMNS])
+
+
+def season_path(directory, year):
+    return os.path.join(directory, f'year={year}', SEASON_FILE)
+
+
+def season_files(directory, years=None):
+    """[(year, path)] of the season files under directory, oldest season first."""
+    found = []
+    if not os.path.isdir(directory):
+        return found
+    for entry in os.listdir(directory):
+        match = SEASON_DIR_RE.match(entry)
+        path = os.path.join(directory, entry, SEASON_FILE)
+        if match and os.path.isfile(path) and (years is None or int(match.group(1)) in years):
+            found.append((int(match.group(1)), path))
+    return sorted(found)
+
+
+def write_batches(path, batches):
+    """
+    Writes row batches (lists of tuples in EXPORT_COLUMNS order) to one Parquet file and returns the
+    row count. The file is written next to path and renamed, so readers never see a partial season.
+    """
+    pa = _pyarrow()
+    schema = arrow_schema()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + '.partial'
+    written = 0
+    with pa.parquet.ParquetWriter(partial, schema, compression='zstd') as writer:
+        for rows in batches:
+            columns = list(zip(*rows))
+            writer.write_batch(pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+            ))
+            written += len(rows)
+    os.replace(partial, path)
+    return written
+
+
+def iter_batches(path, batch_rows=IMPORT_CHUNK_ROWS):
+    """Yields the rows of a season file as lists of tuples in EXPORT_COLUMNS order, batch_rows at a time."""
+    pa = _pyarrow()
+    for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=list(COLUMN_NAMES)):
+        yield list(zip(*(batch.column(name).to_pylist() for name in COLUMN_NAMES)))
+
+
+def read_events(directory, years=None, columns=None):
+    """Reads the exported seasons into one pyarrow Table, with the season in a 'year' column."""
+    _pyarrow()
+    import pyarrow.dataset as ds
+    dataset = ds.dataset(directory, format='parquet', partitioning='hive')
+    filter_ = ds.field('year').isin(list(years)) if years is not None else None
+    return dataset.to_table(columns=columns, filter=filter_)
+
+
+def _fetch_batches(cur, batch_rows):
+    while True:
+        rows = cur.fetchmany(batch_rows)
+        if not rows:
+            return
+        yield rows
+
+
+def export_season(year, path, batch_rows=EXPORT_BATCH_ROWS):
+    """Streams one season's events into a Parquet file. Returns the number of rows written."""
+    with model.get_connection() as con:
+        cur = con.cursor(SSCursor)
+        try:
+            cur.execute(SEASON_EVENTS_SQL, (year,))
+            return write_batches(path, _fetch_batches(cur, batch_rows))
+        finally:
+            # Drains whatever is left unread, so the connection can go back to the pool
+            cur.close()
+
+
+def export_events(directory, years=None, batch_rows=EXPORT_BATCH_ROWS):
+    """Exports every season (or the given ones) to directory. Returns {year: rows}."""
+    if years is None:
+        years = [row['year'] for row in model.query("SELECT year FROM Season ORDER BY year")]
+    return {year: export_season(year, season_path(directory, year), batch_rows) for year in years}
+
+
+def _insert_new(cur, table, columns, rows, chunk_rows=IMPORT_CHUNK_ROWS):
+    """
+    Inserts the rows whose key (the first column) is not in table yet. Returns the number inserted.
+    Unlike INSERT IGNORE, a no-op ON DUPLICATE KEY UPDATE only skips existing rows: a missing team,
+    person or event type still fails the foreign key and raises.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+           f"VALUES ({', '.join(['%s'] * len(columns))}) "
+           f"ON DUPLICATE KEY UPDATE {columns[0]} = {columns[0]}")
+    inserted = 0
+    for start in range(0, len(rows), chunk_rows):
+        # pymysql turns executemany of an INSERT ... VALUES into multi-row INSERTs. An unchanged
+        # duplicate counts as 0 affected rows, a new row as 1.
+        inserted += cur.executemany(sql, rows[start:start + chunk_rows])
+    return inserted
+
+
+def import_season(year, path, chunk_rows=IMPORT_CHUNK_ROWS):
+    """
+    Loads one season file in a single transaction: its season, phases, rounds and matches first, then
+    its events. Existing rows with the same ids are left untouched. Returns the number of event rows
+    inserted, or None if the database rejected the file (e.g. a team or person is missing).
+    """
+    col = {name: i for i, name in enumerate(COLUMN_NAMES)}
+    phases, rounds, matches = {}, {}, {}
+    for rows in iter_batches(path, chunk_rows):
+        for r in rows:
+            phases[r[col['phase_id']]] = (r[col['phase_id']], r[col['phase_number']], year)
+            rounds[r[col['round_id']]] = (r[col['round_id']], r[col['round_number']], r[col['phase_id']])
+            matches[r[col['match_id']]] = tuple(r[col[c]] for c in (
+                'match_id', 'match_date', 'match_status', 'round_id', 'stadium_id', 'home_team_id', 'away_team_id'))
+
+    event_fields = [col[c] for c in ('event_creation_id', 'match_id', 'person_id', 'event_id', 'real_time', 'game_time')]
+    seen = set()
+    count = 0
+    try:
+        with model.get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                _insert_new(cur, 'Season', ('year',), [(year,)])
+                _insert_new(cur, 'Phase', ('id', 'phase_id', 'year'), phases.values())
+                _insert_new(cur, 'Round', ('id', 'round_id', 'phase_id'), rounds.values())
+                _insert_new(cur, '`Match`', ('id', 'match_date', 'status', 'round_id', 'stadium_id',
+                                             'home_team_id', 'away_team_id'), matches.values())
+                for rows in iter_batches(path, chunk_rows):
+                    # A player listed for both teams is exported once per team; keep one row per event
+                    events = []
+                    for r in rows:
+                        if r[0] not in seen:
+                            seen.add(r[0])
+                            events.append(tuple(r[i] for i in event_fields))
+                    count += _insert_new(cur, 'Event_Creation', ('id', 'match_id', 'person_id', 'event_id',
+                                                                 'real_time', 'game_time'), events, chunk_rows)
+            con.commit()
+    except pymysql.Error:
+        return None
+    model.invalidate_tables('Season', 'Phase', 'Round', 'Match', 'Event_Creation')
+    return count
+
+
+def import_events(directory, years=None, chunk_rows=IMPORT_CHUNK_ROWS):
+    """
+    Imports every season file under directory (or the given seasons) and rebuilds the score and box
+    score summaries once at the end. Returns {year: rows, or None if the season failed}.
+    """
+    imported = {year: import_season(year, path, chunk_rows) for year, path in season_files(directory, years)}
+    if any(imported.values()):
+        model.rebuild_match_scores()
+        model.rebuild_player_stats()
+    return imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export match events to per-season Parquet files, or import them back.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('export', "Write seasons to DIRECTORY"), ('import', "Load the season files in DIRECTORY")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument('directory')
+        cmd.add_argument('--years', type=int, nargs='+', metavar='YEAR', help="Only these seasons (default: all)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        results = export_events(args.directory, args.years)
+    else:
+        results = import_events(args.directory, args.years)
+        if not results:
+            print(f"No season files found in {args.directory}")
+            return 1
+    for year, rows in results.items():
+        verb = 'events exported' if args.command == 'export' else 'new events imported'
+        print(f"{year}: {'failed' if rows is None else f'{rows} {verb}'}")
+    return 1 if None in results.values() else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueryExecutor:
+    """
+    Runs independent model calls on a thread pool so the caller waits for the slowest call rather
+    than the sum of all of them. Every call takes its own connection from the connection pool, so
+    max_workers should not exceed the pool size.
+
+    The duration of every call is recorded per function name; see stats().
+    Calls must not gather() again from inside a worker, or the pool can run out of threads.
+    """
+
+    def __init__(self, max_workers=8):
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='query')
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def _record(self, name, seconds):
+        with self._lock:
+            calls, total, longest = self._timings.get(name, (0, 0.0, 0.0))
+            self._timings[name] = (calls + 1, total + seconds, max(longest, seconds))
+
+    def _timed(self, fn, args, kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._record(getattr(fn, '__name__', repr(fn)), time.perf_counter() - start)
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedules fn(*args, **kwargs) and returns its Future."""
+        return self._threads.submit(self._timed, fn, args, kwargs)
+
+    def gather(self, *calls, timeout=None):
+        """
+        Runs calls given as (fn, arg, ...) tuples concurrently and returns their results in order.
+        The exception of the first failing call (in argument order) is re-raised once all calls finished.
+        """
+        futures = [self.submit(fn, *args) for fn, *args in calls]
+        for future in futures:
+            future.exception(timeout)
+        return [future.result() for future in futures]
+
+    def stats(self):
+        """{function name: {'calls', 'total_ms', 'mean_ms', 'max_ms'}} since start or the last reset()."""
+        with self._lock:
+            return {
+                name: {
+                    'calls': calls,
+                    'total_ms': total * 1000,
+                    'mean_ms': total / calls * 1000,
+                    'max_ms': longest * 1000,
+                }
+                for name, (calls, total, longest) in self._timings.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+
+    def shutdown(self):
+        self._threads.shutdown(wait=True)
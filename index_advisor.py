@@ -0,0 +1,143 @@
+"""
+Index advisor: runs the model's read queries against a seeded database, EXPLAINs every statement they
+issue and reports full table scans and filesorts.
+
+Point .env at a local MySQL (or TiDB) filled by populate_huge.py, then:
+
+    python index_advisor.py
+    python index_advisor.py --min-rows 500 --only team_matches season_leaders
+
+Exits with status 1 when a statement needs attention, so it can guard index coverage as queries change.
+"""
+import argparse
+import re
+import sys
+
+import model
+from benchmark import build_cases, pick_sample
+
+# TiDB plan rows name their operator like "└─TableFullScan_5"
+TIDB_OPERATOR_RE = re.compile(r'([A-Za-z]+)_\d+\s*$')
+
+
+def plan_issues(plan, min_rows=1000):
+    """
+    Returns the problems found in an EXPLAIN result, as strings. Understands the MySQL tabular format
+    and the TiDB operator tree. Steps estimated below min_rows are ignored (small lookup tables).
+    """
+    issues = []
+    for row in plan:
+        if 'type' in row:
+            rows = int(row.get('rows') or 0)
+            if rows < min_rows:
+                continue
+            extra = row.get('Extra') or ''
+            if row['type'] == 'ALL':
+                issues.append(f"full scan of {row['table']} (~{rows} rows)")
+            if 'Using filesort' in extra:
+                issues.append(f"filesort on {row['table']} (~{rows} rows)")
+        elif 'estRows' in row:
+            rows = int(float(row['estRows'] or 0))
+            match = TIDB_OPERATOR_RE.search(row['id'])
+            if rows < min_rows or not match:
+                continue
+            operator = match.group(1)
+            if operator == 'TableFullScan':
+                issues.append(f"full scan of {row.get('access object') or 'table'} (~{rows} rows)")
+            elif operator == 'Sort':
+                issues.append(f"sort of ~{rows} rows")
+    return issues
+
+
+def pick_advisor_sample():
+    """benchmark.pick_sample() plus an Event_Creation row for the write-path queries."""
+    sample = pick_sample()
+    if sample is None:
+        return None
+    row = model.query("SELECT id FROM Event_Creation WHERE match_id = %s LIMIT 1", (sample['match_id'],))
+    sample['event_creation_id'] = row[0]['id'] if row else None
+    return sample
+
+
+def advisor_cases(sample):
+    """The benchmark cases plus the remaining read paths and the SELECTs behind the summary-table writes."""
+    s = sample
+    extra = [
+        ('players_page', 'team_id', lambda: model.get_players_page(s['team_id'])),
+        ('team_stadiums', 'team_id', lambda: model.get_team_stadiums(s['team_id'])),
+        ('referees_in_match', 'match_id', lambda: model.get_referees_in_match(s['match_id'])),
+        ('unassigned_referees', 'match_id', lambda: model.get_unassigned_referees(s['match_id'])),
+        ('matches_by_phase', 'group_phase_id', lambda: model.get_matches_by_phase(s['group_phase_id'])),
+        ('player_season_box_score', 'player_id', lambda: model.get_player_box_score(s['player_id'], year=s['year'])),
+        ('score_delta', 'event_creation_id',
+         lambda: model.query(model._score_select_sql("ec.id IN (%s)"), (s['event_creation_id'],))),
+        ('player_stats_delta', 'event_creation_id',
+         lambda: model.query(model._player_stats_select_sql("ec.id IN (%s)"), (s['event_creation_id'],))),
+    ]
+    extra += [
+        (f'{stat}_leaders', 'year', lambda stat=stat: model.get_leaderboard(stat, s['year']))
+        for stat in model.LEADERBOARD_STATS
+    ]
+    return build_cases(sample) + [(name, fn) for name, needs, fn in extra if s.get(needs) is not None]
+
+
+def collect_statements(cases):
+    """Runs every case with the cache cleared and returns {case: [(sql, params), ...]} of distinct statements."""
+    statements = {}
+    for name, fn in cases:
+        model.clear_cache()
+        with model.record_queries() as recorded:
+            fn()
+        seen = set()
+        statements[name] = []
+        for sql, params in recorded:
+            if sql not in seen:
+                seen.add(sql)
+                statements[name].append((sql, params))
+    return statements
+
+
+def advise(min_rows=1000, only=None):
+    """Returns [(case, sql, issues)] for every statement whose plan has issues."""
+    sample = pick_advisor_sample()
+    if sample is None:
+        raise RuntimeError("No completed group stage found - seed the database with populate_huge.py first")
+    cases = advisor_cases(sample)
+    if only:
+        cases = [(name, fn) for name, fn in cases if name in only]
+
+    findings = []
+    for name, statements in collect_statements(cases).items():
+        for sql, params in statements:
+            issues = plan_issues(model.query("EXPLAIN " + sql, params), min_rows)
+            if issues:
+                findings.append((name, sql, issues))
+    return findings
+
+
+def format_findings(findings):
+    if not findings:
+        return "No full scans or filesorts found."
+    lines = []
+    for name, sql, issues in findings:
+        lines.append(f"\n--- {name} ---")
+        lines.extend(f"  {issue}" for issue in issues)
+        lines.append("  " + " ".join(sql.split())[:300])
+    lines.append(f"\n{len(findings)} statement(s) need attention.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN the model's queries and report full scans and filesorts.")
+    parser.add_argument('--min-rows', type=int, default=1000,
+                        help="Ignore plan steps estimated below this many rows (default: 1000)")
+    parser.add_argument('--only', nargs='+', metavar='CASE', help="Only check these cases")
+    args = parser.parse_args(argv)
+
+    findings = advise(args.min_rows, args.only)
+    print(format_findings(findings))
+    return 1 if findings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,12 +14,14 @@ DB_HOST = os.getenv('DB_HOST')
 DB_USER = os.getenv('DB_USER')
 DB_PASS = os.getenv('DB_PASS')
 DB_NAME   = os.getenv('DB_NAME')
+DB_PORT = int(os.getenv('DB_PORT', 4000))
+DB_SSL = os.getenv('DB_SSL', 'true').lower() not in ('0', 'false', 'no')
 conn = pymysql.connect(
     host=DB_HOST, 
     user=DB_USER, 
     password=DB_PASS, 
-    port=4000,
-    ssl={'ca': certifi.where()}
+    port=DB_PORT,
+    ssl={'ca': certifi.where()} if DB_SSL else None
 )
 cursor = conn.cursor()
 print(f"   (Resetting) Dropping '{DB_NAME}' if it exists...")
@@ -0,0 +1,192 @@
+"""
+In-memory state of the matches being played.
+
+While a match is Ongoing its score, team fouls, per-player box score and most recent events live in a
+MatchState, so scoreboard, box score and foul-trouble reads never re-aggregate Event_Creation. The model
+builds the states from Event_Creation, applies every event it writes, and drops a state once its match
+leaves the Ongoing status.
+"""
+import threading
+import time
+from collections import deque
+
+from event_catalog import BOX_SCORE_COLUMNS
+
+RECENT_EVENTS = 10
+# Personal fouls from which a player counts as being in foul trouble
+FOUL_TROUBLE = 4
+
+
+class MatchState:
+    """
+    Running totals of one match. Not thread-safe on its own; LiveStateStore serialises access.
+
+    :param roster: {person_id: team_id} of both teams. Events of anyone else are kept but count for
+                   nobody, as the score queries' Person_Team join would drop them.
+    :param catalog: The EventCatalog used to score events.
+    """
+
+    def __init__(self, match_id, home_team_id, away_team_id, roster, catalog, recent=RECENT_EVENTS):
+        self.match_id = match_id
+        self.home_team_id = home_team_id
+        self.away_team_id = away_team_id
+        self.roster = dict(roster)
+        self._catalog = catalog
+        self._increments = catalog.box_score_increments()
+        self.score = {home_team_id: 0, away_team_id: 0}
+        self.team_fouls = {home_team_id: 0, away_team_id: 0}
+        self.players = {}
+        self.recent = deque(maxlen=recent)
+        self._events = {}
+
+    def _apply(self, person_id, event_id, sign):
+        team_id = self.roster.get(person_id)
+        if team_id is None:
+            return
+        line = self.players.get(person_id)
+        if line is None:
+            line = self.players[person_id] = [0] * len(BOX_SCORE_COLUMNS)
+        for index, amount in self._increments.get(event_id, ()):
+            line[index] += sign * amount
+        event = self._catalog.get(event_id)
+        if event is not None:
+            self.score[team_id] += sign * event.points
+            if event.category == 'foul':
+                self.team_fouls[team_id] += sign
+
+    def add(self, event_creation_id, person_id, event_id, game_time=None):
+        """Applies one recorded event. Adding an id twice is a no-op."""
+        if event_creation_id in self._events:
+            return
+        self._events[event_creation_id] = (person_id, event_id)
+        self._apply(person_id, event_id, 1)
+        event = self._catalog.get(event_id)
+        self.recent.append({
+            'id': event_creation_id,
+            'person_id': person_id,
+            'team_id': self.roster.get(person_id),
+            'event': event.name if event else None,
+            'points': event.points if event else 0,
+            'game_time': game_time,
+        })
+
+    def remove(self, event_creation_id):
+        """Reverts one event. Returns False if the event was never applied."""
+        recorded = self._events.pop(event_creation_id, None)
+        if recorded is None:
+            return False
+        self._apply(*recorded, -1)
+        # The list is not back-filled with the event before the window; it shrinks until new events arrive
+        self.recent = deque((e for e in self.recent if e['id'] != event_creation_id), maxlen=self.recent.maxlen)
+        return True
+
+    def scores(self):
+        """{home_team_id: score, away_team_id: score}, as model.get_scores() returns it."""
+        return dict(self.score)
+
+    def box_score(self, person_id):
+        """One player's line: 'games' plus every BOX_SCORE_COLUMNS counter, as model.get_player_box_score() returns it."""
+        line = self.players.get(person_id)
+        return {'games': 1 if line is not None else 0, **dict(zip(BOX_SCORE_COLUMNS, line or [0] * len(BOX_SCORE_COLUMNS)))}
+
+    def box_scores(self):
+        """{person_id: line} for every player with an event, each line also carrying its 'team_id'."""
+        return {pid: {'team_id': self.roster[pid], **self.box_score(pid)} for pid in self.players}
+
+    def foul_trouble(self, threshold=FOUL_TROUBLE):
+        """[{'person_id', 'team_id', 'fouls'}] of players with at least threshold fouls, most fouls first."""
+        fouls = BOX_SCORE_COLUMNS.index('fouls')
+        rows = [
+            {'person_id': pid, 'team_id': self.roster[pid], 'fouls': line[fouls]}
+            for pid, line in self.players.items() if line[fouls] >= threshold
+        ]
+        return sorted(rows, key=lambda r: (-r['fouls'], r['person_id']))
+
+    def scoreboard(self):
+        """Score, team fouls and the most recent events (newest last)."""
+        return {
+            'match_id': self.match_id,
+            'home_team_id': self.home_team_id,
+            'away_team_id': self.away_team_id,
+            'home_score': self.score[self.home_team_id],
+            'away_score': self.score[self.away_team_id],
+            'home_fouls': self.team_fouls[self.home_team_id],
+            'away_fouls': self.team_fouls[self.away_team_id],
+            'recent_events': [dict(e) for e in self.recent],
+        }
+
+
+class LiveStateStore:
+    """
+    The MatchStates of a process, keyed by match id. Every method takes the store's lock, and reads go
+    through read() so callers only ever see a consistent state.
+
+    version counts the mutations; a rebuild that started before a write can tell it would have missed it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+        self.version = 0
+        self.loaded_at = None
+
+    def __contains__(self, match_id):
+        with self._lock:
+            return match_id in self._states
+
+    def match_ids(self):
+        with self._lock:
+            return set(self._states)
+
+    def replace_all(self, states, since_version):
+        """
+        Installs freshly built states in place of all current ones, unless the store changed since
+        since_version (the rebuild may then lack a write). Returns whether the states were installed.
+        """
+        with self._lock:
+            if self.version != since_version:
+                return False
+            self._states = {s.match_id: s for s in states}
+            self.loaded_at = time.monotonic()
+            return True
+
+    def put(self, state):
+        with self._lock:
+            self._states[state.match_id] = state
+            self.version += 1
+
+    def drop(self, match_id):
+        with self._lock:
+            if self._states.pop(match_id, None) is not None:
+                self.version += 1
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+            self.loaded_at = None
+            self.version += 1
+
+    def add_events(self, match_id, events):
+        """Applies (event_creation_id, person_id, event_id, game_time) tuples. Ignored unless the match is live."""
+        with self._lock:
+            state = self._states.get(match_id)
+            if state is None:
+                return False
+            for event in events:
+                state.add(*event)
+            self.version += 1
+            return True
+
+    def remove_event(self, match_id, event_creation_id):
+        with self._lock:
+            state = self._states.get(match_id)
+            if state is None:
+                return False
+            self.version += 1
+            return state.remove(event_creation_id)
+
+    def read(self, match_id, fn, *args):
+        """fn(state, *args) under the lock, or None if the match is not live."""
+        with self._lock:
+            state = self._states.get(match_id)
+            return fn(state, *args) if state is not None else None
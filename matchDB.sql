@@ -63,7 +63,11 @@ CREATE TABLE `Event` (
     '3-Point Field Goal Made', 
     '3-Point Field Goal Attempt',
     'Assist', 
-    'Time running out')
+    'Time running out'),
+  `points` tinyint NOT NULL DEFAULT 0,
+  `category` ENUM ('shot', 'oreb', 'dreb', 'ast', 'stl', 'blk', 'tov', 'foul', 'other') NOT NULL DEFAULT 'other',
+  `shot_value` tinyint NOT NULL DEFAULT 0,
+  `made` boolean NOT NULL DEFAULT FALSE
 );
 
 CREATE TABLE `Match` (
@@ -74,6 +78,10 @@ CREATE TABLE `Match` (
   `stadium_id` int,  
   `home_team_id` int,
   `away_team_id` int,
+  KEY `idx_match_date` (`match_date`, `id`),
+  KEY `idx_match_round_status` (`round_id`, `status`),
+  KEY `idx_match_home_date` (`home_team_id`, `match_date`),
+  KEY `idx_match_away_date` (`away_team_id`, `match_date`),
   FOREIGN KEY (`round_id`) REFERENCES `Round` (`id`),
   FOREIGN KEY (`stadium_id`) REFERENCES `Stadium` (`id`),
   FOREIGN KEY (`home_team_id`) REFERENCES `Team` (`id`),
@@ -87,6 +95,7 @@ CREATE TABLE `Person_Team` (
   `ending` timestamp,
   `shirt_num` int,
   PRIMARY KEY (`person_id`, `team_id`),
+  KEY `idx_person_team_team` (`team_id`),
   FOREIGN KEY (`person_id`) REFERENCES `Person` (`id`),
   FOREIGN KEY (`team_id`) REFERENCES `Team` (`id`)
 );
@@ -95,6 +104,7 @@ CREATE TABLE `Match_Referee` (
   `match_id` int,
   `referee_id` int,
   PRIMARY KEY (`match_id`, `referee_id`),
+  KEY `idx_match_referee_referee` (`referee_id`, `match_id`),
   FOREIGN KEY (`match_id`) REFERENCES `Match` (`id`),
   FOREIGN KEY (`referee_id`) REFERENCES `Referee` (`id`)
 );
@@ -106,11 +116,76 @@ CREATE TABLE `Event_Creation` (
   `event_id` int,
   `real_time` timestamp DEFAULT CURRENT_TIMESTAMP,
   `game_time` timestamp,
+  KEY `idx_event_match_time` (`match_id`, `game_time`),
+  KEY `idx_event_person_event` (`person_id`, `event_id`),
   FOREIGN KEY (`match_id`) REFERENCES `Match` (`id`) ON DELETE CASCADE,
   FOREIGN KEY (`person_id`) REFERENCES `Person` (`id`) ON DELETE CASCADE,
   FOREIGN KEY (`event_id`) REFERENCES `Event` (`id`)
 );
 
+CREATE TABLE `Match_Score` (
+  `match_id` int PRIMARY KEY,
+  `home_score` int NOT NULL DEFAULT 0,
+  `away_score` int NOT NULL DEFAULT 0,
+  FOREIGN KEY (`match_id`) REFERENCES `Match` (`id`) ON DELETE CASCADE
+);
+
+CREATE TABLE `Player_Match_Stats` (
+  `person_id` int,
+  `match_id` int,
+  `year` int,
+  `points` int NOT NULL DEFAULT 0,
+  `fg2m` int NOT NULL DEFAULT 0,
+  `fg2a` int NOT NULL DEFAULT 0,
+  `fg3m` int NOT NULL DEFAULT 0,
+  `fg3a` int NOT NULL DEFAULT 0,
+  `ftm` int NOT NULL DEFAULT 0,
+  `fta` int NOT NULL DEFAULT 0,
+  `oreb` int NOT NULL DEFAULT 0,
+  `dreb` int NOT NULL DEFAULT 0,
+  `ast` int NOT NULL DEFAULT 0,
+  `stl` int NOT NULL DEFAULT 0,
+  `blk` int NOT NULL DEFAULT 0,
+  `tov` int NOT NULL DEFAULT 0,
+  `fouls` int NOT NULL DEFAULT 0,
+  PRIMARY KEY (`person_id`, `match_id`),
+  KEY `idx_pms_match` (`match_id`),
+  KEY `idx_pms_year` (`year`, `person_id`),
+  FOREIGN KEY (`person_id`) REFERENCES `Person` (`id`),
+  FOREIGN KEY (`match_id`) REFERENCES `Match` (`id`) ON DELETE CASCADE
+);
+
+CREATE TABLE `Standings_Phase` (
+  `phase_id` int PRIMARY KEY,
+  `version` int NOT NULL DEFAULT 0,
+  `snapshot_version` int,
+  `is_final` boolean NOT NULL DEFAULT FALSE,
+  `built_at` timestamp NULL,
+  FOREIGN KEY (`phase_id`) REFERENCES `Phase` (`id`) ON DELETE CASCADE
+);
+
+CREATE TABLE `Standings_Snapshot` (
+  `phase_id` int,
+  `team_id` int,
+  `group_identifier` int,
+  `group_rank` int NOT NULL,
+  `wins` int NOT NULL DEFAULT 0,
+  `losses` int NOT NULL DEFAULT 0,
+  `points_for` int,
+  `points_against` int,
+  PRIMARY KEY (`phase_id`, `team_id`),
+  FOREIGN KEY (`phase_id`) REFERENCES `Phase` (`id`) ON DELETE CASCADE,
+  FOREIGN KEY (`team_id`) REFERENCES `Team` (`id`)
+);
+
+CREATE TABLE `Archived_Season` (
+  `year` int PRIMARY KEY,
+  `file_name` varchar(255) NOT NULL,
+  `events` int NOT NULL,
+  `archived_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (`year`) REFERENCES `Season` (`year`)
+);
+
 CREATE TABLE `Team_stadium` (
   `team_id` int,
   `stadium_id` int, 
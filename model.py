@@ -1,8 +1,20 @@
 import pymysql
 import certifi
 import os
+import re
+import time
+import json
+import base64
+import binascii
+from contextlib import contextmanager
+from datetime import datetime
 from dotenv import load_dotenv
 import bcrypt
+from pool import ConnectionPool
+from cache import QueryCache
+from executor import QueryExecutor
+from event_catalog import BOX_SCORE_COLUMNS, BOX_SCORE_COUNTERS, EVENT_DEFINITIONS, EventCatalog, EventType
+from live_state import FOUL_TROUBLE, LiveStateStore, MatchState
 
 load_dotenv()
 
@@ -10,19 +22,74 @@ DB_HOST = os.getenv('DB_HOST')
 DB_USER = os.getenv('DB_USER')
 DB_PASS = os.getenv('DB_PASS')
 DB_NAME   = os.getenv('DB_NAME')
-
-def get_connection():
+DB_PORT = int(os.getenv('DB_PORT', 4000))
+DB_SSL = os.getenv('DB_SSL', 'true').lower() not in ('0', 'false', 'no')
+
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 10))
+DB_POOL_IDLE_TIMEOUT = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))
+DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', 30))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 256))
+CACHE_TTL = float(os.getenv('CACHE_TTL', 300))
+
+# Threads for run_concurrently(); each one holds a pooled connection while it runs
+QUERY_WORKERS = int(os.getenv('QUERY_WORKERS', min(8, DB_POOL_MAX)))
+# Seconds before the live match state is rebuilt from the database, to pick up writes of other processes (0: never)
+LIVE_STATE_MAX_AGE = float(os.getenv('LIVE_STATE_MAX_AGE', 30))
+# Directory of the season archive files written by archive.py
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive'))
+
+def open_connection():
+    """Opens a brand-new connection. Everything else should go through get_connection()."""
     con = pymysql.connect(
         host=DB_HOST, 
         user=DB_USER, 
         password=DB_PASS, 
         database=DB_NAME,
-        port=4000,
-        ssl={'ca': certifi.where()}
+        port=DB_PORT,
+        ssl={'ca': certifi.where()} if DB_SSL else None,
+        autocommit=True
     )
     return con
 
+_pool = ConnectionPool(
+    open_connection,
+    min_size=DB_POOL_MIN,
+    max_size=DB_POOL_MAX,
+    idle_timeout=DB_POOL_IDLE_TIMEOUT,
+    ping_interval=DB_POOL_PING_INTERVAL,
+    checkout_timeout=DB_POOL_TIMEOUT
+)
+
+def get_connection():
+    """
+    Checks out a connection from the process-wide pool.
+    Leaving the `with` block returns it to the pool (rolling back any unfinished transaction).
+    Statements run in autocommit mode unless con.begin() is called.
+    """
+    return _pool.connection()
+
+def get_pool_stats():
+    """Returns the connection pool usage counters."""
+    return _pool.stats()
+
+_recorded_queries = None
+
+@contextmanager
+def record_queries():
+    """Collects the (sql, params) of every query() call made inside the block into the yielded list."""
+    global _recorded_queries
+    _recorded_queries = recorded = []
+    try:
+        yield recorded
+    finally:
+        _recorded_queries = None
+
 def query(sql, params=()):
+    if _recorded_queries is not None:
+        _recorded_queries.append((sql, tuple(params)))
     returnable = []
     with get_connection() as con:
         with con.cursor() as cur:
@@ -31,6 +98,142 @@ def query(sql, params=()):
             for row in cur.fetchall():
                 returnable.append(dict(zip(cols, row)))
             return returnable
+
+_cache = QueryCache(max_entries=CACHE_MAX_ENTRIES, default_ttl=CACHE_TTL)
+
+def cached_query(sql, params=(), tables=(), ttl=None):
+    """
+    Same as query(), but results are cached in-process keyed by SQL + params.
+    :param tables: Tables the query reads; any write to one of them evicts the entry.
+    :param ttl: Seconds the entry stays valid (defaults to CACHE_TTL).
+    """
+    key = (sql, tuple(params))
+    hit, value = _cache.get(key)
+    if not hit:
+        rows = query(sql, params)
+        _cache.set(key, rows, tables, ttl, token=value)
+        value = rows
+    # Callers are free to mutate the rows they get back, so hand out copies.
+    return [dict(row) for row in value]
+
+_WRITE_TABLE_RE = re.compile(r"^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?", re.IGNORECASE)
+
+def invalidate_tables(*tables):
+    """Evicts cached results that read any of the given tables."""
+    _cache.invalidate(*tables)
+
+def _invalidate_written_table(sql):
+    match = _WRITE_TABLE_RE.match(sql)
+    if match:
+        _cache.invalidate(match.group(1))
+
+def get_cache_stats():
+    """Returns the query cache hit/miss counters."""
+    return _cache.stats()
+
+def clear_cache():
+    """Drops every cached query result."""
+    _cache.clear()
+
+_executor = QueryExecutor(max_workers=QUERY_WORKERS)
+
+def run_concurrently(*calls):
+    """
+    Runs independent model calls, given as (function, arg, ...) tuples, on the query thread pool and
+    returns their results in order. Exceptions propagate. Do not call it from inside one of the calls.
+    """
+    return _executor.gather(*calls)
+
+def get_executor_stats():
+    """Returns per-function call counts and timings of run_concurrently() calls."""
+    return _executor.stats()
+
+def encode_cursor(values):
+    """Packs the sort key of the last row on a page into an opaque, URL-safe page cursor."""
+    raw = json.dumps(values, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """Inverse of encode_cursor(). Raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid page cursor: {token!r}")
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid page cursor: {token!r}")
+    return values
+
+def _seek_clause(keys, values):
+    """
+    Builds the keyset predicate "row comes after `values` in the order given by `keys`", expanded into
+    (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... so the database can range-scan an index on the keys.
+
+    Keys may be NULL. MySQL sorts NULL before every value ascending and after every value descending,
+    so a NULL in the cursor is compared with IS [NOT] NULL instead of = and >, which would never match.
+    """
+    branches = []
+    params = []
+    for i, (expr, _, descending) in enumerate(keys):
+        value = values[i]
+        if value is None and descending:
+            continue  # Nothing sorts after NULL
+        parts = []
+        for (prev_expr, _, _), prev_value in zip(keys[:i], values):
+            if prev_value is None:
+                parts.append(f"{prev_expr} IS NULL")
+            else:
+                parts.append(f"{prev_expr} = %s")
+                params.append(prev_value)
+        if value is None:
+            parts.append(f"{expr} IS NOT NULL")
+        elif descending:
+            parts.append(f"({expr} < %s OR {expr} IS NULL)")
+            params.append(value)
+        else:
+            parts.append(f"{expr} > %s")
+            params.append(value)
+        branches.append("(" + " AND ".join(parts) + ")")
+    if not branches:
+        return "(1 = 0)", params
+    return "(" + " OR ".join(branches) + ")", params
+
+def seek_page(select_sql, conditions, params, keys, after=None, limit=10, tables=None):
+    """
+    Keyset (seek) pagination: fetches the page that follows the cursor `after`, so every page costs
+    the same as the first one instead of scanning and discarding offset*limit rows.
+
+    :param select_sql: SELECT ... FROM ... JOIN ... without WHERE, ORDER BY or LIMIT.
+    :param conditions: WHERE conditions (ANDed together) whose placeholders are filled from params.
+    :param keys: (sql_expression, row_key, descending) triples defining the page order.
+                 The last key must be unique (usually the id) so the order is total.
+    :param after: Cursor returned with the previous page, or None for the first page.
+    :param tables: When given, the page is served through cached_query() tagged with these tables.
+    :return: (rows, next_cursor). next_cursor is None on the last page.
+    """
+    conditions = list(conditions)
+    params = list(params)
+    if after:
+        values = decode_cursor(after)
+        if len(values) != len(keys):
+            raise ValueError(f"Invalid page cursor: {after!r}")
+        clause, clause_params = _seek_clause(keys, values)
+        conditions.append(clause)
+        params.extend(clause_params)
+
+    sql = select_sql
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY " + ", ".join(f"{expr} {'DESC' if descending else 'ASC'}" for expr, _, descending in keys)
+    # One extra row tells us whether there is a next page without a COUNT query.
+    sql += " LIMIT %s"
+    params.append(limit + 1)
+
+    rows = cached_query(sql, params, tables=tables) if tables else query(sql, params)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1][key] for _, key, _ in keys])
     
 
 def get_persons(limit=0):
@@ -53,6 +256,15 @@ def get_players(team_id, offset=0, limit=10):
     params = (team_id, limit, offset * limit)
     return query(sql, params)
 
+def get_players_page(team_id, after=None, limit=10):
+    """Fetches a page of a team's players ordered by name. Returns (players, next_cursor)."""
+    sql = '''SELECT p.speciality, p.id, p.first_name, p.last_name, pt.shirt_num, pt.team_id, t.name
+             FROM person as p
+             JOIN person_team as pt ON p.id = pt.person_id
+             JOIN team as t ON pt.team_id = t.id'''
+    keys = [('p.last_name', 'last_name', False), ('p.first_name', 'first_name', False), ('p.id', 'id', False)]
+    return seek_page(sql, ["pt.team_id = %s"], [team_id], keys, after, limit)
+
             
 
 def get_teams(offset=0, limit=10):
@@ -62,7 +274,11 @@ def get_teams(offset=0, limit=10):
         sql += " LIMIT %s OFFSET %s"
         params.extend([limit, offset * limit])
     
-    return query(sql, params)
+    return cached_query(sql, params, tables=('Team',))
+
+def get_teams_page(after=None, limit=10):
+    """Fetches a page of teams ordered by id. Returns (teams, next_cursor)."""
+    return seek_page("SELECT id, name FROM team", [], [], [('id', 'id', False)], after, limit, tables=('Team',))
             
 def get_matches():
     return query("SELECT * FROM `match`;")
@@ -74,7 +290,7 @@ def get_seasons(offset=0, limit=10):
         sql += " LIMIT %s OFFSET %s"
         params.extend([limit, offset * limit])
     
-    return query(sql, params)
+    return cached_query(sql, params, tables=('Season',))
 
 def get_matches_by_round(round_id):
     return query("SELECT id as match_id, home_team_id, away_team_id, match_date, status FROM `Match` WHERE round_id = %s;", (round_id,))
@@ -82,20 +298,84 @@ def get_matches_by_round(round_id):
 def get_match(match_id):
     return query("SELECT * FROM `Match` WHERE id = %s;", (match_id,))
 
-def get_matches_by_team(team_id ,offset):
-        return (query("SELECT name FROM Team WHERE id = %s;", (team_id,)),
-            query("""
-                SELECT
-                    m.id, m.match_date,
-                    ht.name AS home_team_name,
-                    at.name AS away_team_name
-                FROM `Match` m
-                JOIN `Team` ht ON m.home_team_id = ht.id
-                JOIN `Team` at ON m.away_team_id = at.id
-                WHERE m.home_team_id = %s OR m.away_team_id = %s
-                ORDER BY m.match_date DESC
-                LIMIT 10 OFFSET %s;
-            """, (team_id, team_id, offset*10)))
+def _with_scores(matches):
+    """
+    Adds home_score/away_score to match rows that carry home_team_id and away_team_id, in one batched
+    get_scores_for_matches() lookup, so list views show the same (live, for Ongoing matches) score as
+    the match pages. Scheduled matches get no score.
+    """
+    scores = get_scores_for_matches(m['id'] for m in matches if m['status'] != 'Scheduled')
+    for m in matches:
+        match_scores = scores.get(m['id'], {})
+        m['home_score'] = match_scores.get(m['home_team_id'])
+        m['away_score'] = match_scores.get(m['away_team_id'])
+    return matches
+
+def get_match_with_teams(match_id):
+    """Fetches a match with its team names, or None if it does not exist."""
+    rows = query("""
+        SELECT m.*, ht.name AS home_team_name, at.name AS away_team_name
+        FROM `Match` m
+        JOIN Team ht ON m.home_team_id = ht.id
+        JOIN Team at ON m.away_team_id = at.id
+        WHERE m.id = %s
+    """, (match_id,))
+    return rows[0] if rows else None
+
+def get_match_roster(match_id, side):
+    """Players of the home or away team of a match ('home' or 'away')."""
+    if side not in ('home', 'away'):
+        raise ValueError("side must be 'home' or 'away'")
+    return query(f"""
+        SELECT p.id, p.first_name, p.last_name, pt.shirt_num
+        FROM `Match` m
+        JOIN Person_Team pt ON pt.team_id = m.{side}_team_id
+        JOIN Person p ON p.id = pt.person_id
+        WHERE m.id = %s AND p.speciality = 'Player'
+    """, (match_id,))
+
+def get_team_matches_page(team_id, after=None, limit=10):
+    """
+    Fetches a page of a team's matches, newest first, with team names and scores. Returns (matches, next_cursor).
+
+    Home and away games are read as two range scans of idx_match_home_date / idx_match_away_date,
+    each already in (match_date, id) order and covered by the index, and merged with UNION ALL;
+    an OR across both columns would scan and sort the whole Match table instead.
+    """
+    keys = [('match_date', 'match_date', True), ('id', 'id', True)]
+    seek, seek_params = ("", [])
+    if after:
+        values = decode_cursor(after)
+        if len(values) != len(keys):
+            raise ValueError(f"Invalid page cursor: {after!r}")
+        clause, seek_params = _seek_clause(keys, values)
+        seek = f" AND {clause}"
+    # One extra row tells us whether there is a next page.
+    fetch = limit + 1
+    sql = f"""
+        SELECT
+            m.id, m.match_date, m.status, m.home_team_id, m.away_team_id,
+            ht.name AS home_team_name,
+            at.name AS away_team_name
+        FROM (
+            (SELECT id, match_date FROM `Match` WHERE home_team_id = %s{seek}
+             ORDER BY match_date DESC, id DESC LIMIT %s)
+            UNION ALL
+            (SELECT id, match_date FROM `Match` WHERE away_team_id = %s{seek}
+             ORDER BY match_date DESC, id DESC LIMIT %s)
+        ) AS schedule
+        JOIN `Match` m ON m.id = schedule.id
+        JOIN `Team` ht ON m.home_team_id = ht.id
+        JOIN `Team` at ON m.away_team_id = at.id
+        ORDER BY schedule.match_date DESC, schedule.id DESC
+        LIMIT %s
+    """
+    params = [team_id, *seek_params, fetch, team_id, *seek_params, fetch, fetch]
+    rows = query(sql, params)
+    if len(rows) <= limit:
+        return _with_scores(rows), None
+    rows = rows[:limit]
+    return _with_scores(rows), encode_cursor([rows[-1][key] for _, key, _ in keys])
 
 def get_referees_in_match(match_id):
     return query("SELECT r.* FROM match_referee JOIN referee r ON match_referee.referee_id = r.id WHERE match_id = %s;", (match_id,))
@@ -105,6 +385,11 @@ def get_referees(offset=0, limit=10):
     sql = "SELECT id, first_name, last_name FROM Referee ORDER BY last_name, first_name LIMIT %s OFFSET %s"
     return query(sql, (limit, offset * limit))
 
+def get_referees_page(after=None, limit=10):
+    """Fetches a page of referees ordered by name. Returns (referees, next_cursor)."""
+    keys = [('last_name', 'last_name', False), ('first_name', 'first_name', False), ('id', 'id', False)]
+    return seek_page("SELECT id, first_name, last_name FROM Referee", [], [], keys, after, limit)
+
 def link_referee_to_match(match_id, referee_id):
     """Links a referee to a match in the Match_Referee table."""
     sql = "INSERT INTO Match_Referee (match_id, referee_id) VALUES (%s, %s)"
@@ -130,32 +415,31 @@ def get_referee_details(referee_id):
 def get_matches_for_referee(referee_id, offset=0, limit=10):
     """Fetches all matches for a specific referee, with team names and scores."""
     sql = """
-        WITH MatchScores AS (
-            SELECT
-                ec.match_id,
-                SUM(CASE WHEN pt.team_id = m.home_team_id AND e.name LIKE '%%Made' THEN
-                    CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                    ELSE 0 END) AS home_score,
-                SUM(CASE WHEN pt.team_id = m.away_team_id AND e.name LIKE '%%Made' THEN
-                    CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                    ELSE 0 END) AS away_score
-            FROM Event_Creation ec
-            JOIN `Match` m ON ec.match_id = m.id
-            JOIN Event e ON ec.event_id = e.id
-            JOIN Person_Team pt ON ec.person_id = pt.person_id AND pt.team_id IN (m.home_team_id, m.away_team_id)
-            GROUP BY ec.match_id
-        )
-        SELECT m.id, m.match_date, m.status, ht.name AS home_team_name, at.name AS away_team_name, ms.home_score, ms.away_score
+        SELECT m.id, m.match_date, m.status, m.home_team_id, m.away_team_id, ht.name AS home_team_name, at.name AS away_team_name
         FROM Match_Referee mr
         JOIN `Match` m ON mr.match_id = m.id
         JOIN `Team` ht ON m.home_team_id = ht.id
         JOIN `Team` at ON m.away_team_id = at.id
-        LEFT JOIN MatchScores ms ON m.id = ms.match_id
         WHERE mr.referee_id = %s
         ORDER BY m.match_date DESC
         LIMIT %s OFFSET %s;
     """
-    return query(sql, (referee_id, limit, offset * limit))
+    return _with_scores(query(sql, (referee_id, limit, offset * limit)))
+
+# Newest matches first; the id breaks ties between matches played on the same day.
+MATCH_PAGE_KEYS = [('m.match_date', 'match_date', True), ('m.id', 'id', True)]
+
+def get_matches_for_referee_page(referee_id, after=None, limit=10):
+    """Fetches a page of a referee's matches, newest first, with scores. Returns (matches, next_cursor)."""
+    sql = """
+        SELECT m.id, m.match_date, m.status, m.home_team_id, m.away_team_id, ht.name AS home_team_name, at.name AS away_team_name
+        FROM Match_Referee mr
+        JOIN `Match` m ON mr.match_id = m.id
+        JOIN `Team` ht ON m.home_team_id = ht.id
+        JOIN `Team` at ON m.away_team_id = at.id
+    """
+    matches, next_cursor = seek_page(sql, ["mr.referee_id = %s"], [referee_id], MATCH_PAGE_KEYS, after, limit)
+    return _with_scores(matches), next_cursor
 
 def execute_cud(sql, params=()):
     """
@@ -167,6 +451,7 @@ def execute_cud(sql, params=()):
             with con.cursor() as cur:
                 cur.execute(sql, params)
                 con.commit()
+                _invalidate_written_table(sql)
                 return True
     except pymysql.Error:
         return False
@@ -181,6 +466,7 @@ def execute_insert_and_get_id(sql, params=()):
             with con.cursor() as cur:
                 cur.execute(sql, params)
                 con.commit()
+                _invalidate_written_table(sql)
                 return cur.lastrowid
     except pymysql.Error:
         return None
@@ -303,7 +589,29 @@ def update_player_shirt_number(player_id, new_shirt_number):
 
 def get_all_events():
     """Fetches all possible event types with their IDs."""
-    return query("SELECT id, name FROM Event ORDER BY id")
+    return cached_query("SELECT id, name FROM Event ORDER BY id", tables=('Event',))
+
+_event_catalog = None
+
+def get_event_catalog():
+    """The EventCatalog of the Event table, loaded on first use and kept for the life of the process."""
+    global _event_catalog
+    if _event_catalog is None:
+        rows = query("SELECT id, name, points, category, shot_value, made FROM Event ORDER BY id")
+        _event_catalog = EventCatalog(
+            EventType(r['id'], r['name'], r['points'], r['category'], r['shot_value'], bool(r['made'])) for r in rows
+        )
+    return _event_catalog
+
+def reload_event_catalog():
+    """Forgets the loaded EventCatalog so the next use reads the Event table again. Live states are rescored too."""
+    global _event_catalog
+    _event_catalog = None
+    _live.clear()
+
+def get_event_ids():
+    """Returns a read-only {event name: event id} map from the event catalog."""
+    return get_event_catalog().ids_by_name
 
 def get_player_stats(player_id, offset=0, limit=10):
     """Fetches paginated stats for a given player. Returns a list of dictionaries."""
@@ -315,6 +623,82 @@ def get_player_stats(player_id, offset=0, limit=10):
     params = (player_id, limit, offset * limit)
     return query(sql, params)
 
+ARCHIVED_SEASON_DDL = """
+    CREATE TABLE IF NOT EXISTS `Archived_Season` (
+      `year` int PRIMARY KEY,
+      `file_name` varchar(255) NOT NULL,
+      `events` int NOT NULL,
+      `archived_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+      FOREIGN KEY (`year`) REFERENCES `Season` (`year`)
+    )
+"""
+# Ids of the matches whose events live in archive files, for use in WHERE clauses
+ARCHIVED_MATCHES_SQL = """
+    SELECT am.id FROM `Match` am
+    JOIN `Round` ar ON am.round_id = ar.id
+    JOIN Phase ap ON ar.phase_id = ap.id
+    JOIN Archived_Season a ON a.year = ap.year
+"""
+
+def get_archived_seasons():
+    """{year: archive file name} of the seasons moved out of Event_Creation by archive.py."""
+    try:
+        rows = cached_query("SELECT year, file_name FROM Archived_Season", tables=('Archived_Season',))
+    except pymysql.err.ProgrammingError:
+        # A database created before Archived_Season existed has no archived seasons
+        return {}
+    return {row['year']: row['file_name'] for row in rows}
+
+def _open_archive(year):
+    import archive  # NumPy is only required once seasons are archived
+    return archive.open_season(os.path.join(ARCHIVE_DIR, get_archived_seasons()[year]))
+
+def _archived_season_of(match_id):
+    """The season of a match if it has been archived, else None."""
+    archived = get_archived_seasons()
+    if not archived:
+        return None
+    rows = cached_query("""
+        SELECT p.year FROM `Match` m
+        JOIN `Round` r ON m.round_id = r.id
+        JOIN Phase p ON r.phase_id = p.id
+        WHERE m.id = %s
+    """, (match_id,), tables=('Match', 'Round', 'Phase'))
+    if not rows or rows[0]['year'] not in archived:
+        return None
+    return rows[0]['year']
+
+def _match_archive(match_id):
+    """The SeasonArchive holding a match's events, or None if they are in Event_Creation."""
+    year = _archived_season_of(match_id)
+    return None if year is None else _open_archive(year)
+
+def get_player_stats_page(player_id, after=None, limit=10):
+    """
+    Fetches a page of a player's events in the order they were recorded. Returns (events, next_cursor).
+    Events of archived seasons are read from their archive files and merged in by id.
+    """
+    sql = '''SELECT ec.id, ec.match_id, e.name, ec.game_time
+             FROM event_creation as ec
+             JOIN event as e ON ec.event_id = e.id'''
+    rows, next_cursor = seek_page(sql, ["ec.person_id = %s"], [player_id], [('ec.id', 'id', False)], after, limit)
+    archived = get_archived_seasons()
+    if not archived:
+        return rows, next_cursor
+
+    after_id = decode_cursor(after)[0] if after else 0
+    catalog = get_event_catalog()
+    for year in sorted(archived):
+        for event_creation_id, match_id, _, event_id, _, game_time in _open_archive(year).person_events(player_id, after_id, limit + 1):
+            event = catalog.get(event_id)
+            rows.append({'id': event_creation_id, 'match_id': match_id, 'name': event.name if event else None, 'game_time': game_time})
+    # An interrupted archive run can leave rows of an archived season behind in Event_Creation
+    rows = sorted({row['id']: row for row in rows}.values(), key=lambda row: row['id'])
+    if len(rows) <= limit and next_cursor is None:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1]['id']])
+
 
 def get_match_stats(match_id, offset=0, limit=10):
     """Fetches paginated events for a given match. Returns a list of dictionaries."""
@@ -330,30 +714,170 @@ def get_match_stats(match_id, offset=0, limit=10):
     params = (match_id, limit, offset * limit)
     return query(sql, params)
 
+def get_match_stats_page(match_id, after=None, limit=10):
+    """
+    Fetches a page of a match's events in game-clock order. Returns (events, next_cursor).
+    Events recorded without a game clock (e.g. from the web scorer) are placed by their recording time.
+    Matches of archived seasons are read from their archive file.
+    """
+    sql = '''SELECT ec.id as id, t.name as team_name, pt.shirt_num, p.last_name, e.name as event_name, ec.game_time,
+                    COALESCE(ec.game_time, ec.real_time) as sort_time, ec.event_id
+             FROM event_creation as ec
+             JOIN event as e ON ec.event_id = e.id
+             JOIN person as p ON ec.person_id = p.id
+             JOIN person_team as pt ON p.id = pt.person_id
+             JOIN team as t ON pt.team_id = t.id'''
+    keys = [('COALESCE(ec.game_time, ec.real_time)', 'sort_time', False), ('ec.event_id', 'event_id', False), ('ec.id', 'id', False)]
+    season = _match_archive(match_id)
+    if season is not None:
+        return _archived_match_stats_page(season, match_id, after, limit, len(keys))
+    return seek_page(sql, ["ec.match_id = %s"], [match_id], keys, after, limit)
+
+def _archived_match_stats_page(season, match_id, after, limit, key_count):
+    """get_match_stats_page() for a match of an archived season, read from its SeasonArchive."""
+    start = None
+    if after:
+        values = decode_cursor(after)
+        if len(values) != key_count:
+            raise ValueError(f"Invalid page cursor: {after!r}")
+        try:
+            start = (datetime.fromisoformat(values[0]), int(values[1]), int(values[2]))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid page cursor: {after!r}")
+    players = {row['person_id']: row for row in cached_query("""
+        SELECT pt.person_id, p.last_name, pt.shirt_num, t.name AS team_name
+        FROM `Match` m
+        JOIN Person_Team pt ON pt.team_id IN (m.home_team_id, m.away_team_id)
+        JOIN Person p ON p.id = pt.person_id
+        JOIN Team t ON t.id = pt.team_id
+        WHERE m.id = %s
+    """, (match_id,), tables=('Match', 'Person_Team', 'Person', 'Team'))}
+    catalog = get_event_catalog()
+
+    rows = []
+    for event_creation_id, _, person_id, event_id, sort_time, game_time in season.match_events(match_id):
+        player = players.get(person_id)
+        if player is None or (start and (sort_time, event_id, event_creation_id) <= start):
+            continue
+        event = catalog.get(event_id)
+        rows.append({
+            'id': event_creation_id, 'team_name': player['team_name'], 'shirt_num': player['shirt_num'],
+            'last_name': player['last_name'], 'event_name': event.name if event else None,
+            'game_time': game_time, 'sort_time': sort_time, 'event_id': event_id,
+        })
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, encode_cursor([rows[-1]['sort_time'], rows[-1]['event_id'], rows[-1]['id']])
+    return rows, None
+
+
+def get_player_box_score(player_id, year=None, match_id=None):
+    """
+    Sums a player's Player_Match_Stats rows: one match, one season, or the whole career when
+    neither is given. Returns a dict with 'games' and every counter in BOX_SCORE_COLUMNS.
+    An Ongoing match is read from its live state.
+    """
+    if match_id is not None and year is None and match_id in _live_match_ids():
+        line = _live.read(match_id, MatchState.box_score, player_id)
+        if line is not None:
+            return line
+    sums = ", ".join(f"COALESCE(SUM({c}), 0) AS {c}" for c in BOX_SCORE_COLUMNS)
+    sql = f"SELECT COUNT(*) AS games, {sums} FROM Player_Match_Stats WHERE person_id = %s"
+    params = [player_id]
+    if year is not None:
+        sql += " AND year = %s"
+        params.append(year)
+    if match_id is not None:
+        sql += " AND match_id = %s"
+        params.append(match_id)
+    return {k: int(v) for k, v in query(sql, tuple(params))[0].items()}
 
 def get_player_shot_stats(player_id, shot_type, match_id=None):
-    with get_connection() as con:
-        with con.cursor() as cur:
-            sql = """
-                SELECT e.name, COUNT(e.name)
-                FROM event_creation AS ec
-                JOIN event AS e ON ec.event_id = e.id
-                WHERE ec.person_id = %s AND e.name IN (%s, %s)
-            """
-            params = [player_id, f"{shot_type} Made", f"{shot_type} Attempt"]
-
-            if match_id:
-                sql += " AND ec.match_id = %s"
-                params.append(match_id)
-
-            sql += " GROUP BY e.name;"
-            cur.execute(sql, tuple(params))
-            return {k: int(v) for k, v in cur.fetchall()}
+    """Returns {'<shot_type> Made': made, '<shot_type> Attempt': missed} for a career or a single match."""
+    made_col, attempts_col = SHOT_STAT_COLUMNS[shot_type]
+    line = get_player_box_score(player_id, match_id=match_id)
+    return {f"{shot_type} Made": line[made_col], f"{shot_type} Attempt": line[attempts_col] - line[made_col]}
 
 def calculate_group_stage_standings(phase_id):
     """
     Calculates group stage standings, correctly ranking teams within their dynamically identified groups.
     Qualification is based on being in the top 4 of a group.
+
+    Fetches the completed matches of the phase with their stored scores in one query and does the
+    rest in Python (see compute_group_standings). Returns the same rows as
+    calculate_group_stage_standings_sql, plus points_for, points_against and point_diff.
+    """
+    sql = """
+        SELECT
+            m.home_team_id, m.away_team_id,
+            th.name AS home_name, ta.name AS away_name,
+            COALESCE(ms.home_score, 0) AS home_score,
+            COALESCE(ms.away_score, 0) AS away_score
+        FROM `Match` m
+        JOIN `Round` r ON m.round_id = r.id
+        JOIN Team th ON m.home_team_id = th.id
+        JOIN Team ta ON m.away_team_id = ta.id
+        LEFT JOIN Match_Score ms ON m.id = ms.match_id
+        WHERE r.phase_id = %s AND m.status = 'Completed'
+    """
+    return compute_group_standings(query(sql, (phase_id,)))
+
+def compute_group_standings(matches):
+    """
+    Builds group standings from completed matches (dicts with home/away team ids, names and scores).
+
+    Groups are the connected components of the "played against" graph, found with union-find and
+    identified by their smallest team id. Teams are ranked within their group by wins, then team id.
+    A drawn score counts as an away win, like the SQL version.
+    """
+    parent = {}
+
+    def find(team):
+        root = team
+        while parent[root] != root:
+            root = parent[root]
+        while parent[team] != root:
+            parent[team], team = root, parent[team]
+        return root
+
+    table = {}
+    for m in matches:
+        home, away = m['home_team_id'], m['away_team_id']
+        home_score, away_score = int(m['home_score']), int(m['away_score'])
+        for team_id, name, scored, conceded in ((home, m['home_name'], home_score, away_score), (away, m['away_name'], away_score, home_score)):
+            if team_id not in table:
+                parent[team_id] = team_id
+                table[team_id] = {'id': team_id, 'name': name, 'wins': 0, 'losses': 0, 'points_for': 0, 'points_against': 0}
+            row = table[team_id]
+            row['points_for'] += scored
+            row['points_against'] += conceded
+        winner, loser = (home, away) if home_score > away_score else (away, home)
+        table[winner]['wins'] += 1
+        table[loser]['losses'] += 1
+
+        # Union by smaller id so every root is the group's smallest team id
+        root_home, root_away = find(home), find(away)
+        if root_home != root_away:
+            parent[max(root_home, root_away)] = min(root_home, root_away)
+
+    groups = {}
+    for team_id, row in table.items():
+        row['group_identifier'] = find(team_id)
+        row['point_diff'] = row['points_for'] - row['points_against']
+        groups.setdefault(row['group_identifier'], []).append(row)
+
+    standings = []
+    for group_id in sorted(groups):
+        ranked = sorted(groups[group_id], key=lambda row: (-row['wins'], row['id']))
+        for rank, row in enumerate(ranked, start=1):
+            row['group_rank'] = rank
+            standings.append(row)
+    return standings
+
+def calculate_group_stage_standings_sql(phase_id):
+    """
+    Original single-statement version of calculate_group_stage_standings, kept as the reference
+    for the equivalence check in benchmark.py.
     """
     sql = """
     WITH PhaseMatches AS (
@@ -381,22 +905,15 @@ def calculate_group_stage_standings(phase_id):
         SELECT team_id, MIN(group_identifier) as group_identifier FROM GroupWalk GROUP BY team_id
     ),
     MatchScores AS (
-        -- 4. Calculate scores for each match
+        -- 4. Look up the stored score of each match
         SELECT
             pm.id as match_id,
             pm.home_team_id,
             pm.away_team_id,
-            SUM(CASE WHEN pt.team_id = pm.home_team_id AND e.name LIKE '%%Made' THEN
-                CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                ELSE 0 END) AS home_score,
-            SUM(CASE WHEN pt.team_id = pm.away_team_id AND e.name LIKE '%%Made' THEN
-                CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                ELSE 0 END) AS away_score
+            COALESCE(ms.home_score, 0) AS home_score,
+            COALESCE(ms.away_score, 0) AS away_score
         FROM PhaseMatches pm
-        LEFT JOIN Event_Creation ec ON pm.id = ec.match_id
-        LEFT JOIN Event e ON ec.event_id = e.id
-        LEFT JOIN Person_Team pt ON ec.person_id = pt.person_id AND pt.team_id IN (pm.home_team_id, pm.away_team_id)
-        GROUP BY pm.id, pm.home_team_id, pm.away_team_id
+        LEFT JOIN Match_Score ms ON pm.id = ms.match_id
     ),
     Wins AS (
         -- 5. Count wins for each team
@@ -433,19 +950,12 @@ def calculate_standings_for_phase(phase_id):
                 m.id AS match_id,
                 m.home_team_id,
                 m.away_team_id,
-                SUM(CASE WHEN pt.team_id = m.home_team_id AND e.name LIKE '%%Made' THEN
-                    CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                    ELSE 0 END) AS home_score,
-                SUM(CASE WHEN pt.team_id = m.away_team_id AND e.name LIKE '%%Made' THEN
-                    CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                    ELSE 0 END) AS away_score
+                COALESCE(ms.home_score, 0) AS home_score,
+                COALESCE(ms.away_score, 0) AS away_score
             FROM `Match` m
             JOIN `Round` r ON m.round_id = r.id
-            LEFT JOIN Event_Creation ec ON m.id = ec.match_id
-            LEFT JOIN Event e ON ec.event_id = e.id
-            LEFT JOIN Person_Team pt ON ec.person_id = pt.person_id AND pt.team_id IN (m.home_team_id, m.away_team_id)
+            LEFT JOIN Match_Score ms ON m.id = ms.match_id
             WHERE r.phase_id = %s AND m.status = 'Completed'
-            GROUP BY m.id, m.home_team_id, m.away_team_id
         ),
         Winners AS (
             SELECT
@@ -471,78 +981,359 @@ def calculate_standings_for_phase(phase_id):
         team_stats['losses'] = int(team_stats['losses'])
     return standings        
 
+def _touch_standings(cur, match_ids, completed_only=True):
+    """
+    Bumps the standings version of the phases the matches belong to, inside the caller's transaction,
+    so their snapshots are rebuilt on the next read, and clears their is_final flag. Only completed
+    matches count towards standings.
+    """
+    if not match_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(match_ids))
+    status_filter = " AND m.status = 'Completed'" if completed_only else ""
+    cur.execute(f"""
+        INSERT INTO Standings_Phase (phase_id, version)
+        SELECT DISTINCT r.phase_id, 1
+        FROM `Match` m
+        JOIN `Round` r ON m.round_id = r.id
+        WHERE m.id IN ({placeholders}){status_filter}
+        ON DUPLICATE KEY UPDATE version = Standings_Phase.version + 1, is_final = FALSE
+    """, tuple(match_ids))
+
+def invalidate_standings(match_id, completed_only=True):
+    """Marks the standings snapshot of the match's phase as outdated."""
+    try:
+        with get_connection() as con:
+            with con.cursor() as cur:
+                _touch_standings(cur, [match_id], completed_only)
+            return True
+    except pymysql.Error:
+        return False
+
+def _compute_phase_standings(phase_id):
+    phase = query("SELECT phase_id FROM Phase WHERE id = %s", (phase_id,))
+    if not phase:
+        return None
+    if phase[0]['phase_id'] == 1:
+        return calculate_group_stage_standings(phase_id)
+    standings = calculate_standings_for_phase(phase_id)
+    for position, row in enumerate(standings, start=1):
+        row['group_identifier'] = None
+        row['group_rank'] = position
+    return standings
+
+def refresh_standings_snapshot(phase_id):
+    """
+    Recomputes the standings of a phase and stores them as its snapshot.
+    The snapshot is only kept if no match result of the phase changed while it was computed.
+    Returns the standings, or None if the phase does not exist.
+    """
+    current = query("SELECT version FROM Standings_Phase WHERE phase_id = %s", (phase_id,))
+    version = current[0]['version'] if current else 0
+    standings = _compute_phase_standings(phase_id)
+    if standings is None:
+        return None
+    pending = query("""
+        SELECT COUNT(*) AS pending
+        FROM `Match` m
+        JOIN `Round` r ON m.round_id = r.id
+        WHERE r.phase_id = %s AND m.status <> 'Completed'
+    """, (phase_id,))[0]['pending']
+
+    rows = [
+        (phase_id, row['id'], row['group_identifier'], row['group_rank'], row['wins'], row['losses'],
+         row.get('points_for'), row.get('points_against'))
+        for row in standings
+    ]
+    try:
+        with get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                cur.execute("INSERT IGNORE INTO Standings_Phase (phase_id) VALUES (%s)", (phase_id,))
+                cur.execute("SELECT version FROM Standings_Phase WHERE phase_id = %s FOR UPDATE", (phase_id,))
+                if cur.fetchone()[0] != version:
+                    con.rollback()
+                    return standings
+                cur.execute("DELETE FROM Standings_Snapshot WHERE phase_id = %s", (phase_id,))
+                if rows:
+                    cur.executemany("""
+                        INSERT INTO Standings_Snapshot
+                            (phase_id, team_id, group_identifier, group_rank, wins, losses, points_for, points_against)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """, rows)
+                cur.execute(
+                    "UPDATE Standings_Phase SET snapshot_version = version, is_final = %s, built_at = CURRENT_TIMESTAMP WHERE phase_id = %s",
+                    (pending == 0, phase_id)
+                )
+            con.commit()
+    except pymysql.Error:
+        pass  # The standings are still correct, the next read simply rebuilds the snapshot
+    return standings
+
+# Snapshot of a phase with its freshness; a current snapshot without teams gives one row of NULLs.
+# A final snapshot (no match of the phase left to play) is served without comparing versions: every
+# write that could change it clears is_final.
+PHASE_STANDINGS_SQL = """
+    SELECT sp.is_final OR sp.snapshot_version <=> sp.version AS is_current,
+           s.team_id AS id, t.name, s.wins, s.losses, s.group_identifier, s.group_rank,
+           s.points_for, s.points_against
+    FROM Standings_Phase sp
+    LEFT JOIN Standings_Snapshot s ON s.phase_id = sp.phase_id
+    LEFT JOIN Team t ON s.team_id = t.id
+    WHERE sp.phase_id = %s
+    ORDER BY s.group_identifier, s.group_rank
+"""
+
+def snapshot_standings(rows):
+    """
+    The standings in PHASE_STANDINGS_SQL rows, or None when the snapshot is missing or out of date.
+    Freshness comes from Standings_Phase.is_final and snapshot_version, so a phase without results has an empty snapshot.
+    """
+    if not rows or not rows[0]['is_current']:
+        return None
+    standings = []
+    for row in rows:
+        del row['is_current']
+        if row['id'] is None:
+            continue
+        if row['group_identifier'] is not None:
+            row['point_diff'] = row['points_for'] - row['points_against']
+        standings.append(row)
+    return standings
+
+def get_phase_standings(phase_id):
+    """
+    Standings of a phase, read from its snapshot. The snapshot is rebuilt first if a result in the
+    phase changed since it was taken. Group stage rows match calculate_group_stage_standings,
+    other phases are ordered like calculate_standings_for_phase.
+    """
+    standings = snapshot_standings(query(PHASE_STANDINGS_SQL, (phase_id,)))
+    if standings is None:
+        return refresh_standings_snapshot(phase_id) or []
+    return standings
+
+STANDINGS_SNAPSHOT_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS `Standings_Phase` (
+      `phase_id` int PRIMARY KEY,
+      `version` int NOT NULL DEFAULT 0,
+      `snapshot_version` int,
+      `is_final` boolean NOT NULL DEFAULT FALSE,
+      `built_at` timestamp NULL,
+      FOREIGN KEY (`phase_id`) REFERENCES `Phase` (`id`) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `Standings_Snapshot` (
+      `phase_id` int,
+      `team_id` int,
+      `group_identifier` int,
+      `group_rank` int NOT NULL,
+      `wins` int NOT NULL DEFAULT 0,
+      `losses` int NOT NULL DEFAULT 0,
+      `points_for` int,
+      `points_against` int,
+      PRIMARY KEY (`phase_id`, `team_id`),
+      FOREIGN KEY (`phase_id`) REFERENCES `Phase` (`id`) ON DELETE CASCADE,
+      FOREIGN KEY (`team_id`) REFERENCES `Team` (`id`)
+    )
+    """,
+]
+
+def rebuild_standings_snapshots():
+    """Rebuilds the standings snapshot of every phase. Returns the number of phases, or None on failure."""
+    try:
+        with get_connection() as con:
+            with con.cursor() as cur:
+                for ddl in STANDINGS_SNAPSHOT_DDL:
+                    cur.execute(ddl)
+        phases = query("SELECT id FROM Phase ORDER BY id")
+        for phase in phases:
+            refresh_standings_snapshot(phase['id'])
+        return len(phases)
+    except pymysql.Error:
+        return None
+
+MATCH_STATUSES = ('Scheduled', 'Ongoing', 'Completed', 'Stopped')
+
+def set_match_status(match_id, status):
+    """
+    Changes a match's status. Completing a match rebuilds its phase's standings snapshot,
+    which makes the snapshot final once the phase's last match is done. A match is kept in the
+    live state while it is Ongoing.
+    Returns True on success, False on failure.
+    """
+    if status not in MATCH_STATUSES:
+        return False
+    try:
+        with get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                cur.execute("UPDATE `Match` SET status = %s WHERE id = %s", (status, match_id))
+                _touch_standings(cur, [match_id], completed_only=False)
+                cur.execute("SELECT r.phase_id FROM `Match` m JOIN `Round` r ON m.round_id = r.id WHERE m.id = %s", (match_id,))
+                phase = cur.fetchone()
+            con.commit()
+            invalidate_tables('Match')
+    except pymysql.Error:
+        return False
+    if status == 'Ongoing':
+        _start_live_match(match_id)
+    else:
+        _live.drop(match_id)
+    if status == 'Completed' and phase:
+        refresh_standings_snapshot(phase[0])
+    return True
+
 def get_all_matches_with_names(offset=0, limit=10):
     """Fetches all matches, paginated, with team names, ordered by newest first."""
     sql = """
-        WITH MatchScores AS (
-            SELECT
-                ec.match_id,
-                SUM(CASE WHEN pt.team_id = m.home_team_id AND e.name LIKE '%%Made' THEN
-                    CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                    ELSE 0 END) AS home_score,
-                SUM(CASE WHEN pt.team_id = m.away_team_id AND e.name LIKE '%%Made' THEN
-                    CASE e.name WHEN '3-Point Field Goal Made' THEN 3 WHEN '2-Point Field Goal Made' THEN 2 ELSE 1 END
-                    ELSE 0 END) AS away_score
-            FROM Event_Creation ec
-            JOIN `Match` m ON ec.match_id = m.id
-            JOIN Event e ON ec.event_id = e.id
-            JOIN Person_Team pt ON ec.person_id = pt.person_id AND pt.team_id IN (m.home_team_id, m.away_team_id)
-            GROUP BY ec.match_id
-        )
         SELECT
-            m.id, m.match_date, m.status,
+            m.id, m.match_date, m.status, m.home_team_id, m.away_team_id,
             ht.name AS home_team_name,
-            at.name AS away_team_name,
-            ms.home_score,
-            ms.away_score
+            at.name AS away_team_name
         FROM `Match` m
         JOIN `Team` ht ON m.home_team_id = ht.id
         JOIN `Team` at ON m.away_team_id = at.id
-        LEFT JOIN MatchScores ms ON m.id = ms.match_id
         ORDER BY m.match_date DESC
         LIMIT %s OFFSET %s;
     """
-    return query(sql, (limit, offset * limit))
+    return _with_scores(query(sql, (limit, offset * limit)))
 
-def get_scores(match_id):
-    """Calculates the final score for a given match."""
+def get_all_matches_page(after=None, limit=10):
+    """Fetches a page of all matches, newest first, with team names and scores. Returns (matches, next_cursor)."""
     sql = """
         SELECT
-            m.home_team_id,
-            m.away_team_id,
-            SUM(CASE WHEN pt.team_id = m.home_team_id AND e.name LIKE '%%Made' THEN
-                CASE e.name
-                    WHEN '3-Point Field Goal Made' THEN 3
-                    WHEN '2-Point Field Goal Made' THEN 2
-                    ELSE 1
-                END
-            ELSE 0 END) AS home_score,
-            SUM(CASE WHEN pt.team_id = m.away_team_id AND e.name LIKE '%%Made' THEN
-                CASE e.name
-                    WHEN '3-Point Field Goal Made' THEN 3
-                    WHEN '2-Point Field Goal Made' THEN 2
-                    ELSE 1
-                END
-            ELSE 0 END) AS away_score
+            m.id, m.match_date, m.status, m.home_team_id, m.away_team_id,
+            ht.name AS home_team_name,
+            at.name AS away_team_name
         FROM `Match` m
-        LEFT JOIN Event_Creation ec ON m.id = ec.match_id
-        LEFT JOIN Event e ON ec.event_id = e.id
-        LEFT JOIN Person_Team pt ON ec.person_id = pt.person_id AND pt.team_id IN (m.home_team_id, m.away_team_id)
-        WHERE m.id = %s
-        GROUP BY m.id, m.home_team_id, m.away_team_id;
+        JOIN `Team` ht ON m.home_team_id = ht.id
+        JOIN `Team` at ON m.away_team_id = at.id
     """
-    result = query(sql, (match_id,))
-    if not result:
-        return None
-    
-    scores = result[0]
-    return {
-        scores['home_team_id']: int(scores['home_score']),
-        scores['away_team_id']: int(scores['away_score'])
+    matches, next_cursor = seek_page(sql, [], [], MATCH_PAGE_KEYS, after, limit)
+    return _with_scores(matches), next_cursor
+
+SCORE_BATCH_SIZE = 1000
+
+def get_scores_for_matches(match_ids):
+    """
+    Returns {match_id: {home_team_id: score, away_team_id: score}} for the given matches, from the live
+    state for Ongoing matches and otherwise from the Match_Score summary, using one query per
+    SCORE_BATCH_SIZE ids. Unknown ids are left out.
+    """
+    ids = sorted(set(match_ids))
+    scores = {}
+    live = _live_match_ids()
+    for match_id in live.intersection(ids):
+        score = _live.read(match_id, MatchState.scores)
+        if score is not None:
+            scores[match_id] = score
+    ids = [i for i in ids if i not in scores]
+    for start in range(0, len(ids), SCORE_BATCH_SIZE):
+        chunk = ids[start:start + SCORE_BATCH_SIZE]
+        sql = f"""
+            SELECT
+                m.id,
+                m.home_team_id,
+                m.away_team_id,
+                COALESCE(ms.home_score, 0) AS home_score,
+                COALESCE(ms.away_score, 0) AS away_score
+            FROM `Match` m
+            LEFT JOIN Match_Score ms ON m.id = ms.match_id
+            WHERE m.id IN ({', '.join(['%s'] * len(chunk))})
+        """
+        for row in cached_query(sql, chunk, tables=('Match', 'Match_Score')):
+            scores[row['id']] = {
+                row['home_team_id']: int(row['home_score']),
+                row['away_team_id']: int(row['away_score'])
+            }
+    return scores
+
+def get_scores(match_id):
+    """Returns the score of a given match from the live state or the Match_Score summary."""
+    return get_scores_for_matches([match_id]).get(match_id)
+
+_live = LiveStateStore()
+
+def _build_live_states(where_clause, params=()):
+    """MatchStates built from Event_Creation for the matches `Match` m matching where_clause."""
+    matches = query(f"SELECT m.id, m.home_team_id, m.away_team_id FROM `Match` m WHERE {where_clause}", params)
+    if not matches:
+        return []
+    ids = [m['id'] for m in matches]
+    placeholders = ", ".join(["%s"] * len(ids))
+    rosters = {match_id: {} for match_id in ids}
+    for row in query(f"""
+        SELECT m.id AS match_id, pt.person_id, pt.team_id
+        FROM `Match` m
+        JOIN Person_Team pt ON pt.team_id IN (m.home_team_id, m.away_team_id)
+        WHERE m.id IN ({placeholders})
+    """, ids):
+        rosters[row['match_id']][row['person_id']] = row['team_id']
+    catalog = get_event_catalog()
+    states = {
+        m['id']: MatchState(m['id'], m['home_team_id'], m['away_team_id'], rosters[m['id']], catalog)
+        for m in matches
     }
+    for row in query(f"""
+        SELECT id, match_id, person_id, event_id, game_time
+        FROM Event_Creation
+        WHERE match_id IN ({placeholders})
+        ORDER BY id
+    """, ids):
+        states[row['match_id']].add(row['id'], row['person_id'], row['event_id'], row['game_time'])
+    return list(states.values())
+
+def load_live_matches():
+    """
+    Rebuilds the live state of every Ongoing match from Event_Creation.
+    Returns the number of live matches, or None on failure or if a write raced the rebuild.
+    """
+    version = _live.version
+    try:
+        states = _build_live_states("m.status = 'Ongoing'")
+    except pymysql.Error:
+        return None
+    return len(states) if _live.replace_all(states, version) else None
+
+def _live_match_ids():
+    """Ids of the live matches, (re)loading them on first use and once they are LIVE_STATE_MAX_AGE old."""
+    loaded_at = _live.loaded_at
+    if loaded_at is None or (LIVE_STATE_MAX_AGE and time.monotonic() - loaded_at > LIVE_STATE_MAX_AGE):
+        if load_live_matches() is None and loaded_at is None:
+            return set()
+    return _live.match_ids()
+
+def _start_live_match(match_id):
+    try:
+        states = _build_live_states("m.id = %s", (match_id,))
+    except pymysql.Error:
+        _live.drop(match_id)
+        return
+    for state in states:
+        _live.put(state)
+
+def get_live_scoreboard(match_id):
+    """Score, team fouls and latest events of an Ongoing match from memory, or None if it is not being played."""
+    if match_id not in _live_match_ids():
+        return None
+    return _live.read(match_id, MatchState.scoreboard)
+
+def get_match_box_score(match_id):
+    """{person_id: box score line with 'team_id'} of an Ongoing match from memory, or None if it is not being played."""
+    if match_id not in _live_match_ids():
+        return None
+    return _live.read(match_id, MatchState.box_scores)
+
+def get_foul_trouble(match_id, threshold=FOUL_TROUBLE):
+    """Players of an Ongoing match with at least threshold fouls, from memory, or None if it is not being played."""
+    if match_id not in _live_match_ids():
+        return None
+    return _live.read(match_id, MatchState.foul_trouble, threshold)
 
 def get_phases_by_season(year):
-    return query("SELECT * FROM Phase WHERE year = %s ORDER BY id", (year,))
+    return cached_query("SELECT * FROM Phase WHERE year = %s ORDER BY id", (year,), tables=('Phase',))
 
 def get_phases(limit=0):
     sql = "SELECT id, name FROM phase"
@@ -577,10 +1368,10 @@ def get_stadiums(offset=0, limit=10):
     return query(sql, (limit, offset * limit))
 
 def get_rounds_by_phase(phase_id):
-    return query("SELECT * FROM Round WHERE phase_id = %s ORDER BY id", (phase_id,))
+    return cached_query("SELECT * FROM Round WHERE phase_id = %s ORDER BY id", (phase_id,), tables=('Round',))
 
 def get_team_name(team_id):
-    return query("SELECT name FROM Team WHERE id = %s", (team_id,))
+    return cached_query("SELECT name FROM Team WHERE id = %s", (team_id,), tables=('Team',))
 
 
 def create_season(year):
@@ -613,6 +1404,7 @@ def create_player(player_data):
                     cur.execute(sql_person_team, (person_id, team_id, shirt_num))
 
             con.commit()
+            invalidate_tables('Person', 'Person_Team')
             return True
     except pymysql.Error:
         
@@ -632,6 +1424,7 @@ def delete_player(player_id):
                 
                 cur.execute("DELETE FROM Person WHERE id = %s", (player_id,))
             con.commit() 
+            invalidate_tables('Person', 'Person_Team')
             return True
     except pymysql.Error:
         return False 
@@ -649,6 +1442,7 @@ def delete_referee(referee_id):
                 
                 cur.execute("DELETE FROM Referee WHERE id = %s", (referee_id,))
             con.commit() 
+            invalidate_tables('Match_Referee', 'Referee')
             return True
     except pymysql.Error:
         return False
@@ -674,6 +1468,7 @@ def delete_team(team_id):
                 
                 cur.execute("DELETE FROM Team WHERE id = %s", (team_id,))
             con.commit() 
+            invalidate_tables('Person_Team', 'Team_stadium', 'Team')
             return True
     except pymysql.Error:
         return False 
@@ -694,23 +1489,337 @@ def create_match(match_data):
     """Inserts a new match into the Match table and returns its ID."""
     sql = """INSERT INTO `Match` (home_team_id, away_team_id, round_id, match_date, status)
              VALUES (%s, %s, %s, %s, %s)"""
-    return execute_insert_and_get_id(sql, (match_data['home_team_id'], match_data['away_team_id'], match_data['round_id'], match_data['match_date'], match_data['status']))
+    match_id = execute_insert_and_get_id(sql, (match_data['home_team_id'], match_data['away_team_id'], match_data['round_id'], match_data['match_date'], match_data['status']))
+    if match_id:
+        # A new match changes the phase's standings (or at least whether they are final)
+        invalidate_standings(match_id, completed_only=False)
+    return match_id
 
 def unlink_referee_from_match(match_id, referee_id):
     """Unlinks a referee from a specific match."""
     sql = "DELETE FROM Match_Referee WHERE match_id = %s AND referee_id = %s"
     return execute_cud(sql, (match_id, referee_id))
 
+def _score_select_sql(where_clause, sign=""):
+    """SELECT producing (match_id, home_score, away_score) over the Event_Creation rows matching where_clause."""
+    return f"""
+        SELECT
+            ec.match_id,
+            {sign}SUM(CASE WHEN pt.team_id = m.home_team_id THEN e.points ELSE 0 END) AS home_score,
+            {sign}SUM(CASE WHEN pt.team_id = m.away_team_id THEN e.points ELSE 0 END) AS away_score
+        FROM Event_Creation ec
+        JOIN `Match` m ON ec.match_id = m.id
+        JOIN Event e ON ec.event_id = e.id
+        JOIN Person_Team pt ON ec.person_id = pt.person_id AND pt.team_id IN (m.home_team_id, m.away_team_id)
+        WHERE {where_clause}
+        GROUP BY ec.match_id
+    """
+
+def apply_score_delta(cur, event_creation_ids, removing=False):
+    """
+    Adds (or, when removing, subtracts) the points of the given Event_Creation rows to Match_Score.
+    Must run on the caller's cursor, inside the same transaction as the insert/delete of those rows.
+    """
+    if not event_creation_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(event_creation_ids))
+    delta = _score_select_sql(f"ec.id IN ({placeholders})", sign="-" if removing else "")
+    sql = f"""
+        INSERT INTO Match_Score (match_id, home_score, away_score)
+        SELECT match_id, home_score, away_score FROM ({delta}) AS delta
+        ON DUPLICATE KEY UPDATE
+            home_score = Match_Score.home_score + VALUES(home_score),
+            away_score = Match_Score.away_score + VALUES(away_score)
+    """
+    cur.execute(sql, tuple(event_creation_ids))
+
+# Shot types used by the shot analysis screens -> (made column, attempts column)
+SHOT_STAT_COLUMNS = {
+    'Free Throw': ('ftm', 'fta'),
+    '2-Point Field Goal': ('fg2m', 'fg2a'),
+    '3-Point Field Goal': ('fg3m', 'fg3a'),
+}
+
+def _player_stats_select_sql(where_clause, sign=""):
+    """SELECT producing one Player_Match_Stats row per (player, match) over the Event_Creation rows matching where_clause."""
+    catalog = get_event_catalog()
+    counters = ",\n            ".join(
+        f"{sign}SUM(CASE WHEN ec.event_id IN ({', '.join(map(str, ids))}) THEN 1 ELSE 0 END) AS {column}" if ids else f"0 AS {column}"
+        for column, ids in ((column, catalog.ids(**fields)) for column, fields in BOX_SCORE_COUNTERS)
+    )
+    return f"""
+        SELECT
+            ec.person_id,
+            ec.match_id,
+            ph.year,
+            {sign}SUM(e.points) AS points,
+            {counters}
+        FROM Event_Creation ec
+        JOIN Event e ON ec.event_id = e.id
+        JOIN `Match` m ON ec.match_id = m.id
+        LEFT JOIN `Round` r ON m.round_id = r.id
+        LEFT JOIN Phase ph ON r.phase_id = ph.id
+        WHERE {where_clause}
+        GROUP BY ec.person_id, ec.match_id, ph.year
+    """
+
+def apply_player_stats_delta(cur, event_creation_ids, removing=False):
+    """
+    Adds (or, when removing, subtracts) the given Event_Creation rows to Player_Match_Stats.
+    Must run on the caller's cursor, inside the same transaction as the insert/delete of those rows.
+    """
+    if not event_creation_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(event_creation_ids))
+    delta = _player_stats_select_sql(f"ec.id IN ({placeholders})", sign="-" if removing else "")
+    columns = ", ".join(BOX_SCORE_COLUMNS)
+    updates = ",\n            ".join(f"{c} = Player_Match_Stats.{c} + VALUES({c})" for c in BOX_SCORE_COLUMNS)
+    sql = f"""
+        INSERT INTO Player_Match_Stats (person_id, match_id, year, {columns})
+        SELECT person_id, match_id, year, {columns} FROM ({delta}) AS delta
+        ON DUPLICATE KEY UPDATE
+            {updates}
+    """
+    cur.execute(sql, tuple(event_creation_ids))
+
 def create_match_event(match_id, person_id, event_id, game_time):
-    """Inserts a new event into the Event_Creation table."""
+    """
+    Inserts a new event into the Event_Creation table and updates the match's stored score.
+    Returns the new event's ID on success, None on failure or if the match's season is archived.
+    """
     sql = "INSERT INTO Event_Creation (match_id, person_id, event_id, game_time) VALUES (%s, %s, %s, %s)"
-    return execute_cud(sql, (match_id, person_id, event_id, game_time))
+    try:
+        if _archived_season_of(match_id) is not None:
+            return None
+        with get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                cur.execute(sql, (match_id, person_id, event_id, game_time))
+                new_id = cur.lastrowid
+                apply_score_delta(cur, [new_id])
+                apply_player_stats_delta(cur, [new_id])
+                _touch_standings(cur, [match_id])
+            con.commit()
+            invalidate_tables('Event_Creation', 'Match_Score', 'Player_Match_Stats')
+            _live.add_events(match_id, [(new_id, person_id, event_id, game_time)])
+            return new_id
+    except pymysql.Error:
+        return None
 
 def delete_match_event(event_creation_id):
-    """Deletes a specific event instance from the Event_Creation table."""
-    sql = "DELETE FROM Event_Creation WHERE id = %s"
-    return execute_cud(sql, (event_creation_id,))
+    """Deletes a specific event instance from the Event_Creation table and updates the match's stored score."""
+    try:
+        with get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                apply_score_delta(cur, [event_creation_id], removing=True)
+                apply_player_stats_delta(cur, [event_creation_id], removing=True)
+                cur.execute("SELECT match_id FROM Event_Creation WHERE id = %s", (event_creation_id,))
+                match_ids = [row[0] for row in cur.fetchall()]
+                _touch_standings(cur, match_ids)
+                cur.execute("DELETE FROM Event_Creation WHERE id = %s", (event_creation_id,))
+            con.commit()
+            invalidate_tables('Event_Creation', 'Match_Score', 'Player_Match_Stats')
+            for match_id in match_ids:
+                _live.remove_event(match_id, event_creation_id)
+            return True
+    except pymysql.Error:
+        return False
+
+EVENT_INSERT_CHUNK = 500
+
+def _inserted_event_ids(cur, match_id, first_id, chunk):
+    """
+    Ids of the (match_id, person_id, event_id, game_time) rows one multi-row INSERT just added, in input order.
+    The INSERT only reports the first id, and the others need not follow it consecutively (TiDB,
+    auto_increment_increment > 1, interleaved InnoDB locks), so they are read back: the rows at or
+    after first_id, in id order, that match the chunk's person and event. A concurrent row with the
+    same person and event may be taken for one of ours, which changes no score or box score.
+    """
+    cur.execute(
+        "SELECT id, person_id, event_id FROM Event_Creation WHERE match_id = %s AND id >= %s ORDER BY id",
+        (match_id, first_id)
+    )
+    ids = []
+    for event_creation_id, person_id, event_id in cur.fetchall():
+        if len(ids) == len(chunk):
+            break
+        _, want_person, want_event, _ = chunk[len(ids)]
+        if (person_id, event_id) == (int(want_person), int(want_event)):
+            ids.append(event_creation_id)
+    if len(ids) != len(chunk):
+        raise pymysql.err.DataError(f"Read back {len(ids)} of {len(chunk)} inserted events")
+    return ids
+
+def create_match_events_bulk(match_id, events, chunk_size=EVENT_INSERT_CHUNK):
+    """
+    Inserts many events for one match in a single transaction, using chunked multi-row INSERTs,
+    and updates the match's stored score.
+
+    :param events: Iterable of dicts with 'person_id', either 'event_id' or 'event' (the event name),
+                   and an optional 'game_time'.
+    :return: The new Event_Creation ids in input order, or None if the database rejected the batch
+             or the match's season is archived.
+    :raises ValueError: If an event is missing its person or names an unknown event type.
+    """
+    event_ids = None
+    rows = []
+    for i, event in enumerate(events):
+        event_id = event.get('event_id')
+        if event_id is None:
+            if event_ids is None:
+                event_ids = get_event_ids()
+            event_id = event_ids.get(event.get('event'))
+            if event_id is None:
+                raise ValueError(f"Event #{i}: unknown event type {event.get('event')!r}")
+        if event.get('person_id') is None:
+            raise ValueError(f"Event #{i}: missing person_id")
+        rows.append((match_id, event['person_id'], event_id, event.get('game_time')))
+
+    if not rows:
+        return []
+
+    new_ids = []
+    try:
+        if _archived_season_of(match_id) is not None:
+            # Events of an archived season live in its file; a new row would be deleted by the next run
+            return None
+        with get_connection() as con:
+            con.begin()
+            with con.cursor() as cur:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(chunk))
+                    cur.execute(
+                        f"INSERT INTO Event_Creation (match_id, person_id, event_id, game_time) VALUES {placeholders}",
+                        [value for row in chunk for value in row]
+                    )
+                    chunk_ids = _inserted_event_ids(cur, match_id, cur.lastrowid, chunk)
+                    apply_score_delta(cur, chunk_ids)
+                    apply_player_stats_delta(cur, chunk_ids)
+                    new_ids.extend(chunk_ids)
+                _touch_standings(cur, [match_id])
+            con.commit()
+            invalidate_tables('Event_Creation', 'Match_Score', 'Player_Match_Stats')
+            _live.add_events(match_id, [(new_id,) + row[1:] for new_id, row in zip(new_ids, rows)])
+            return new_ids
+    except pymysql.Error:
+        return None
+
+def rebuild_match_scores():
+    """
+    Recomputes the whole Match_Score summary from Event_Creation (creating it and the standings snapshot
+    tables if they are missing), except for archived seasons. Returns the number of scored matches, or None on failure.
+    """
+    try:
+        with get_connection() as con:
+            with con.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS `Match_Score` (
+                      `match_id` int PRIMARY KEY,
+                      `home_score` int NOT NULL DEFAULT 0,
+                      `away_score` int NOT NULL DEFAULT 0,
+                      FOREIGN KEY (`match_id`) REFERENCES `Match` (`id`) ON DELETE CASCADE
+                    )
+                """)
+                cur.execute(ARCHIVED_SEASON_DDL)
+                for ddl in STANDINGS_SNAPSHOT_DDL:
+                    cur.execute(ddl)
+                con.begin()
+                # Archived seasons have no events left to recompute from, their scores are kept
+                cur.execute(f"DELETE FROM Match_Score WHERE match_id NOT IN ({ARCHIVED_MATCHES_SQL})")
+                cur.execute(f"INSERT INTO Match_Score (match_id, home_score, away_score) {_score_select_sql(f'm.id NOT IN ({ARCHIVED_MATCHES_SQL})')}")
+                scored = cur.rowcount
+                # Any stored score may have changed, so every standings snapshot is outdated
+                cur.execute("UPDATE Standings_Phase SET version = version + 1, is_final = FALSE")
+            con.commit()
+            invalidate_tables('Match_Score')
+            return scored
+    except pymysql.Error:
+        return None
+
+
+PLAYER_MATCH_STATS_DDL = """
+    CREATE TABLE IF NOT EXISTS `Player_Match_Stats` (
+      `person_id` int,
+      `match_id` int,
+      `year` int,
+      `points` int NOT NULL DEFAULT 0,
+      `fg2m` int NOT NULL DEFAULT 0,
+      `fg2a` int NOT NULL DEFAULT 0,
+      `fg3m` int NOT NULL DEFAULT 0,
+      `fg3a` int NOT NULL DEFAULT 0,
+      `ftm` int NOT NULL DEFAULT 0,
+      `fta` int NOT NULL DEFAULT 0,
+      `oreb` int NOT NULL DEFAULT 0,
+      `dreb` int NOT NULL DEFAULT 0,
+      `ast` int NOT NULL DEFAULT 0,
+      `stl` int NOT NULL DEFAULT 0,
+      `blk` int NOT NULL DEFAULT 0,
+      `tov` int NOT NULL DEFAULT 0,
+      `fouls` int NOT NULL DEFAULT 0,
+      PRIMARY KEY (`person_id`, `match_id`),
+      KEY `idx_pms_match` (`match_id`),
+      KEY `idx_pms_year` (`year`, `person_id`),
+      FOREIGN KEY (`person_id`) REFERENCES `Person` (`id`),
+      FOREIGN KEY (`match_id`) REFERENCES `Match` (`id`) ON DELETE CASCADE
+    )
+"""
+
+def rebuild_player_stats():
+    """
+    Recomputes the whole Player_Match_Stats table from Event_Creation (creating the table if it is missing),
+    except for archived seasons. Returns the number of (player, match) rows, or None on failure.
+    """
+    columns = ", ".join(BOX_SCORE_COLUMNS)
+    try:
+        with get_connection() as con:
+            with con.cursor() as cur:
+                cur.execute(PLAYER_MATCH_STATS_DDL)
+                cur.execute(ARCHIVED_SEASON_DDL)
+                con.begin()
+                cur.execute(f"DELETE FROM Player_Match_Stats WHERE match_id NOT IN ({ARCHIVED_MATCHES_SQL})")
+                cur.execute(f"INSERT INTO Player_Match_Stats (person_id, match_id, year, {columns}) "
+                            f"{_player_stats_select_sql(f'm.id NOT IN ({ARCHIVED_MATCHES_SQL})')}")
+                rows = cur.rowcount
+            con.commit()
+            invalidate_tables('Player_Match_Stats')
+            return rows
+    except pymysql.Error:
+        return None
+
 
+EVENT_SCORING_COLUMNS_DDL = {
+    'points': "ADD COLUMN `points` tinyint NOT NULL DEFAULT 0",
+    'category': "ADD COLUMN `category` ENUM ('shot', 'oreb', 'dreb', 'ast', 'stl', 'blk', 'tov', 'foul', 'other') NOT NULL DEFAULT 'other'",
+    'shot_value': "ADD COLUMN `shot_value` tinyint NOT NULL DEFAULT 0",
+    'made': "ADD COLUMN `made` boolean NOT NULL DEFAULT FALSE",
+}
+
+def migrate_event_catalog():
+    """
+    Adds the points/category/shot_value/made columns to an older Event table and fills them in from
+    event_catalog.EVENT_DEFINITIONS. Returns the number of event types, or None on failure.
+    """
+    try:
+        with get_connection() as con:
+            with con.cursor() as cur:
+                cur.execute("SHOW COLUMNS FROM Event")
+                existing = {row[0] for row in cur.fetchall()}
+                missing = [ddl for column, ddl in EVENT_SCORING_COLUMNS_DDL.items() if column not in existing]
+                if missing:
+                    cur.execute(f"ALTER TABLE Event {', '.join(missing)}")
+                con.begin()
+                cur.executemany(
+                    "UPDATE Event SET points = %s, category = %s, shot_value = %s, made = %s WHERE name = %s",
+                    [(points, category, shot_value, made, name) for name, points, category, shot_value, made in EVENT_DEFINITIONS]
+                )
+            con.commit()
+        reload_event_catalog()
+        invalidate_tables('Event')
+        return len(get_event_catalog())
+    except pymysql.Error:
+        return None
 
 def delete_match(match_id):
     """Delete a match and its related records (referees, events) in a transaction.
@@ -721,10 +1830,15 @@ def delete_match(match_id):
         with get_connection() as con:
             con.begin()
             with con.cursor() as cur:
+                _touch_standings(cur, [match_id])
                 cur.execute("DELETE FROM Match_Referee WHERE match_id = %s", (match_id,))
                 cur.execute("DELETE FROM Event_Creation WHERE match_id = %s", (match_id,))
+                cur.execute("DELETE FROM Match_Score WHERE match_id = %s", (match_id,))
+                cur.execute("DELETE FROM Player_Match_Stats WHERE match_id = %s", (match_id,))
                 cur.execute("DELETE FROM `Match` WHERE id = %s", (match_id,))
             con.commit()
+            invalidate_tables('Match_Referee', 'Event_Creation', 'Match_Score', 'Player_Match_Stats', 'Match')
+            _live.drop(match_id)
             return True
     except pymysql.Error:
         return False
@@ -754,53 +1868,59 @@ def update_match_stadium(match_id, stadium_id):
     """Update the stadium assigned to a match."""
     return execute_cud("UPDATE `Match` SET stadium_id = %s WHERE id = %s;", (stadium_id, match_id))
 
+# Secondary indexes the hot queries rely on: (name, table, columns). matchDB.sql creates the same set.
+SECONDARY_INDEXES = [
+    ('idx_event_match_time', 'Event_Creation', ('match_id', 'game_time')),
+    ('idx_event_person_event', 'Event_Creation', ('person_id', 'event_id')),
+    ('idx_match_date', 'Match', ('match_date', 'id')),
+    ('idx_match_round_status', 'Match', ('round_id', 'status')),
+    ('idx_match_home_date', 'Match', ('home_team_id', 'match_date')),
+    ('idx_match_away_date', 'Match', ('away_team_id', 'match_date')),
+    ('idx_person_team_team', 'Person_Team', ('team_id',)),
+    ('idx_match_referee_referee', 'Match_Referee', ('referee_id', 'match_id')),
+]
+
+def _existing_indexes(cur, table):
+    cur.execute(f"SHOW INDEX FROM `{table}`")
+    name_col = [d[0] for d in cur.description].index('Key_name')
+    return {row[name_col] for row in cur.fetchall()}
+
 def drop_all_defined_indexes():
     """
-    Reads the list of intended indexes and drops each one using 
-    DROP INDEX IF EXISTS.
+    Drops every index in SECONDARY_INDEXES that exists.
+    Returns the names of the dropped indexes, or None on a database error.
     """
-    with get_connection() as con:
+    dropped = []
+    try:
+        with get_connection() as con:
+            with con.cursor() as cur:
+                for name, table, _ in SECONDARY_INDEXES:
+                    if name in _existing_indexes(cur, table):
+                        cur.execute(f"DROP INDEX {name} ON `{table}`")
+                        dropped.append(name)
+    except pymysql.Error:
+        return None
+    return dropped
 
-        sql = [
-            "DROP INDEX IF EXISTS idx_event_match_time ON Event_Creation",
-            "DROP INDEX IF EXISTS idx_match_date ON `Match`"
-        ]
-        print("Dropping")
-        with con.cursor() as cursor:
-            for prompt in sql:
-                try:
-                    cursor.execute(prompt)
-                    print(f"Dropped indexes")
-                    
-                except pymysql.Error as e:
-                    print(f"Error:{e}")
-
-
-def apply_indexes():
-    with get_connection() as con:
-        sql = [
-        "CREATE INDEX idx_event_match_time ON Event_Creation (match_id, game_time)",
-        "CREATE INDEX idx_match_date ON `Match` (match_date)"
-        ]
-        print("Creating")
-        with con.cursor() as cursor:
-            for prompt in sql:
-                try:
-                    cursor.execute(prompt)
-                    print(f"Created indexes")
-                    
-                except pymysql.Error as e:
-                    print(f"Error:{e}")
-                    
-def run_benchmark_query():
-    """
-    Query for checking index's speed
+def apply_indexes(names=None):
     """
-    with get_connection() as con:
-        with con.cursor() as cur:
-            for _ in range(100):
-                cur.execute("SELECT id FROM Event_Creation ORDER BY game_time DESC LIMIT 1")
-
+    Migration creating every index in SECONDARY_INDEXES that is missing, so databases created from an
+    older matchDB.sql catch up. Returns the names of the created indexes, or None on a database error.
+    :param names: Only create these indexes (e.g. the ones drop_all_defined_indexes() returned).
+    """
+    created = []
+    try:
+        with get_connection() as con:
+            with con.cursor() as cur:
+                for name, table, columns in SECONDARY_INDEXES:
+                    if names is not None and name not in names:
+                        continue
+                    if name not in _existing_indexes(cur, table):
+                        cur.execute(f"CREATE INDEX {name} ON `{table}` ({', '.join(columns)})")
+                        created.append(name)
+    except pymysql.Error:
+        return None
+    return created
 
 def verify_admin_credentials(username, password):
     """
@@ -825,43 +1945,74 @@ def verify_admin_credentials(username, password):
         return False
     
 
+# Leaderboard stat -> (label, SQL expression over Player_Match_Stats)
+LEADERBOARD_TOTALS = {
+    'points': ('Points', 'SUM(pms.points)'),
+    'rebounds': ('Rebounds', 'SUM(pms.oreb + pms.dreb)'),
+    'assists': ('Assists', 'SUM(pms.ast)'),
+    'steals': ('Steals', 'SUM(pms.stl)'),
+    'blocks': ('Blocks', 'SUM(pms.blk)'),
+}
+# Shooting stat -> (label, made expression, attempts expression, default minimum attempts)
+LEADERBOARD_PERCENTAGES = {
+    'fg_pct': ('Field Goal %', 'SUM(pms.fg2m + pms.fg3m)', 'SUM(pms.fg2a + pms.fg3a)', 50),
+    'fg3_pct': ('3-Point %', 'SUM(pms.fg3m)', 'SUM(pms.fg3a)', 20),
+    'ft_pct': ('Free Throw %', 'SUM(pms.ftm)', 'SUM(pms.fta)', 20),
+}
+LEADERBOARD_STATS = {stat: spec[0] for stat, spec in {**LEADERBOARD_TOTALS, **LEADERBOARD_PERCENTAGES}.items()}
+
+def get_leaderboard(stat, year=None, limit=10, min_attempts=None):
+    """
+    Top players for one stat, summed from Player_Match_Stats over completed matches.
+
+    :param stat: A key of LEADERBOARD_STATS
+    :param year: Season year, or None for career totals
+    :param limit: Number of players to return
+    :param min_attempts: For shooting percentages, the attempts a player needs to qualify
+                         (defaults to the threshold in LEADERBOARD_PERCENTAGES)
+    :return: Rows with person_id, first_name, last_name, games and value (plus made/attempts for percentages)
+    """
+    if stat in LEADERBOARD_TOTALS:
+        value_sql = f"{LEADERBOARD_TOTALS[stat][1]} AS value"
+        having = ""
+        having_params = []
+    elif stat in LEADERBOARD_PERCENTAGES:
+        _, made, attempts, default_min = LEADERBOARD_PERCENTAGES[stat]
+        value_sql = f"ROUND(100 * {made} / {attempts}, 1) AS value, {made} AS made, {attempts} AS attempts"
+        having = f"HAVING {attempts} >= %s"
+        having_params = [max(1, default_min if min_attempts is None else min_attempts)]
+    else:
+        raise ValueError(f"Unknown leaderboard stat: {stat}")
+
+    where = "m.status = 'Completed'"
+    params = []
+    if year is not None:
+        where += " AND pms.year = %s"
+        params.append(year)
+    sql = f"""
+        SELECT pms.person_id, p.first_name, p.last_name, COUNT(*) AS games, {value_sql}
+        FROM Player_Match_Stats pms
+        JOIN `Match` m ON pms.match_id = m.id
+        JOIN Person p ON pms.person_id = p.id
+        WHERE {where}
+        GROUP BY pms.person_id, p.first_name, p.last_name
+        {having}
+        ORDER BY value DESC, pms.person_id
+        LIMIT %s
+    """
+    return cached_query(sql, tuple(params + having_params + [limit]), tables=('Player_Match_Stats', 'Match', 'Person'))
+
 def get_year_mvp(year):
     """
     Function that returns the MVP of a given season.
     
     :param year: Season year
     """
-    sql = """
-        WITH SeasonMatches AS (
-            SELECT m.id
-            FROM `Match` m
-            JOIN `Round` r ON m.round_id = r.id
-            JOIN `Phase` p ON r.phase_id = p.id
-            WHERE p.year = %s AND m.status = 'Completed'
-        ),
-        PlayerPoints AS (
-            SELECT 
-                ec.person_id,
-                SUM(
-                    CASE 
-                        WHEN e.name = '3-Point Field Goal Made' THEN 3
-                        WHEN e.name = '2-Point Field Goal Made' THEN 2
-                        WHEN e.name = 'Free Throw Made' THEN 1
-                        ELSE 0
-                    END
-                ) AS total_points
-            FROM Event_Creation ec
-            JOIN Event e ON ec.event_id = e.id
-            WHERE ec.match_id IN (SELECT id FROM SeasonMatches)
-            GROUP BY ec.person_id
-        )
-        SELECT p.first_name, p.last_name, pp.total_points
-        FROM PlayerPoints pp
-        JOIN Person p ON pp.person_id = p.id
-        ORDER BY pp.total_points DESC
-        LIMIT 1;
-    """
-    return query(sql, (year,))[0] if query(sql, (year,)) else None
+    leaders = get_leaderboard('points', year, limit=1)
+    if not leaders:
+        return None
+    mvp = leaders[0]
+    return {'first_name': mvp['first_name'], 'last_name': mvp['last_name'], 'total_points': mvp['value']}
 
 def add_admin_user(username, password):
     """
@@ -0,0 +1,114 @@
+"""
+Async variants of the model's read functions, for async Flask views.
+
+Every query runs on one background event loop that owns an aiomysql pool. Flask runs each async view
+in a fresh event loop, so a pool tied to the request loop could not be reused. The coroutines here can
+be awaited from any loop, and independent ones can be gathered so a page waits for its slowest query
+rather than the sum of all of them. Results share model.py's query cache.
+
+Requires aiomysql, and Flask's async extra (asgiref) for async views.
+"""
+import asyncio
+import ssl
+import threading
+
+import certifi
+
+import model
+
+_loop = None
+_loop_lock = threading.Lock()
+_pool = None
+_pool_lock = None
+
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='model-async', daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+async def _get_pool():
+    """Creates the aiomysql pool on first use. Only runs on the background loop."""
+    global _pool, _pool_lock
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            import aiomysql  # Only the async views need the driver
+            _pool = await aiomysql.create_pool(
+                host=model.DB_HOST,
+                port=model.DB_PORT,
+                user=model.DB_USER,
+                password=model.DB_PASS,
+                db=model.DB_NAME,
+                ssl=ssl.create_default_context(cafile=certifi.where()) if model.DB_SSL else None,
+                minsize=model.DB_POOL_MIN,
+                maxsize=model.DB_POOL_MAX,
+                pool_recycle=int(model.DB_POOL_IDLE_TIMEOUT),
+                autocommit=True,
+            )
+    return _pool
+
+
+async def _query(sql, params):
+    import aiomysql
+    pool = await _get_pool()
+    async with pool.acquire() as con:
+        async with con.cursor(aiomysql.DictCursor) as cur:
+            await cur.execute(sql, params)
+            return list(await cur.fetchall())
+
+
+async def query(sql, params=()):
+    """Async model.query(): runs on the shared pool and returns a list of dicts."""
+    future = asyncio.run_coroutine_threadsafe(_query(sql, tuple(params)), _background_loop())
+    return await asyncio.wrap_future(future)
+
+
+async def cached_query(sql, params=(), tables=(), ttl=None):
+    """Async model.cached_query(), backed by the same in-process cache."""
+    key = (sql, tuple(params))
+    hit, value = model._cache.get(key)
+    if not hit:
+        rows = await query(sql, params)
+        model._cache.set(key, rows, tables, ttl, token=value)
+        value = rows
+    return [dict(row) for row in value]
+
+
+async def run_sync(fn, *args):
+    """Runs a blocking model function in a worker thread, for writes and paths without an async port."""
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+async def get_phases_by_season(year):
+    return await cached_query("SELECT * FROM Phase WHERE year = %s ORDER BY id", (year,), tables=('Phase',))
+
+
+async def get_phase_standings(phase_id):
+    """Async model.get_phase_standings(). A stale snapshot is rebuilt by the synchronous model in a thread."""
+    standings = model.snapshot_standings(await query(model.PHASE_STANDINGS_SQL, (phase_id,)))
+    if standings is None:
+        return await run_sync(model.refresh_standings_snapshot, phase_id) or []
+    return standings
+
+
+async def get_season_standings(year):
+    """
+    Returns (group_phase, group_standings, knockout_phase, knockout_standings) for a season.
+    Both phases' standings are fetched concurrently once the phases are known.
+    """
+    phases = await get_phases_by_season(year)
+    group_phase = next((p for p in phases if p['phase_id'] == 1), None)
+    knockout_phase = next((p for p in phases if p['phase_id'] == 2), None)
+
+    async def standings_of(phase):
+        return await get_phase_standings(phase['id']) if phase else []
+
+    group_standings, knockout_standings = await asyncio.gather(standings_of(group_phase), standings_of(knockout_phase))
+    return group_phase, group_standings, knockout_phase, knockout_standings
@@ -0,0 +1,209 @@
+import threading
+import time
+
+import pymysql
+from pymysql.constants import SERVER_STATUS
+
+
+class PoolTimeout(pymysql.err.OperationalError):
+    """Raised when no connection could be checked out before the timeout expired."""
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a pooled pymysql connection.
+    Behaves like the raw connection, but leaving the `with` block (or calling close())
+    hands the connection back to the pool instead of closing the socket.
+    """
+
+    def __init__(self, pool, con):
+        self._pool = pool
+        self._con = con
+
+    def __getattr__(self, name):
+        return getattr(self._con, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(broken=exc_type is not None and not isinstance(exc, pymysql.MySQLError))
+
+    def close(self, broken=False):
+        if self._con is not None:
+            self._pool.release(self._con, broken=broken)
+            self._con = None
+
+
+class ConnectionPool:
+    """
+    Process-wide, thread-safe pool of database connections.
+
+    :param factory: Callable that opens a new raw connection.
+    :param min_size: Connections kept open even when idle. They are opened on the first checkout.
+    :param max_size: Upper bound on open connections (idle + checked out).
+    :param idle_timeout: Seconds an idle connection above min_size is kept before it is closed.
+    :param ping_interval: Connections idle for longer than this are pinged on checkout.
+    :param checkout_timeout: Seconds to wait for a free connection when the pool is exhausted.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=10, idle_timeout=300, ping_interval=30, checkout_timeout=10):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._lock = threading.Condition()
+        self._idle = []  # list of (connection, last_used) - most recently used at the end
+        self._in_use = 0
+        self._prefilled = False
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'failed_health_checks': 0,
+            'evicted_idle': 0,
+            'peak_in_use': 0,
+        }
+
+    @property
+    def size(self):
+        return len(self._idle) + self._in_use
+
+    def connection(self):
+        """Checks out a connection. Use it as a context manager to return it automatically."""
+        return PooledConnection(self, self.acquire())
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._lock:
+            self._evict_idle()
+            while True:
+                if self._idle:
+                    con, last_used = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self.size < self.max_size:
+                    con, last_used = None, None
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(f"No database connection available after {self.checkout_timeout}s (max_size={self.max_size})")
+                self._stats['waits'] += 1
+                self._lock.wait(remaining)
+
+            self._stats['checkouts'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+
+        # Network I/O happens outside the lock so one slow handshake does not stall every thread.
+        try:
+            if con is not None and time.monotonic() - last_used > self.ping_interval and not self._is_healthy(con):
+                with self._lock:
+                    self._stats['failed_health_checks'] += 1
+                self._close(con)
+                con = None
+            if con is None:
+                con = self._factory()
+                with self._lock:
+                    self._stats['created'] += 1
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            prefill, self._prefilled = not self._prefilled, True
+        if prefill:
+            try:
+                self.prefill()
+            except Exception:
+                pass  # The checkout itself worked; the rest of min_size is opened on demand
+        return con
+
+    def release(self, con, broken=False):
+        """Returns a connection to the pool, discarding it if it is broken or left mid-transaction."""
+        if not broken:
+            try:
+                if con.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                    con.rollback()
+            except pymysql.Error:
+                broken = True
+
+        with self._lock:
+            self._in_use -= 1
+            if broken or not con.open:
+                self._close(con)
+            else:
+                self._idle.append((con, time.monotonic()))
+            self._evict_idle()
+            self._lock.notify()
+
+    def prefill(self):
+        """Opens connections until min_size are available."""
+        while True:
+            with self._lock:
+                if self.size >= self.min_size:
+                    return
+                self._in_use += 1
+            try:
+                con = self._factory()
+            except Exception:
+                with self._lock:
+                    self._in_use -= 1
+                raise
+            with self._lock:
+                self._stats['created'] += 1
+            self.release(con)
+
+    def close_all(self):
+        """Closes every idle connection. Checked out connections are closed when they are released."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.min_size = min(self.min_size, self._in_use)
+        for con, _ in idle:
+            self._close(con)
+
+    def stats(self):
+        """Returns a snapshot of the pool usage counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+            return snapshot
+
+    def _evict_idle(self):
+        # Caller holds the lock. Oldest idle connections sit at the front of the list.
+        now = time.monotonic()
+        while self._idle and self.size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            con, _ = self._idle.pop(0)
+            self._stats['evicted_idle'] += 1
+            self._close(con)
+
+    def _is_healthy(self, con):
+        try:
+            con.ping(reconnect=False)
+            return True
+        except pymysql.Error:
+            return False
+
+    def _close(self, con):
+        with self._lock:
+            self._stats['closed'] += 1
+        try:
+            con.close()
+        except pymysql.Error:
+            pass
@@ -1,10 +1,17 @@
 import os
 import random
+import argparse
+import multiprocessing
+from collections import deque
+from itertools import islice
+import tempfile
 import pymysql
 import certifi
 from faker import Faker
 from datetime import date, timedelta, datetime, time
+from time import perf_counter
 from dotenv import load_dotenv
+from event_catalog import BOX_SCORE_COLUMNS, DEFAULT_EVENT_TYPES, EventCatalog
 
 # Load environment variables
 load_dotenv()
@@ -16,8 +23,50 @@ NUM_TEAMS = 24
 NUM_STADIUMS = 24
 NUM_REFEREES = 40
 PLAYERS_PER_TEAM = 12 
+GROUP_SIZE = 6
+QUALIFIERS_PER_GROUP = 4
 YEARS_TO_SIMULATE = list(range(2004, 2026))  
 
+# Dataset sizes selectable with --profile. "huge" matches the defaults above.
+PROFILES = {
+    'small': {'teams': 8, 'group_size': 4, 'qualifiers_per_group': 2, 'players_per_team': 10, 'seasons': 3},
+    'medium': {'teams': 16, 'group_size': 4, 'qualifiers_per_group': 2, 'players_per_team': 12, 'seasons': 10},
+    'huge': {'teams': 24, 'group_size': 6, 'qualifiers_per_group': 4, 'players_per_team': 12, 'seasons': 22},
+    'massive': {'teams': 128, 'group_size': 8, 'qualifiers_per_group': 4, 'players_per_team': 15, 'seasons': 60},
+}
+
+def configure(teams, group_size, qualifiers_per_group, players_per_team, seasons):
+    """Sets the module configuration. Stadiums and referees scale with the number of teams."""
+    global NUM_TEAMS, NUM_STADIUMS, NUM_REFEREES, PLAYERS_PER_TEAM, GROUP_SIZE, QUALIFIERS_PER_GROUP, YEARS_TO_SIMULATE
+    if group_size < 2 or teams < group_size:
+        raise ValueError("Need at least one group of two or more teams")
+    if not 1 <= qualifiers_per_group <= group_size:
+        raise ValueError("qualifiers_per_group must be between 1 and group_size")
+    if knockout_size(teams, group_size, qualifiers_per_group) < 4:
+        raise ValueError("At least four teams must qualify for the knockout phase")
+    if players_per_team < 5:
+        raise ValueError("A team needs at least five players")
+    if seasons < 1:
+        raise ValueError("Simulate at least one season")
+    NUM_TEAMS = teams
+    NUM_STADIUMS = teams
+    NUM_REFEREES = max(3, teams * 5 // 3)
+    PLAYERS_PER_TEAM = players_per_team
+    GROUP_SIZE = group_size
+    QUALIFIERS_PER_GROUP = qualifiers_per_group
+    YEARS_TO_SIMULATE = list(range(2026 - seasons, 2026))
+
+def split_groups(teams, group_size):
+    return [teams[i:i+group_size] for i in range(0, len(teams), group_size)]
+
+def knockout_size(num_teams, group_size, qualifiers_per_group):
+    """Largest power of two that fits the qualified teams - the size of the knockout bracket."""
+    qualified = sum(min(len(g), qualifiers_per_group) for g in split_groups(list(range(num_teams)), group_size))
+    size = 1
+    while size * 2 <= qualified:
+        size *= 2
+    return size
+
 # Connect to Database
 def get_connection():
     return pymysql.connect(
@@ -25,15 +74,21 @@ def get_connection():
         user=os.getenv('DB_USER'),
         password=os.getenv('DB_PASS'),
         database=os.getenv('DB_NAME'),
-        port=4000,
-        ssl={'ca': certifi.where()},
+        port=int(os.getenv('DB_PORT', 4000)),
+        ssl={'ca': certifi.where()} if os.getenv('DB_SSL', 'true').lower() not in ('0', 'false', 'no') else None,
+        local_infile=True,  # needed by LoadDataSink
         autocommit=False 
     )
 
 def simulate_2026_partial(conn, cursor, match_id_start, teams, rosters, e_map, home_stadiums, referees):
+    """Writes the in-progress 2026 season. Does not commit: the caller commits it together with its checkpoint."""
     year = 2026
     print(f"\n>>> STARTING SPECIAL SEASON {year} (IN-PROGRESS) <<<")
     
+    random.shuffle(teams)
+    groups = split_groups(teams, GROUP_SIZE)
+    schedules = [generate_single_rr(group) for group in groups]
+    
     # 1. Setup Season and Phase 1
     cursor.execute("INSERT IGNORE INTO Season (year) VALUES (%s)", (year,))
     cursor.execute("INSERT INTO Phase (phase_id, year) VALUES (%s, %s)", (1, year))
@@ -41,20 +96,16 @@ def simulate_2026_partial(conn, cursor, match_id_start, teams, rosters, e_map, h
     
     # Create Rounds for Phase 1
     phase_rounds = []
-    for r_num in range(1, 6):
+    for r_num in range(1, max(len(s) for s in schedules) + 1):
         cursor.execute("INSERT INTO `Round` (round_id, phase_id) VALUES (%s, %s)", (r_num, phase_1_pk))
         phase_rounds.append(cursor.lastrowid)
         
     match_id_counter = match_id_start
-    random.shuffle(teams)
-    groups = [teams[i:i+6] for i in range(0, 24, 6)]
-    
     all_p1_matches = []
     start_date = date(2026, 8, 1)
 
     # 2. Generate all Phase 1 Matches
-    for group in groups:
-        schedule = generate_single_rr(group)
+    for schedule in schedules:
         for r_idx, round_matches in enumerate(schedule):
             curr_round_pk = phase_rounds[r_idx]
             # Space matches out: Round 1 starts Aug 1, subsequent rounds weekly
@@ -79,7 +130,7 @@ def simulate_2026_partial(conn, cursor, match_id_start, teams, rosters, e_map, h
         (m1['id'], m1['date'], m1['round'], m1['stadium'], m1['h'], m1['a'])
     )
     # Run full simulation for the completed game
-    simulate_match_batch(cursor, [(m1['id'], m1['h'], m1['a'], m1['date'])], rosters, e_map)
+    simulate_match_batch(cursor, [(m1['id'], m1['h'], m1['a'], m1['date'])], rosters, e_map, 2026)
 
     # Game 2: Ongoing (August 1, 2026 at 9:00 AM)
     m2 = all_p1_matches[1]
@@ -104,15 +155,53 @@ def simulate_2026_partial(conn, cursor, match_id_start, teams, rosters, e_map, h
         scheduled_matches
     )
 
-    conn.commit()
     print(f"*** 2026 Season Initialized: 1 Completed, 1 Ongoing, {len(scheduled_matches)} Scheduled ***")
     return match_id_counter
 
 
 # --- GAMEPLAY SIMULATION ENGINE ---
-def simulate_match_batch(cursor, matches_data, team_rosters, event_map):
+def simulate_match_batch(cursor, matches_data, team_rosters, event_map, year):
+    results, event_buffer, score_buffer = play_match_batch(matches_data, team_rosters, event_map)
+    
+    if event_buffer:
+        cursor.executemany("INSERT INTO Event_Creation (match_id, person_id, event_id, game_time) VALUES (%s, %s, %s, %s)", event_buffer)
+    if score_buffer:
+        # The simulator already knows the final score, so Match_Score is written directly instead of re-aggregated.
+        cursor.executemany("INSERT INTO Match_Score (match_id, home_score, away_score) VALUES (%s, %s, %s)", score_buffer)
+        stat_rows = [(pid, mid, year, *counts) for pid, mid, counts in player_stat_rows(event_buffer, event_map)]
+        cursor.executemany(
+            f"INSERT INTO Player_Match_Stats (person_id, match_id, year, {', '.join(BOX_SCORE_COLUMNS)}) "
+            f"VALUES ({', '.join(['%s'] * (len(BOX_SCORE_COLUMNS) + 3))})", stat_rows)
+    
+    return results
+
+def player_stat_rows(events, event_map):
+    """
+    Aggregates (match_id, person_id, event_id, game_time) rows into (person_id, match_id, counts) box-score rows.
+    Like model.rebuild_player_stats, every player with any event in a match gets a row, even if it only has zeros.
+    """
+    increments = EventCatalog.with_ids(event_map).box_score_increments()
+    lines = {}
+    for mid, pid, eid, _ in events:
+        counts = lines.get((pid, mid))
+        if counts is None:
+            counts = lines[(pid, mid)] = [0] * len(BOX_SCORE_COLUMNS)
+        for i, n in increments.get(eid, ()):
+            counts[i] += n
+    return [(pid, mid, counts) for (pid, mid), counts in lines.items()]
+
+def match_engine(name):
+    """Returns the play_match_batch implementation selected with --engine."""
+    if name == 'numpy':
+        import sim_numpy  # NumPy is only required for this engine
+        return sim_numpy.play_match_batch
+    return play_match_batch
+
+def play_match_batch(matches_data, team_rosters, event_map):
+    """Simulates the given matches without touching the database. Returns (results, events, scores)."""
     results = {}
     event_buffer = []
+    score_buffer = []
     
     for match_info in matches_data:
         m_id, home_id, away_id, m_date = match_info
@@ -308,26 +397,35 @@ def simulate_match_batch(cursor, matches_data, team_rosters, event_map):
         loser = away_id if winner == home_id else home_id
         
         results[m_id] = {'winner': winner, 'loser': loser, 'score': scores}
+        score_buffer.append((m_id, scores['home'], scores['away']))
     
-    if event_buffer:
-        cursor.executemany("INSERT INTO Event_Creation (match_id, person_id, event_id, game_time) VALUES (%s, %s, %s, %s)", event_buffer)
-    
-    return results
+    return results, event_buffer, score_buffer
 
 # --- TOURNAMENT MANAGER ---
 
-def run_all_seasons(conn, cursor):
+def run_all_seasons(conn, cursor, workers=1, seed=None, engine='python', sink='executemany'):
+    """
+    Simulates every season in YEARS_TO_SIMULATE plus the in-progress 2026 season.
+
+    Seasons are generated in memory (in a process pool when workers > 1) and written one
+    transaction per season together with a Populate_Checkpoint row, so a rerun after a failure
+    skips the seasons that were already stored instead of starting over.
+    """
     print("--- STARTING MULTI-YEAR SIMULATION ---")
+    if seed is not None:
+        random.seed(seed)
+        Faker.seed(seed)
     
-    # 1. Setup Static Data (Run Once)
+    # 1. Setup Static Data (Run Once - INSERT IGNORE makes it safe to repeat on resume)
     setup_static_data(conn, cursor)
+    create_checkpoint_table(cursor)
     conn.commit()
     
     # 2. Prepare Shared Resources
     cursor.execute("SELECT id FROM Team")
     # Sorting ensures that if we inserted 1..24, we get 1..24 back in order
     all_teams = sorted([r[0] for r in cursor.fetchall()])
-    teams_24 = all_teams[:NUM_TEAMS]
+    league_teams = all_teams[:NUM_TEAMS]
     
     cursor.execute("SELECT pt.team_id, pt.person_id, p.speciality FROM Person_Team pt JOIN Person p ON pt.person_id = p.id")
     rosters = {} 
@@ -347,191 +445,365 @@ def run_all_seasons(conn, cursor):
     
     team_home_stadiums = {}
     random.shuffle(stadiums)
-    for i, tid in enumerate(teams_24):
+    for i, tid in enumerate(league_teams):
         team_home_stadiums[tid] = stadiums[i % len(stadiums)]
     
-    # 3. Iterate Years
-    # --- CHANGE: Global Match ID Counter starts at 1 ---
-    current_match_id = 1 
-    
-    for year in YEARS_TO_SIMULATE:
-        print(f"\n>>> STARTING SEASON {year} <<<")
-        # We pass the counter and get the updated one back
-        current_match_id = simulate_season(conn, cursor, year, current_match_id, teams_24, rosters, e_map, team_home_stadiums, referees)
-        conn.commit()
-    
-    current_match_id = simulate_2026_partial(
-        conn, cursor, current_match_id, teams_24, rosters, e_map, team_home_stadiums, referees
+    # 3. Resume from checkpoints
+    checkpoints = load_checkpoints(cursor)
+    # Global Match ID Counter continues after the last stored season, and after any match already in
+    # the table (e.g. from a run that predates checkpoints)
+    cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM `Match`")
+    current_match_id = max(max(checkpoints.values(), default=1), cursor.fetchone()[0])
+    pending_years = [y for y in YEARS_TO_SIMULATE if y not in checkpoints]
+    if checkpoints:
+        print(f"Resuming: {len(checkpoints)} season(s) already stored, {len(pending_years)} left.")
+    
+    # 4. Generate and write the remaining seasons
+    layout = {'group_size': GROUP_SIZE, 'qualifiers_per_group': QUALIFIERS_PER_GROUP, 'engine': engine}
+    context = (league_teams, rosters, e_map, team_home_stadiums, referees, layout, seed)
+    if workers > 1 and len(pending_years) > 1:
+        with multiprocessing.Pool(workers, initializer=init_season_worker, initargs=context) as pool:
+            # Seasons are stored in year order, so match ids are assigned exactly as in a sequential run.
+            # At most `workers` seasons are generated ahead of the writer, which bounds the memory they hold.
+            years = iter(pending_years)
+            window = deque(pool.apply_async(generate_season_task, (year,)) for year in islice(years, workers))
+            while window:
+                season = window.popleft().get()
+                for year in islice(years, 1):
+                    window.append(pool.apply_async(generate_season_task, (year,)))
+                current_match_id = store_season(conn, cursor, season, current_match_id, SINKS[sink])
+    else:
+        init_season_worker(*context)
+        for year in pending_years:
+            current_match_id = store_season(conn, cursor, generate_season_task(year), current_match_id, SINKS[sink])
+    
+    if 2026 not in checkpoints:
+        random.seed(season_seed(seed, 2026))
+        # Like store_season: the season and its checkpoint are one transaction
+        try:
+            current_match_id = simulate_2026_partial(
+                conn, cursor, current_match_id, sorted(league_teams), rosters, e_map, team_home_stadiums, referees
+            )
+            save_checkpoint(cursor, 2026, current_match_id)
+            conn.commit()
+        except pymysql.Error:
+            conn.rollback()
+            raise
+
+# --- CHECKPOINTS ---
+
+def create_checkpoint_table(cursor):
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS Populate_Checkpoint ("
+        "year int PRIMARY KEY, "
+        "next_match_id int NOT NULL, "
+        "completed_at timestamp DEFAULT CURRENT_TIMESTAMP)"
     )
 
-    sql = [
-        "CREATE INDEX idx_event_match_time ON Event_Creation (match_id, game_time)",
-        "CREATE INDEX idx_match_date ON `Match` (match_date)"
-        ]
-    print(f"Creating indexes")
-    for prompt in sql:
-            try:
-                cursor.execute(prompt)
-            except pymysql.Error as e:
-                print(f"Error:{e}")
-    print("Successfully created indexes!")    
-
-def simulate_season(conn, cursor, year, match_id_start, teams, rosters, e_map, home_stadiums, referees):
-    # --- HIERARCHY FOR YEAR ---
-    # Season ID is the Year (e.g. 2021) - This is the exception
-    cursor.execute("INSERT IGNORE INTO Season (year) VALUES (%s)", (year,))
-    
-    phase_db_map = {} 
-    for logical_p in [1, 2]:
-        cursor.execute("INSERT INTO Phase (phase_id, year) VALUES (%s, %s)", (logical_p, year))
-        phase_db_map[logical_p] = cursor.lastrowid
-        
-    phase_rounds_map = {} 
-    rounds_config = {1: 5, 2: 4} 
-    
-    for log_p, count in rounds_config.items():
-        phase_pk = phase_db_map[log_p]
-        phase_rounds_map[log_p] = []
-        for r_num in range(1, count + 1):
-            cursor.execute("INSERT INTO `Round` (round_id, phase_id) VALUES (%s, %s)", (r_num, phase_pk))
-            phase_rounds_map[log_p].append(cursor.lastrowid)
-            
-    match_id_counter = match_id_start
+def load_checkpoints(cursor):
+    """Returns {year: next free match id} for every season that was fully written."""
+    cursor.execute("SELECT year, next_match_id FROM Populate_Checkpoint")
+    return {year: next_id for year, next_id in cursor.fetchall()}
+
+def save_checkpoint(cursor, year, next_match_id):
+    cursor.execute("INSERT INTO Populate_Checkpoint (year, next_match_id) VALUES (%s, %s)", (year, next_match_id))
+
+def store_season(conn, cursor, season, match_id_start, sink=None):
+    """Writes a generated season and its checkpoint in one transaction. Returns the next free match id."""
+    print(f"\n>>> STORING SEASON {season['year']} <<<")
+    try:
+        next_match_id = write_season(cursor, season, match_id_start, sink or ExecuteManySink)
+        save_checkpoint(cursor, season['year'], next_match_id)
+        conn.commit()
+    except pymysql.Error:
+        conn.rollback()
+        raise
+    cursor.execute("SELECT name FROM Team WHERE id=%s", (season['champion'],))
+    print(f"*** {season['year']} CHAMPION: {cursor.fetchone()[0]} ***")
+    return next_match_id
+
+# --- SEASON GENERATION (no database access, runs in worker processes) ---
+
+_worker_context = {}
+
+def season_seed(seed, year):
+    # Every season gets its own stream, so the result does not depend on which worker runs it
+    return None if seed is None else seed * 100003 + year
+
+def init_season_worker(teams, rosters, e_map, home_stadiums, referees, layout, seed):
+    # The layout travels with the context because spawned workers do not see configure()
+    _worker_context.update(teams=teams, rosters=rosters, e_map=e_map,
+                           home_stadiums=home_stadiums, referees=referees, layout=layout, seed=seed)
+
+def generate_season_task(year):
+    ctx = _worker_context
+    random.seed(season_seed(ctx['seed'], year))
+    return generate_season(year, sorted(ctx['teams']), ctx['rosters'], ctx['e_map'],
+                           ctx['home_stadiums'], ctx['referees'], **ctx['layout'])
+
+def generate_season(year, teams, rosters, e_map, home_stadiums, referees, group_size=GROUP_SIZE, qualifiers_per_group=QUALIFIERS_PER_GROUP, engine='python'):
+    """
+    Simulates a whole season in memory and returns the rows to insert.
+    Matches are numbered from 0 and rounds are keyed (logical phase, round index);
+    write_season() maps both to database ids.
+
+    Phase 1 is a single round robin per group. The best qualifiers_per_group teams of every group
+    go through, cut down to the largest power of two, and play a knockout with a third place game.
+    """
+    random.shuffle(teams)
+    groups = split_groups(teams, group_size)
+    schedules = [generate_single_rr(group) for group in groups]
+    p1_rounds = max(len(schedule) for schedule in schedules)
+    bracket = knockout_size(len(teams), group_size, qualifiers_per_group)
+    
+    season = {
+        'year': year,
+        'rounds': {1: p1_rounds, 2: bracket.bit_length() - 1},
+        'matches': [],
+        'events': [],
+        'scores': [],
+        'player_stats': [],
+        'match_referees': [],
+        'team_stadiums': [],
+        'champion': None,
+    }
     start_date = date(year, 10, 1)
     
-    team_stadium_buffer = []
-    match_referee_buffer = []
-    
-    def link_match(mid, hid, aid, sid, rid):
+    def add_match(h, a, mdate, round_key):
+        mid = len(season['matches'])
+        stad = home_stadiums[h]
+        season['matches'].append((mid, mdate, round_key, stad, h, a))
         for ref in random.sample(referees, 3):
-            match_referee_buffer.append((mid, ref))
-        team_stadium_buffer.append((hid, sid, rid))
-        team_stadium_buffer.append((aid, sid, rid))
+            season['match_referees'].append((mid, ref))
+        season['team_stadiums'].append((h, stad, round_key))
+        season['team_stadiums'].append((a, stad, round_key))
+        return (mid, h, a, mdate)
+    
+    play_batch = match_engine(engine)
+    
+    def play(batch):
+        results, events, scores = play_batch(batch, rosters, e_map)
+        season['events'].extend(events)
+        season['scores'].extend(scores)
+        return results
 
     # --- PHASE 1: GROUPS ---
-    random.shuffle(teams)
-    groups = [teams[i:i+6] for i in range(0, 24, 6)]
     group_standings = {t: 0 for t in teams}
     p1_matches = []
     
-    for group in groups:
-        schedule = generate_single_rr(group)
+    for schedule in schedules:
         for r_idx, round_matches in enumerate(schedule):
-            curr_round_pk = phase_rounds_map[1][r_idx]
             mdate = start_date + timedelta(weeks=r_idx)
-            
             for h, a in round_matches:
-                mid = match_id_counter
-                match_id_counter += 1
-                stad = home_stadiums[h]
-                p1_matches.append((mid, h, a, mdate))
-                cursor.execute("INSERT INTO `Match` (id, match_date, status, round_id, stadium_id, home_team_id, away_team_id) VALUES (%s, %s, 'Completed', %s, %s, %s, %s)", (mid, mdate, curr_round_pk, stad, h, a))
-                link_match(mid, h, a, stad, curr_round_pk)
+                p1_matches.append(add_match(h, a, mdate, (1, r_idx)))
     
-    conn.commit()
-    res_p1 = simulate_match_batch(cursor, p1_matches, rosters, e_map)
+    res_p1 = play(p1_matches)
     for res in res_p1.values(): group_standings[res['winner']] += 1
     
     qualifiers = []
     for g in groups:
-        qualifiers.extend(sorted(g, key=lambda t: group_standings[t], reverse=True)[:4])
+        qualifiers.extend(sorted(g, key=lambda t: group_standings[t], reverse=True)[:qualifiers_per_group])
+    # Fill the bracket with the qualifiers that won the most group games
+    qualifiers = sorted(qualifiers, key=lambda t: group_standings[t], reverse=True)[:bracket]
         
-    print(f"   -> Group Stage Complete. {len(qualifiers)} teams qualified.")
+    print(f"   -> {year} Group Stage Complete. {len(qualifiers)} teams qualified.")
     
     # --- PHASE 2: FINALS ---
-    p2_round_ids = phase_rounds_map[2]
     current_teams = qualifiers
     random.shuffle(current_teams)
-    curr_date = start_date + timedelta(weeks=10)
-    
-    # R16
-    r16_matches = []
-    for i in range(0, 16, 2):
-        h, a = current_teams[i], current_teams[i+1]
-        mid = match_id_counter; match_id_counter += 1
-        st = home_stadiums[h]
-        r16_matches.append((mid, h, a, curr_date))
-        cursor.execute("INSERT INTO `Match` (id, match_date, status, round_id, stadium_id, home_team_id, away_team_id) VALUES (%s, %s, 'Completed', %s, %s, %s, %s)", (mid, curr_date, p2_round_ids[0], st, h, a))
-        link_match(mid, h, a, st, p2_round_ids[0])
-        
-    conn.commit()
-    r16_res = simulate_match_batch(cursor, r16_matches, rosters, e_map)
-    qf_teams = [r16_res[m[0]]['winner'] for m in r16_matches]
-    
-    # QF
-    qf_matches = []
-    curr_date += timedelta(days=7)
-    for i in range(0, 8, 2):
-        h, a = qf_teams[i], qf_teams[i+1]
-        mid = match_id_counter; match_id_counter += 1
-        st = home_stadiums[h]
-        qf_matches.append((mid, h, a, curr_date))
-        cursor.execute("INSERT INTO `Match` (id, match_date, status, round_id, stadium_id, home_team_id, away_team_id) VALUES (%s, %s, 'Completed', %s, %s, %s, %s)", (mid, curr_date, p2_round_ids[1], st, h, a))
-        link_match(mid, h, a, st, p2_round_ids[1])
-        
-    conn.commit()
-    qf_res = simulate_match_batch(cursor, qf_matches, rosters, e_map)
-    sf_teams = [qf_res[m[0]]['winner'] for m in qf_matches]
-    
-    # SF
-    sf_matches = []
-    curr_date += timedelta(days=7)
-    mid1 = match_id_counter; match_id_counter += 1
-    st1 = home_stadiums[sf_teams[0]]
-    sf_matches.append((mid1, sf_teams[0], sf_teams[1], curr_date))
-    cursor.execute("INSERT INTO `Match` (id, match_date, status, round_id, stadium_id, home_team_id, away_team_id) VALUES (%s, %s, 'Completed', %s, %s, %s, %s)", (mid1, curr_date, p2_round_ids[2], st1, sf_teams[0], sf_teams[1]))
-    link_match(mid1, sf_teams[0], sf_teams[1], st1, p2_round_ids[2])
-    
-    mid2 = match_id_counter; match_id_counter += 1
-    st2 = home_stadiums[sf_teams[2]]
-    sf_matches.append((mid2, sf_teams[2], sf_teams[3], curr_date))
-    cursor.execute("INSERT INTO `Match` (id, match_date, status, round_id, stadium_id, home_team_id, away_team_id) VALUES (%s, %s, 'Completed', %s, %s, %s, %s)", (mid2, curr_date, p2_round_ids[2], st2, sf_teams[2], sf_teams[3]))
-    link_match(mid2, sf_teams[2], sf_teams[3], st2, p2_round_ids[2])
-    
-    conn.commit()
-    sf_res = simulate_match_batch(cursor, sf_matches, rosters, e_map)
-    
-    fin_teams = []
-    third_teams = []
-    for m in sf_matches:
-        fin_teams.append(sf_res[m[0]]['winner'])
-        third_teams.append(sf_res[m[0]]['loser'])
+    curr_date = start_date + timedelta(weeks=2 * p1_rounds)
+    
+    # Knockout rounds down to the semi-finals - winners advance, semi-final losers play for third place
+    r_idx = 0
+    while len(current_teams) > 2:
+        if r_idx:
+            curr_date += timedelta(days=7)
+        ko_matches = [add_match(current_teams[i], current_teams[i+1], curr_date, (2, r_idx))
+                      for i in range(0, len(current_teams), 2)]
+        ko_res = play(ko_matches)
+        current_teams = [ko_res[m[0]]['winner'] for m in ko_matches]
+        third_teams = [ko_res[m[0]]['loser'] for m in ko_matches]
+        r_idx += 1
         
     # FINALS
-    fin_matches = []
     curr_date += timedelta(days=2)
-    # 3rd
-    mid3 = match_id_counter; match_id_counter += 1
-    st3 = home_stadiums[third_teams[0]]
-    fin_matches.append((mid3, third_teams[0], third_teams[1], curr_date))
-    cursor.execute("INSERT INTO `Match` (id, match_date, status, round_id, stadium_id, home_team_id, away_team_id) VALUES (%s, %s, 'Completed', %s, %s, %s, %s)", (mid3, curr_date, p2_round_ids[3], st3, third_teams[0], third_teams[1]))
-    link_match(mid3, third_teams[0], third_teams[1], st3, p2_round_ids[3])
-    
-    # Champ
-    midF = match_id_counter; match_id_counter += 1
-    stF = home_stadiums[fin_teams[0]]
-    fin_matches.append((midF, fin_teams[0], fin_teams[1], curr_date))
-    cursor.execute("INSERT INTO `Match` (id, match_date, status, round_id, stadium_id, home_team_id, away_team_id) VALUES (%s, %s, 'Completed', %s, %s, %s, %s)", (midF, curr_date, p2_round_ids[3], stF, fin_teams[0], fin_teams[1]))
-    link_match(midF, fin_teams[0], fin_teams[1], stF, p2_round_ids[3])
-    
-    conn.commit()
-    fin_res = simulate_match_batch(cursor, fin_matches, rosters, e_map)
-    
-    # COMMIT LINKS
-    if match_referee_buffer:
-        cursor.executemany("INSERT IGNORE INTO Match_Referee (match_id, referee_id) VALUES (%s, %s)", match_referee_buffer)
-    if team_stadium_buffer:
-        cursor.executemany("INSERT IGNORE INTO Team_stadium (team_id, stadium_id, round_id) VALUES (%s, %s, %s)", team_stadium_buffer)
-        
-    champ_id = fin_res[midF]['winner']
-    cursor.execute("SELECT name FROM Team WHERE id=%s", (champ_id,))
-    print(f"*** {year} CHAMPION: {cursor.fetchone()[0]} ***")
-    
+    third_match = add_match(third_teams[0], third_teams[1], curr_date, (2, r_idx))
+    final_match = add_match(current_teams[0], current_teams[1], curr_date, (2, r_idx))
+    fin_res = play([third_match, final_match])
+    season['champion'] = fin_res[final_match[0]]['winner']
+    # The simulator knows every event, so box scores are summed here rather than re-aggregated in SQL
+    season['player_stats'] = player_stat_rows(season['events'], e_map)
+    
+    return season
+
+# --- SEASON WRITER ---
+
+WRITE_BATCH_SIZE = 2000
+LOAD_CHUNK_ROWS = 100000
+
+class RowSink:
+    """Receives generated rows for one table. Use it as a context manager so the tail is written on exit."""
+
+    def __init__(self, cursor, table, columns, ignore=False):
+        self.cursor = cursor
+        self.table = table
+        self.columns = columns
+        self.ignore = ignore
+        self.rows_written = 0
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+    def discard(self):
+        pass
+
+class ExecuteManySink(RowSink):
+    """Buffers rows and writes every batch_size of them as one multi-row INSERT (via executemany)."""
+
+    def __init__(self, cursor, table, columns, ignore=False, batch_size=WRITE_BATCH_SIZE):
+        super().__init__(cursor, table, columns, ignore)
+        self.batch_size = batch_size
+        self.sql = f"INSERT {'IGNORE ' if ignore else ''}INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        self.buffer = []
+
+    def write(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.cursor.executemany(self.sql, self.buffer)
+            self.rows_written += len(self.buffer)
+            self.buffer = []
+
+    def discard(self):
+        self.buffer = []
+
+def tsv_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+class LoadDataSink(RowSink):
+    """
+    Streams rows into a temporary TSV file and loads it with LOAD DATA LOCAL INFILE every chunk_rows rows,
+    so memory stays flat however many rows are written. The connection needs local_infile=True.
+    """
+
+    def __init__(self, cursor, table, columns, ignore=False, chunk_rows=LOAD_CHUNK_ROWS):
+        super().__init__(cursor, table, columns, ignore)
+        self.chunk_rows = chunk_rows
+        self.sql = (
+            f"LOAD DATA LOCAL INFILE %s {'IGNORE ' if ignore else ''}INTO TABLE {table} "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({', '.join(columns)})"
+        )
+        self.file = None
+        self.pending = 0
+
+    def write(self, row):
+        if self.file is None:
+            self.file = tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, newline='', encoding='utf-8')
+        self.file.write('\t'.join(tsv_value(v) for v in row) + '\n')
+        self.pending += 1
+        if self.pending >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.file is None:
+            return
+        self.file.close()
+        try:
+            self.cursor.execute(self.sql, (self.file.name,))
+        finally:
+            os.unlink(self.file.name)
+            self.file = None
+        self.rows_written += self.pending
+        self.pending = 0
+
+    def discard(self):
+        if self.file is not None:
+            self.file.close()
+            os.unlink(self.file.name)
+            self.file = None
+            self.pending = 0
+
+SINKS = {'executemany': ExecuteManySink, 'load-data': LoadDataSink}
+
+MATCH_COLUMNS = ['id', 'match_date', 'status', 'round_id', 'stadium_id', 'home_team_id', 'away_team_id']
+EVENT_COLUMNS = ['match_id', 'person_id', 'event_id', 'game_time']
+PLAYER_MATCH_STATS_COLUMNS = ['person_id', 'match_id', 'year', *BOX_SCORE_COLUMNS]
+
+def write_season(cursor, season, match_id_start, sink=ExecuteManySink):
+    """Inserts a season produced by generate_season(). The caller commits. Returns the next free match id."""
+    year = season['year']
+    # Season ID is the Year (e.g. 2021) - This is the exception
+    cursor.execute("INSERT IGNORE INTO Season (year) VALUES (%s)", (year,))
     
-                   
+    phase_db_map = {}
+    for logical_p in season['rounds']:
+        cursor.execute("INSERT INTO Phase (phase_id, year) VALUES (%s, %s)", (logical_p, year))
+        phase_db_map[logical_p] = cursor.lastrowid
     
-    # Return the updated match counter so the next year continues where we left off
-    return match_id_counter
+    round_db_map = {}
+    for logical_p, count in season['rounds'].items():
+        for r_idx in range(count):
+            cursor.execute("INSERT INTO `Round` (round_id, phase_id) VALUES (%s, %s)", (r_idx + 1, phase_db_map[logical_p]))
+            round_db_map[(logical_p, r_idx)] = cursor.lastrowid
+    
+    def match_id(local_id):
+        return match_id_start + local_id
+    
+    # Rows are produced lazily, each sink decides how many it holds before writing
+    with sink(cursor, '`Match`', MATCH_COLUMNS) as out:
+        out.write_many((match_id(mid), mdate, 'Completed', round_db_map[rk], stad, h, a) for mid, mdate, rk, stad, h, a in season['matches'])
+    with sink(cursor, 'Event_Creation', EVENT_COLUMNS) as out:
+        out.write_many((match_id(mid), pid, eid, gtime) for mid, pid, eid, gtime in season['events'])
+    with sink(cursor, 'Match_Score', ['match_id', 'home_score', 'away_score']) as out:
+        out.write_many((match_id(mid), hs, aws) for mid, hs, aws in season['scores'])
+    with sink(cursor, 'Player_Match_Stats', PLAYER_MATCH_STATS_COLUMNS) as out:
+        out.write_many((pid, match_id(mid), year, *counts) for pid, mid, counts in season['player_stats'])
+    with sink(cursor, 'Match_Referee', ['match_id', 'referee_id'], ignore=True) as out:
+        out.write_many((match_id(mid), ref) for mid, ref in season['match_referees'])
+    with sink(cursor, 'Team_stadium', ['team_id', 'stadium_id', 'round_id'], ignore=True) as out:
+        out.write_many((t, s, round_db_map[rk]) for t, s, rk in season['team_stadiums'])
+    
+    return match_id_start + len(season['matches'])
+
+def benchmark_sinks(conn, cursor, matches=200, engine='python'):
+    """Times every sink loading the same simulated events into a scratch copy of Event_Creation."""
+    rosters = {
+        1: {'players': list(range(1, PLAYERS_PER_TEAM + 1)), 'coaches': [0]},
+        2: {'players': list(range(PLAYERS_PER_TEAM + 1, 2 * PLAYERS_PER_TEAM + 1)), 'coaches': [PLAYERS_PER_TEAM * 2 + 1]},
+    }
+    e_map = {e.name: e.id for e in DEFAULT_EVENT_TYPES}
+    _, events, _ = match_engine(engine)([(i, 1, 2, date(2025, 10, 1)) for i in range(matches)], rosters, e_map)
+    
+    # CREATE TABLE ... LIKE copies the indexes but not the foreign keys, so the synthetic ids load fine
+    cursor.execute("DROP TABLE IF EXISTS Event_Creation_Bench")
+    cursor.execute("CREATE TABLE Event_Creation_Bench LIKE Event_Creation")
+    try:
+        for name, sink in SINKS.items():
+            cursor.execute("TRUNCATE TABLE Event_Creation_Bench")
+            start = perf_counter()
+            with sink(cursor, 'Event_Creation_Bench', EVENT_COLUMNS) as out:
+                out.write_many(events)
+            conn.commit()
+            elapsed = perf_counter() - start
+            print(f"{name:<12} {out.rows_written} rows in {elapsed:.2f}s ({out.rows_written / elapsed:,.0f} rows/s)")
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS Event_Creation_Bench")
 
 def generate_single_rr(team_ids):
     if len(team_ids) % 2 != 0: team_ids.append(None)
@@ -564,15 +836,14 @@ def setup_static_data(conn, cursor):
     cursor.executemany("INSERT IGNORE INTO Referee (id, first_name, last_name) VALUES (%s, %s, %s)", referees)
     
     # Events (Keep as 1..N)
-    evts = ['Turnover', 'Steal', 'Block', 'Offensive Rebound', 'Defensive Rebound', 'Personal Foul', 'Technical Foul', 'Flagrant Foul', 'Offensive Foul', 'Substitution', 'Free Throw Made', 'Free Throw Attempt', '2-Point Field Goal Made', '2-Point Field Goal Attempt', '3-Point Field Goal Made', '3-Point Field Goal Attempt', 'Assist', 'Time running out']
-    cursor.executemany("INSERT IGNORE INTO Event (id, name) VALUES (%s, %s)", [(i+1, n) for i, n in enumerate(evts)])
+    cursor.executemany("INSERT IGNORE INTO Event (id, name, points, category, shot_value, made) VALUES (%s, %s, %s, %s, %s, %s)", DEFAULT_EVENT_TYPES)
     
     # --- CHANGE: PERSONS start at 1 ---
     pt_data = []
     p_data = []
     pid = 1  # Resetting person ID to 1
     
-    # Note: Using teams logic 1..24
+    # Note: Using teams logic 1..NUM_TEAMS
     for tid in range(1, NUM_TEAMS + 1):
         # Coach
         p_data.append((pid, fake.first_name(), fake.last_name(), 'Coach'))
@@ -588,9 +859,42 @@ def setup_static_data(conn, cursor):
     cursor.executemany("INSERT IGNORE INTO Person_Team (person_id, team_id, beginning, ending, shirt_num) VALUES (%s, %s, %s, %s, %s)", pt_data)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Populate the database with simulated seasons.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes that simulate seasons in parallel (default: 1)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Base random seed. The same seed regenerates the same dataset")
+    parser.add_argument('--engine', choices=['python', 'numpy'], default='python',
+                        help="Match simulation engine. numpy plays whole batches of matches at once (requires numpy)")
+    parser.add_argument('--sink', choices=sorted(SINKS), default='executemany',
+                        help="How generated rows are written: batched INSERTs or LOAD DATA LOCAL INFILE from temporary TSV files")
+    parser.add_argument('--benchmark-sinks', action='store_true',
+                        help="Compare the sinks on a scratch table instead of populating the database")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='huge',
+                        help="Dataset size preset (default: huge)")
+    parser.add_argument('--teams', type=int, help="Number of teams (overrides the profile)")
+    parser.add_argument('--group-size', type=int, help="Teams per group in the group stage")
+    parser.add_argument('--qualifiers-per-group', type=int, help="Teams per group that reach the knockout phase")
+    parser.add_argument('--players-per-team', type=int, help="Players on every roster")
+    parser.add_argument('--seasons', type=int, help="Completed seasons to simulate before 2026")
+    args = parser.parse_args()
+
+    settings = dict(PROFILES[args.profile])
+    for key in settings:
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    try:
+        configure(**settings)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Profile: {args.profile} {settings}")
+
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            run_all_seasons(conn, cursor)
+            if args.benchmark_sinks:
+                benchmark_sinks(conn, cursor, engine=args.engine)
+            else:
+                run_all_seasons(conn, cursor, workers=args.workers, seed=args.seed, engine=args.engine, sink=args.sink)
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
@@ -0,0 +1,130 @@
+import os
+import random
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+np = pytest.importorskip('numpy')
+import analytics  # noqa: E402
+import model  # noqa: E402
+import populate_huge  # noqa: E402
+from event_catalog import BOX_SCORE_COLUMNS, DEFAULT_EVENT_TYPES, EVENT_NAMES, EventCatalog  # noqa: E402
+
+EVENT_MAP = {name: i + 1 for i, name in enumerate(EVENT_NAMES)}
+ROSTERS = {
+    1: {'coaches': [100], 'players': list(range(1, 13))},
+    2: {'coaches': [200], 'players': list(range(13, 25))},
+    3: {'coaches': [300], 'players': list(range(25, 37))},
+}
+MEMBERS = [(p, team) for team, roster in ROSTERS.items() for p in roster['players'] + roster['coaches']]
+
+
+def simulated_store():
+    """A store holding 20 simulated matches of one group phase (id 7, season 2024), the last one not completed."""
+    random.seed(11)
+    matches = [(i, 1 + i % 3, 1 + (i + 1) % 3, date(2024, 1, 1)) for i in range(1, 21)]
+    _, events, scores = populate_huge.play_match_batch(matches, ROSTERS, EVENT_MAP)
+    store = analytics.EventStore(EventCatalog(DEFAULT_EVENT_TYPES))
+    store.set_matches([m[0] for m in matches], [m[1] for m in matches], [m[2] for m in matches],
+                      [m[0] != 20 for m in matches], [2024] * 20, [7] * 20)
+    store.set_memberships(*zip(*MEMBERS))
+    half = len(events) // 2
+    for start, stop in ((0, half), (half, len(events))):
+        rows = events[start:stop]
+        store.append(range(start + 1, stop + 1), *zip(*rows))
+    return store, events, scores
+
+
+def test_scores_and_box_scores_match_the_simulation():
+    store, events, scores = simulated_store()
+    assert len(store) == len(events)
+    assert store.scores([m for m, _, _ in scores] + [999]) == {
+        m: {1 + m % 3: home, 1 + (m + 1) % 3: away} for m, home, away in scores
+    }
+
+    rows = populate_huge.player_stat_rows(events, EVENT_MAP)
+    person_id = rows[0][0]
+    expected = [0] * len(BOX_SCORE_COLUMNS)
+    for pid, _, counts in rows:
+        if pid == person_id:
+            expected = [a + b for a, b in zip(expected, counts)]
+    # Like Player_Match_Stats, every match with an event of the player counts as a game
+    games = len({match_id for match_id, pid, _, _ in events if pid == person_id})
+    line = store.box_score(person_id, year=2024)
+    assert line == {'games': games, **dict(zip(BOX_SCORE_COLUMNS, expected))}
+    splits = store.shooting_splits(person_id)
+    assert (splits['fg3_made'], splits['fg3_attempts']) == (line['fg3m'], line['fg3a'])
+
+
+def test_leaderboard_and_standings(monkeypatch):
+    store, _, scores = simulated_store()
+    monkeypatch.setattr(model, 'query', lambda sql, params=(): [
+        {'id': pid, 'first_name': f'P{pid}', 'last_name': 'X'} for pid in params])
+    monkeypatch.setattr(model, 'cached_query', lambda sql, params=(), tables=(), ttl=None: [
+        {'id': team, 'name': f'Team {team}'} for team in ROSTERS])
+
+    leaders = store.leaderboard('points', 2024, limit=5)
+    values = [r['value'] for r in leaders]
+    assert len(leaders) == 5 and values == sorted(values, reverse=True)
+    assert leaders[0]['first_name'] == f"P{leaders[0]['person_id']}"
+    assert store.leaderboard('points', 2023) == []
+    shooters = store.leaderboard('ft_pct', min_attempts=1)
+    assert all(0 <= r['value'] <= 100 and r['attempts'] >= 1 for r in shooters)
+    with pytest.raises(ValueError):
+        store.leaderboard('dunks')
+
+    standings = store.group_standings(7)
+    completed = [s for s in scores if s[0] != 20]
+    assert sum(r['wins'] for r in standings) == len(completed)
+    assert sum(r['points_for'] for r in standings) == sum(h + a for _, h, a in completed)
+
+
+def test_new_matches_keep_existing_scores():
+    store, _, scores = simulated_store()
+    before = store.scores([1])
+    ids = list(range(1, 22))
+    store.set_matches(ids, [1 + i % 3 for i in ids], [1 + (i + 1) % 3 for i in ids], [True] * 21, [2024] * 21, [7] * 21)
+    assert store.scores([1, 21]) == {**before, 21: {1: 0, 2: 0}}
+    with pytest.raises(ValueError):
+        store.append([10 ** 6], [999], [1], [1], [None])
+
+
+def test_rows_committed_below_last_id_are_found(monkeypatch):
+    store, _, _ = simulated_store()
+    last_id = store.last_id
+    # last_id + 5 commits first, the ids between it and the old last_id later
+    late = [(1, 1, 1, None), (1, 2, 1, None)]
+    store.append([last_id + 5], *zip(*late[:1]))
+    assert store.last_id == last_id + 5
+    in_database = np.arange(1, last_id + 6)
+    monkeypatch.setattr(store, '_window_ids', lambda low, high: in_database[(in_database > low) & (in_database <= high)])
+    assert store.missed_ids(window=10).tolist() == list(range(last_id + 1, last_id + 5))
+    store.append([last_id + 2], *zip(*late[1:]))
+    assert store.missed_ids(window=10).tolist() == [last_id + 1, last_id + 3, last_id + 4]
+    assert store.missed_ids(window=3).tolist() == [last_id + 3, last_id + 4]
+    assert store.last_id == last_id + 5
+
+
+def test_archived_seasons_are_read_from_their_files(tmp_path, monkeypatch):
+    import archive
+    store, events, scores = simulated_store()
+    path = tmp_path / archive.season_file_name(2024)
+    archived, kept = events[:len(events) // 2], events[len(events) // 2:]
+    ids = range(1, len(archived) + 1)
+    archive.write_season_file(str(path), 2024, *archive.encode_records(
+        ids, *zip(*[(m, p, e) for m, p, e, _ in archived]), [t for *_, t in archived], [None] * len(archived)))
+    monkeypatch.setattr(model, 'ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setattr(model, 'get_archived_seasons', lambda: {2024: path.name})
+
+    # The simulated store already holds every event, as after an interrupted archive run
+    assert store._read_archives() == 0
+    fresh = analytics.EventStore(store.catalog)
+    fresh.set_matches(store.match_ids, store.match_home, store.match_away, store.match_completed,
+                      store.match_year, store.match_phase)
+    fresh.set_memberships(*zip(*MEMBERS))
+    fresh.append(range(len(archived) + 1, len(events) + 1), *zip(*kept))
+    assert fresh._read_archives() == len(archived)
+    assert fresh.scores(store.match_ids) == store.scores(store.match_ids)
+    assert fresh.box_score(events[0][1], year=2024) == store.box_score(events[0][1], year=2024)
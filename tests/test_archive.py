@@ -0,0 +1,154 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+np = pytest.importorskip('numpy')
+import archive  # noqa: E402
+import model  # noqa: E402
+from event_catalog import DEFAULT_EVENT_TYPES, EventCatalog  # noqa: E402
+
+START = datetime(2021, 3, 1, 0, 0, 0)
+
+
+def season_columns():
+    """(ids, match_ids, person_ids, event_ids, game_times, real_times) of two matches, out of order."""
+    events = [
+        # id, match, person, event, game second (None: recorded without a clock)
+        (5, 2, 13, 13, 30),
+        (1, 1, 1, 13, 50),
+        (2, 1, 2, 11, 10),
+        (3, 1, 1, 6, 10),
+        (4, 1, 2, 15, None),
+        (6, 2, 1, 15, 0),
+    ]
+    game_times = [None if s is None else START + timedelta(days=m, seconds=s) for _, m, _, _, s in events]
+    real_times = [START + timedelta(days=1, seconds=60)] * (len(events) - 1) + [None]
+    return [e[0] for e in events], [e[1] for e in events], [e[2] for e in events], [e[3] for e in events], game_times, real_times
+
+
+@pytest.fixture
+def season(tmp_path):
+    path = str(tmp_path / archive.season_file_name(2021))
+    archive.write_season_file(path, 2021, *archive.encode_records(*season_columns()))
+    return archive.SeasonArchive(path)
+
+
+def test_records_are_fixed_width_and_sorted_like_match_pages(season):
+    assert os.path.getsize(season.path) == archive.HEADER_SIZE + 6 * archive.RECORD_DTYPE.itemsize
+    assert season.year == 2021
+    # Same second: ordered by event type, then id; the unclocked event sits at its recording time
+    assert [row[0] for row in season.match_events(1)] == [3, 2, 1, 4]
+    assert [row[0] for row in season.match_events(2)] == [6, 5]
+    assert season.match_events(3) == []
+
+    assert season.match_events(1)[0][4:] == (START + timedelta(days=1, seconds=10),) * 2
+    unclocked = season.match_events(1)[-1]
+    assert unclocked[4] == START + timedelta(days=1, seconds=60) and unclocked[5] is None
+    # The records are a view of the mapped file, not a copy
+    assert not season.records.flags.owndata and not season.records.flags.writeable
+
+
+def test_full_decode_matches_per_match_decode(season):
+    expected = [row[4] for match_id in (1, 2) for row in season.match_events(match_id)]
+    assert season.clock().astype('datetime64[s]').tolist() == expected
+    assert [row[0] for row in season.person_events(1)] == [1, 3, 6]
+    assert [row[0] for row in season.person_events(1, after_id=1, limit=1)] == [3]
+
+
+def test_recording_times_round_trip(season):
+    index = np.arange(len(season))
+    real_times = dict(zip(season.records['id'].tolist(), season.real_times(index, season.clock())))
+    assert real_times == dict(zip(season_columns()[0], season_columns()[5]))
+
+
+def test_version_1_files_read_the_clock_as_recording_time(tmp_path):
+    records, base_time = archive.encode_records(*season_columns())
+    old = np.zeros(len(records), dtype=archive.RECORD_DTYPES[1])
+    for name in old.dtype.names:
+        old[name] = records[name]
+    path = str(tmp_path / archive.season_file_name(2021))
+    with open(path, 'wb') as f:
+        f.write(archive.HEADER.pack(archive.MAGIC, 1, old.dtype.itemsize, 2021, len(old), base_time).ljust(archive.HEADER_SIZE, b'\0'))
+        old.tofile(f)
+    with archive.SeasonArchive(path) as season:
+        rows = season.match_events(1)
+        start, stop = season.match_range(1)
+        clock = season.clock()[start:stop]
+        assert season.real_times(np.arange(start, stop), clock) == [row[4] for row in rows]
+
+
+def test_unreadable_files_are_rejected(tmp_path):
+    path = tmp_path / 'broken.evt'
+    path.write_bytes(b'not an archive'.ljust(archive.HEADER_SIZE, b'\0'))
+    with pytest.raises(ValueError):
+        archive.SeasonArchive(str(path))
+
+
+def test_archived_match_pages(season, monkeypatch):
+    monkeypatch.setattr(model, 'cached_query', lambda sql, params=(), tables=(), ttl=None: [
+        {'person_id': 1, 'last_name': 'One', 'shirt_num': 7, 'team_name': 'Home'},
+        {'person_id': 2, 'last_name': 'Two', 'shirt_num': 9, 'team_name': 'Home'},
+    ])
+    monkeypatch.setattr(model, 'get_event_catalog', lambda: EventCatalog(DEFAULT_EVENT_TYPES))
+
+    first, cursor = model._archived_match_stats_page(season, 1, None, 3, 3)
+    assert [r['id'] for r in first] == [3, 2, 1]
+    assert first[0]['event_name'] == 'Personal Foul' and first[0]['last_name'] == 'One'
+    rest, cursor = model._archived_match_stats_page(season, 1, cursor, 3, 3)
+    assert [r['id'] for r in rest] == [4] and cursor is None
+    with pytest.raises(ValueError):
+        model._archived_match_stats_page(season, 1, model.encode_cursor(['soon', 1, 1]), 3, 3)
+
+
+def test_closing_unmaps_the_file(season):
+    with season:
+        assert len(season) == 6
+    assert season._mmap.closed and season.records is None
+
+
+class RecordingConnection:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=()):
+        self.statements.append((sql, list(params)))
+
+
+def test_rerunning_an_archived_season_deletes_only_the_archived_ids(season, monkeypatch):
+    statements = []
+    monkeypatch.setattr(model, 'get_connection', lambda: RecordingConnection(statements))
+    monkeypatch.setattr(model, 'get_archived_seasons', lambda: {2021: os.path.basename(season.path)})
+    monkeypatch.setattr(model, 'query', lambda sql, params=(): [{'n': 0}])
+    monkeypatch.setattr(archive, 'DELETE_CHUNK_ROWS', 4)
+
+    assert archive.archive_season(2021, os.path.dirname(season.path)) == 6
+    assert all(sql.startswith("DELETE FROM Event_Creation WHERE id IN") for sql, _ in statements)
+    assert sorted(id_ for _, params in statements for id_ in params) == [1, 2, 3, 4, 5, 6]
+    assert [len(params) for _, params in statements] == [4, 2]
+
+
+def test_events_cannot_be_added_to_archived_seasons(monkeypatch):
+    monkeypatch.setattr(model, 'get_archived_seasons', lambda: {2021: archive.season_file_name(2021)})
+    monkeypatch.setattr(model, 'cached_query', lambda sql, params=(), tables=(), ttl=None: [{'year': 2021}])
+    monkeypatch.setattr(model, 'get_connection', lambda: pytest.fail("nothing should be written"))
+
+    assert model.create_match_event(1, 1, 13, None) is None
+    assert model.create_match_events_bulk(1, [{'person_id': 1, 'event_id': 13}]) is None
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from event_catalog import BOX_SCORE_COLUMNS, DEFAULT_EVENT_TYPES, EventCatalog  # noqa: E402
+
+CATALOG = EventCatalog(DEFAULT_EVENT_TYPES)
+
+
+def test_lookups():
+    made_three = CATALOG.by_name('3-Point Field Goal Made')
+    assert CATALOG.get(made_three.id) is made_three
+    assert CATALOG.id_of('3-Point Field Goal Made') == made_three.id
+    assert CATALOG.id_of('Slam Dunk') is None
+    assert dict(CATALOG.points_by_id) == {
+        CATALOG.id_of('Free Throw Made'): 1,
+        CATALOG.id_of('2-Point Field Goal Made'): 2,
+        CATALOG.id_of('3-Point Field Goal Made'): 3,
+    }
+    assert CATALOG.ids(shot_value=2) == tuple(sorted(
+        (CATALOG.id_of('2-Point Field Goal Made'), CATALOG.id_of('2-Point Field Goal Attempt'))
+    ))
+    assert len(CATALOG.ids(category='foul')) == 4
+
+
+def test_catalog_is_read_only():
+    with pytest.raises(TypeError):
+        CATALOG.ids_by_name['Turnover'] = 99
+    with pytest.raises(AttributeError):
+        CATALOG.get(1).points = 5
+
+
+def test_with_ids_renumbers_from_the_database_map():
+    catalog = EventCatalog.with_ids({'Free Throw Made': 40, 'Assist': 41})
+    assert len(catalog) == 2
+    assert catalog.get(40).points == 1
+    assert catalog.id_of('Assist') == 41
+
+
+def test_box_score_increments():
+    col = {c: i for i, c in enumerate(BOX_SCORE_COLUMNS)}
+    increments = CATALOG.box_score_increments()
+    assert sorted(increments[CATALOG.id_of('3-Point Field Goal Made')]) == [(col['points'], 3), (col['fg3m'], 1), (col['fg3a'], 1)]
+    assert increments[CATALOG.id_of('Free Throw Attempt')] == ((col['fta'], 1),)
+    assert increments[CATALOG.id_of('Technical Foul')] == ((col['fouls'], 1),)
+    assert CATALOG.id_of('Substitution') not in increments
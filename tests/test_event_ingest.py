@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pymysql
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import model  # noqa: E402
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, sql, params):
+        self.params = params
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_inserted_ids_are_read_back_past_other_rows():
+    chunk = [(9, 1, 13, None), (9, '2', 11, None), (9, 1, 13, None)]
+    # Another scorer's row (person 5) landed between ours, and the ids skip numbers
+    cur = FakeCursor([(100, 1, 13), (102, 5, 6), (104, 2, 11), (107, 1, 13), (108, 3, 1)])
+    assert model._inserted_event_ids(cur, 9, 100, chunk) == [100, 104, 107]
+    assert cur.params == (9, 100)
+
+    with pytest.raises(pymysql.Error):
+        model._inserted_event_ids(FakeCursor([(100, 1, 13)]), 9, 100, chunk)
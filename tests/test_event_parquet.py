@@ -0,0 +1,60 @@
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+pytest.importorskip('pyarrow')
+import event_parquet  # noqa: E402
+
+
+def event_row(ec_id, year_day=1, team_id=3):
+    return (ec_id, 40, 7, team_id, 13, '2-Point Field Goal Made', 2,
+            datetime(2022, 5, year_day, 0, 12, 30), datetime(2022, 5, year_day, 18, 5),
+            date(2022, 5, year_day), 'Completed', 1, 3, 4, 9, 2, 5, 1)
+
+
+def test_batches_round_trip_through_a_season_file(tmp_path):
+    path = event_parquet.season_path(str(tmp_path), 2022)
+    batches = [[event_row(1), event_row(2, team_id=None)], [event_row(3, 2)]]
+    assert event_parquet.write_batches(path, iter(batches)) == 3
+    assert not os.path.exists(path + '.partial')
+
+    rows = [row for batch in event_parquet.iter_batches(path, batch_rows=2) for row in batch]
+    assert rows == [row for batch in batches for row in batch]
+
+
+def test_seasons_are_found_and_read_as_one_dataset(tmp_path):
+    directory = str(tmp_path)
+    event_parquet.write_batches(event_parquet.season_path(directory, 2021), [[event_row(1)]])
+    event_parquet.write_batches(event_parquet.season_path(directory, 2022), [[event_row(2), event_row(3)]])
+    os.makedirs(os.path.join(directory, 'notes'))
+
+    assert [year for year, _ in event_parquet.season_files(directory)] == [2021, 2022]
+    assert [year for year, _ in event_parquet.season_files(directory, years={2022})] == [2022]
+
+    table = event_parquet.read_events(directory, years=[2022], columns=['event_creation_id', 'year'])
+    assert sorted(table.column('event_creation_id').to_pylist()) == [2, 3]
+    assert set(table.column('year').to_pylist()) == {2022}
+
+
+class CountingCursor:
+    """executemany like pymysql: returns the affected rows, 0 for a duplicate left unchanged."""
+
+    def __init__(self, existing):
+        self.existing = set(existing)
+        self.sql = []
+
+    def executemany(self, sql, rows):
+        self.sql.append(sql)
+        new = [row for row in rows if row[0] not in self.existing]
+        self.existing.update(row[0] for row in new)
+        return len(new)
+
+
+def test_import_counts_inserted_rows_and_keeps_foreign_key_errors():
+    cur = CountingCursor(existing={2})
+    assert event_parquet._insert_new(cur, 'Event_Creation', ('id', 'match_id'), [(1, 9), (2, 9), (3, 9)], chunk_rows=2) == 2
+    assert event_parquet._insert_new(cur, 'Event_Creation', ('id', 'match_id'), []) == 0
+    assert all('IGNORE' not in sql and sql.endswith('ON DUPLICATE KEY UPDATE id = id') for sql in cur.sql)
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from executor import QueryExecutor  # noqa: E402
+
+
+def slow_echo(value, delay=0.2):
+    time.sleep(delay)
+    return value
+
+
+def fail():
+    raise ValueError("boom")
+
+
+def test_gather_runs_calls_concurrently_in_order():
+    executor = QueryExecutor(max_workers=4)
+    start = time.perf_counter()
+    results = executor.gather((slow_echo, 1), (slow_echo, 2), (slow_echo, 3, 0.1))
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    assert results == [1, 2, 3]
+    assert elapsed < 0.35
+
+
+def test_exceptions_propagate_and_calls_are_timed():
+    executor = QueryExecutor(max_workers=2)
+    with pytest.raises(ValueError):
+        executor.gather((slow_echo, 1, 0.01), (fail,))
+    stats = executor.stats()
+    executor.shutdown()
+    assert stats['slow_echo']['calls'] == 1
+    assert stats['slow_echo']['max_ms'] >= 10
+    assert stats['fail']['calls'] == 1
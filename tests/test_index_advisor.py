@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from index_advisor import plan_issues  # noqa: E402
+
+
+def mysql_row(table, type_, rows, extra=None):
+    return {'id': 1, 'select_type': 'SIMPLE', 'table': table, 'type': type_, 'key': None, 'rows': rows, 'Extra': extra}
+
+
+def test_mysql_full_scan_and_filesort():
+    plan = [
+        mysql_row('m', 'ALL', 50000, 'Using where; Using filesort'),
+        mysql_row('ht', 'eq_ref', 1),
+    ]
+    assert plan_issues(plan) == ["full scan of m (~50000 rows)", "filesort on m (~50000 rows)"]
+
+
+def test_small_tables_and_index_lookups_are_ignored():
+    plan = [
+        mysql_row('e', 'ALL', 18),
+        mysql_row('ec', 'ref', 40000, 'Using index condition'),
+    ]
+    assert plan_issues(plan) == []
+
+
+def test_tidb_operator_tree():
+    plan = [
+        {'id': 'TopN_8', 'estRows': '10.00', 'task': 'root', 'access object': '', 'operator info': ''},
+        {'id': '└─Sort_9', 'estRows': '25000.00', 'task': 'root', 'access object': '', 'operator info': ''},
+        {'id': '  └─TableFullScan_12', 'estRows': '25000.00', 'task': 'cop[tikv]', 'access object': 'table:m', 'operator info': ''},
+        {'id': '  └─IndexRangeScan_13', 'estRows': '30.00', 'task': 'cop[tikv]', 'access object': 'table:ec', 'operator info': ''},
+    ]
+    assert plan_issues(plan) == ["sort of ~25000 rows", "full scan of table:m (~25000 rows)"]
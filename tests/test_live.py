@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'basketball_league_web'))
+from app.live import LEAGUE_CHANNEL, LiveHub, format_sse, match_channel  # noqa: E402
+
+
+def parse(chunk):
+    fields = dict(line.split(': ', 1) for line in chunk.strip().splitlines())
+    return fields.get('event'), json.loads(fields['data'])
+
+
+def test_messages_reach_match_and_league_subscribers_only():
+    hub = LiveHub()
+    match_q = hub.subscribe(match_channel(1))
+    other_q = hub.subscribe(match_channel(2))
+    league_q = hub.subscribe(LEAGUE_CHANNEL)
+
+    hub.publish([match_channel(1), LEAGUE_CHANNEL], 'score', {'match_id': 1})
+    assert match_q.get_nowait()[1:] == ('score', {'match_id': 1})
+    assert league_q.get_nowait()[1:] == ('score', {'match_id': 1})
+    assert other_q.empty()
+
+
+def test_slow_subscribers_drop_their_oldest_messages():
+    hub = LiveHub(max_queue=2)
+    q = hub.subscribe('c')
+    for i in range(5):
+        hub.publish(['c'], 'score', i)
+    assert [q.get_nowait()[2] for _ in range(2)] == [3, 4]
+
+
+def test_stream_sends_snapshot_then_updates_and_unsubscribes():
+    hub = LiveHub()
+    stream = hub.stream('c', initial=('score', {'home_score': 0}), keepalive=0.01)
+    assert parse(next(stream)) == ('score', {'home_score': 0})
+    assert hub.subscriber_count('c') == 1
+
+    hub.publish(['c'], 'score', {'home_score': 2})
+    assert parse(next(stream)) == ('score', {'home_score': 2})
+    assert next(stream) == ': keep-alive\n\n'
+
+    stream.close()
+    assert hub.subscriber_count() == 0
+
+
+def test_format_sse():
+    assert format_sse({'a': 1}, event='score', event_id=7) == 'id: 7\nevent: score\ndata: {"a": 1}\n\n'
@@ -0,0 +1,68 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from event_catalog import DEFAULT_EVENT_TYPES, EventCatalog  # noqa: E402
+from live_state import LiveStateStore, MatchState  # noqa: E402
+
+CATALOG = EventCatalog(DEFAULT_EVENT_TYPES)
+HOME, AWAY = 1, 2
+ROSTER = {10: HOME, 11: HOME, 20: AWAY}
+
+
+def new_state(recent=3):
+    return MatchState(7, HOME, AWAY, ROSTER, CATALOG, recent=recent)
+
+
+def test_events_update_score_fouls_and_box_score():
+    state = new_state()
+    state.add(1, 10, CATALOG.id_of('3-Point Field Goal Made'))
+    state.add(2, 20, CATALOG.id_of('2-Point Field Goal Attempt'))
+    state.add(3, 20, CATALOG.id_of('Personal Foul'))
+    state.add(4, 99, CATALOG.id_of('2-Point Field Goal Made'))  # not on either roster
+    state.add(1, 10, CATALOG.id_of('3-Point Field Goal Made'))  # already applied
+
+    assert state.scores() == {HOME: 3, AWAY: 0}
+    assert state.scoreboard()['away_fouls'] == 1
+    line = state.box_score(10)
+    assert (line['games'], line['points'], line['fg3m'], line['fg3a']) == (1, 3, 1, 1)
+    assert state.box_score(11)['games'] == 0
+    assert state.box_scores()[20]['team_id'] == AWAY
+    assert [e['id'] for e in state.scoreboard()['recent_events']] == [2, 3, 4]
+
+
+def test_remove_reverts_an_event():
+    state = new_state()
+    state.add(1, 10, CATALOG.id_of('Free Throw Made'))
+    state.add(2, 10, CATALOG.id_of('Technical Foul'))
+    assert state.remove(2)
+    assert not state.remove(2)
+    assert state.scoreboard()['home_fouls'] == 0
+    assert state.box_score(10)['fouls'] == 0
+    assert state.scores() == {HOME: 1, AWAY: 0}
+    assert [e['id'] for e in state.recent] == [1]
+
+
+def test_foul_trouble_lists_players_over_the_threshold():
+    state = new_state()
+    for i in range(4):
+        state.add(i, 11, CATALOG.id_of('Personal Foul'))
+    state.add(10, 20, CATALOG.id_of('Offensive Foul'))
+    assert state.foul_trouble() == [{'person_id': 11, 'team_id': HOME, 'fouls': 4}]
+    assert [r['person_id'] for r in state.foul_trouble(threshold=1)] == [11, 20]
+
+
+def test_store_ignores_matches_that_are_not_live_and_detects_racing_rebuilds():
+    store = LiveStateStore()
+    assert not store.add_events(7, [(1, 10, CATALOG.id_of('Free Throw Made'), None)])
+    assert store.read(7, MatchState.scores) is None
+
+    version = store.version
+    store.put(new_state())
+    assert not store.replace_all([], version)
+    assert 7 in store
+
+    store.add_events(7, [(1, 10, CATALOG.id_of('Free Throw Made'), None)])
+    assert store.read(7, MatchState.scores) == {HOME: 1, AWAY: 0}
+    assert store.replace_all([], store.version)
+    assert store.match_ids() == set()
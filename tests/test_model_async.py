@@ -0,0 +1,55 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import model  # noqa: E402
+import model_async  # noqa: E402
+
+PHASES = [{'id': 11, 'phase_id': 1, 'year': 2024}, {'id': 12, 'phase_id': 2, 'year': 2024}]
+
+
+def fake_database(monkeypatch, delay):
+    loops = set()
+
+    async def fake_query(sql, params):
+        loops.add(id(asyncio.get_running_loop()))
+        await asyncio.sleep(delay)
+        if 'FROM Phase' in sql:
+            return [dict(p) for p in PHASES]
+        return [{'is_current': 1, 'id': params[0], 'name': 'Team', 'wins': 1, 'losses': 0, 'group_identifier': None,
+                 'group_rank': 1, 'points_for': 80, 'points_against': 70}]
+
+    monkeypatch.setattr(model_async, '_query', fake_query)
+    model.clear_cache()
+    return loops
+
+
+def test_standings_are_fetched_concurrently(monkeypatch):
+    fake_database(monkeypatch, delay=0.2)
+    start = time.perf_counter()
+    group_phase, group, knockout_phase, knockout = asyncio.run(model_async.get_season_standings(2024))
+    elapsed = time.perf_counter() - start
+
+    assert group_phase['id'] == 11 and knockout_phase['id'] == 12
+    assert group[0]['id'] == 11 and knockout[0]['id'] == 12
+    # Phases, then both standings side by side: two round trips rather than three
+    assert elapsed < 0.55
+
+
+def test_requests_from_different_event_loops_share_one_loop(monkeypatch):
+    loops = fake_database(monkeypatch, delay=0)
+    results = []
+
+    def request():
+        results.append(asyncio.run(model_async.query("SELECT 1 FROM Team WHERE id = %s", (7,))))
+
+    threads = [threading.Thread(target=request) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 3
+    assert len(loops) == 1
@@ -0,0 +1,50 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import model  # noqa: E402
+
+# Like MySQL, SQLite sorts NULL first ascending and last descending
+ROWS = [(1, 'b', None), (2, None, 'x'), (3, 'a', 'y'), (4, None, None), (5, 'b', 'x'), (6, 'a', None)]
+
+
+def walk(keys, limit=2):
+    con = sqlite3.connect(':memory:')
+    con.execute("CREATE TABLE t (id int, last_name text, first_name text)")
+    con.executemany("INSERT INTO t VALUES (?, ?, ?)", ROWS)
+    order = ", ".join(f"{expr} {'DESC' if desc else 'ASC'}" for expr, _, desc in keys)
+    seen, values = [], None
+    while True:
+        where, params = model._seek_clause(keys, values) if values else ("1 = 1", [])
+        page = con.execute(f"SELECT id, last_name, first_name FROM t WHERE {where.replace('%s', '?')} "
+                           f"ORDER BY {order} LIMIT {limit}", params).fetchall()
+        if not page:
+            return seen, [r[0] for r in con.execute(f"SELECT id FROM t ORDER BY {order}")]
+        seen += [r[0] for r in page]
+        row = dict(zip(('id', 'last_name', 'first_name'), page[-1]))
+        values = [row[key] for _, key, _ in keys]
+
+
+def test_pages_reach_every_row_past_null_keys():
+    for desc in (False, True):
+        keys = [('last_name', 'last_name', desc), ('first_name', 'first_name', desc), ('id', 'id', desc)]
+        seen, expected = walk(keys)
+        assert seen == expected
+
+
+def test_list_views_take_scores_from_the_shared_score_path(monkeypatch):
+    asked = []
+
+    def scores(match_ids):
+        match_ids = list(match_ids)
+        asked.extend(match_ids)
+        return {1: {10: 55, 20: 48}}
+
+    monkeypatch.setattr(model, 'get_scores_for_matches', scores)
+    matches = model._with_scores([
+        {'id': 1, 'status': 'Ongoing', 'home_team_id': 10, 'away_team_id': 20},
+        {'id': 2, 'status': 'Scheduled', 'home_team_id': 20, 'away_team_id': 10},
+    ])
+    assert asked == [1]
+    assert [(m['home_score'], m['away_score']) for m in matches] == [(55, 48), (None, None)]
@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+from collections import Counter
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import model  # noqa: E402
+import populate_huge  # noqa: E402
+from event_catalog import BOX_SCORE_COLUMNS, EVENT_NAMES  # noqa: E402
+
+EVENT_MAP = {name: i + 1 for i, name in enumerate(EVENT_NAMES)}
+ROSTERS = {
+    1: {'coaches': [100], 'players': list(range(1, 13))},
+    2: {'coaches': [200], 'players': list(range(13, 25))},
+}
+
+
+def test_box_scores_add_up_to_match_scores():
+    random.seed(5)
+    matches = [(i, 1, 2, date(2020, 10, 1)) for i in range(50)]
+    _, events, scores = populate_huge.play_match_batch(matches, ROSTERS, EVENT_MAP)
+    rows = populate_huge.player_stat_rows(events, EVENT_MAP)
+    col = {c: i for i, c in enumerate(BOX_SCORE_COLUMNS)}
+
+    points = Counter()
+    for person_id, match_id, counts in rows:
+        side = 'home' if person_id <= 12 or person_id == 100 else 'away'
+        points[(match_id, side)] += counts[col['points']]
+        assert counts[col['points']] == counts[col['ftm']] + 2 * counts[col['fg2m']] + 3 * counts[col['fg3m']]
+        for made, attempts in model.SHOT_STAT_COLUMNS.values():
+            assert counts[col[made]] <= counts[col[attempts]]
+    for match_id, home, away in scores:
+        assert (points[(match_id, 'home')], points[(match_id, 'away')]) == (home, away)
+
+
+def test_leaderboard_rejects_unknown_stats():
+    with pytest.raises(ValueError):
+        model.get_leaderboard('dunks', 2024)
+
+
+def test_players_without_box_score_events_still_get_a_row():
+    substitution = EVENT_MAP['Substitution']
+    events = [(1, 5, substitution, None), (1, 6, EVENT_MAP['3-Point Field Goal Made'], None)]
+    rows = {(pid, mid): counts for pid, mid, counts in populate_huge.player_stat_rows(events, EVENT_MAP)}
+    assert set(rows) == {(5, 1), (6, 1)}
+    assert rows[(5, 1)] == [0] * len(BOX_SCORE_COLUMNS)
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from pool import ConnectionPool  # noqa: E402
+
+
+class FakeConnection:
+    open = True
+    server_status = 0
+
+    def close(self):
+        self.open = False
+
+
+def test_first_checkout_opens_min_size_connections():
+    pool = ConnectionPool(FakeConnection, min_size=3, max_size=5)
+    assert pool.stats()['created'] == 0
+    with pool.connection():
+        stats = pool.stats()
+        assert (stats['created'], stats['in_use'], stats['idle']) == (3, 1, 2)
+    with pool.connection():
+        assert pool.stats()['created'] == 3
@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import populate_huge  # noqa: E402
+import sim_numpy  # noqa: E402
+
+EVENTS = [
+    'Turnover', 'Steal', 'Block', 'Offensive Rebound', 'Defensive Rebound', 'Personal Foul',
+    'Technical Foul', 'Flagrant Foul', 'Offensive Foul', 'Substitution', 'Free Throw Made',
+    'Free Throw Attempt', '2-Point Field Goal Made', '2-Point Field Goal Attempt',
+    '3-Point Field Goal Made', '3-Point Field Goal Attempt', 'Assist', 'Time running out',
+]
+EVENT_MAP = {name: i + 1 for i, name in enumerate(EVENTS)}
+POINTS = {EVENT_MAP['Free Throw Made']: 1, EVENT_MAP['2-Point Field Goal Made']: 2, EVENT_MAP['3-Point Field Goal Made']: 3}
+ROSTERS = {
+    1: {'coaches': [100], 'players': list(range(1, 13))},
+    2: {'coaches': [200], 'players': list(range(13, 25))},
+}
+MATCH_COUNT = 1500
+
+
+def play(engine, seed):
+    random.seed(seed)
+    matches = [(i, 1, 2, date(2020, 10, 1)) for i in range(MATCH_COUNT)]
+    return engine(matches, ROSTERS, EVENT_MAP)
+
+
+def summary(events, scores):
+    per_type = Counter(event_id for _, _, event_id, _ in events)
+    per_type = {event_id: count / MATCH_COUNT for event_id, count in per_type.items()}
+    score = np.array([(home, away) for _, home, away in scores], dtype=float)
+    return per_type, score
+
+
+def test_events_are_consistent_with_scores():
+    results, events, scores = play(sim_numpy.play_match_batch, 1)
+    start = datetime(2020, 10, 1)
+    points = Counter()
+    for match_id, person_id, event_id, game_time in events:
+        assert start < game_time <= start + timedelta(minutes=40)
+        side = 'home' if person_id in ROSTERS[1]['players'] + ROSTERS[1]['coaches'] else 'away'
+        points[(match_id, side)] += POINTS.get(event_id, 0)
+    for match_id, home, away in scores:
+        assert home != away
+        assert (points[(match_id, 'home')], points[(match_id, 'away')]) == (home, away)
+        assert results[match_id]['winner'] == (1 if home > away else 2)
+
+
+def test_numpy_engine_matches_python_engine_statistically():
+    _, py_events, py_scores = play(populate_huge.play_match_batch, 2)
+    _, np_events, np_scores = play(sim_numpy.play_match_batch, 3)
+    py_types, py_score = summary(py_events, py_scores)
+    np_types, np_score = summary(np_events, np_scores)
+
+    # Event rates per match agree within a few percent (or a fraction of an event for rare types)
+    for event_id in EVENT_MAP.values():
+        expected = py_types.get(event_id, 0)
+        assert abs(np_types.get(event_id, 0) - expected) <= max(0.3, 0.06 * expected), EVENTS[event_id - 1]
+
+    # Score distributions: means within four standard errors, similar spread and no home bias
+    stderr = py_score.std(axis=0) / np.sqrt(MATCH_COUNT)
+    assert np.all(np.abs(np_score.mean(axis=0) - py_score.mean(axis=0)) < 4 * np.sqrt(2) * stderr)
+    assert np.allclose(np_score.std(axis=0), py_score.std(axis=0), rtol=0.1)
+    home_wins = (np_score[:, 0] > np_score[:, 1]).mean()
+    assert abs(home_wins - (py_score[:, 0] > py_score[:, 1]).mean()) < 0.06
+
+
+def test_numpy_engine_is_reproducible():
+    assert play(sim_numpy.play_match_batch, 7) == play(sim_numpy.play_match_batch, 7)
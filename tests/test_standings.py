@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from model import compute_group_standings, snapshot_standings  # noqa: E402
+
+
+def match(home, away, home_score, away_score):
+    return {
+        'home_team_id': home, 'away_team_id': away,
+        'home_name': f"Team {home}", 'away_name': f"Team {away}",
+        'home_score': home_score, 'away_score': away_score,
+    }
+
+
+def test_groups_are_connected_components():
+    standings = compute_group_standings([
+        match(5, 3, 80, 70),
+        match(3, 9, 60, 61),
+        match(7, 2, 90, 50),
+    ])
+    groups = {row['name']: row['group_identifier'] for row in standings}
+    assert groups == {'Team 3': 3, 'Team 5': 3, 'Team 9': 3, 'Team 2': 2, 'Team 7': 2}
+    # Ordered by group, then rank
+    assert [row['group_identifier'] for row in standings] == [2, 2, 3, 3, 3]
+
+
+def test_ranking_wins_losses_and_point_diff():
+    standings = compute_group_standings([
+        match(1, 2, 70, 60),
+        match(2, 3, 55, 50),
+        match(3, 1, 40, 45),
+        match(4, 1, 66, 66),  # a drawn score counts as an away win
+    ])
+    rows = {row['id']: row for row in standings}
+    assert [row['id'] for row in standings] == [1, 2, 3, 4]
+    assert [row['group_rank'] for row in standings] == [1, 2, 3, 4]
+    assert (rows[1]['wins'], rows[1]['losses']) == (3, 0)
+    assert (rows[2]['wins'], rows[2]['losses']) == (1, 1)
+    assert (rows[4]['wins'], rows[4]['losses']) == (0, 1)
+    assert rows[1]['point_diff'] == 10 + 5 + 0
+    assert rows[3]['point_diff'] == -5 - 5
+
+
+def test_ties_on_wins_are_broken_by_team_id():
+    standings = compute_group_standings([match(8, 6, 10, 0), match(6, 8, 10, 0)])
+    assert [(row['id'], row['group_rank']) for row in standings] == [(6, 1), (8, 2)]
+
+
+def test_no_matches():
+    assert compute_group_standings([]) == []
+
+
+def snapshot_row(is_current, team_id=None, group=None):
+    return {'is_current': is_current, 'id': team_id, 'name': team_id and f"Team {team_id}", 'wins': 1, 'losses': 0,
+            'group_identifier': group, 'group_rank': 1, 'points_for': 70, 'points_against': 60}
+
+
+def test_snapshot_freshness_comes_from_the_phase_version():
+    assert snapshot_standings([]) is None
+    assert snapshot_standings([snapshot_row(0, 4, 4)]) is None
+    # A phase without completed matches has a current snapshot without teams
+    assert snapshot_standings([snapshot_row(1)]) == []
+    rows = snapshot_standings([snapshot_row(1, 4, 4), snapshot_row(1, 5)])
+    assert [row['id'] for row in rows] == [4, 5] and 'is_current' not in rows[0]
+    assert rows[0]['point_diff'] == 10 and 'point_diff' not in rows[1]
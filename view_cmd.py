@@ -102,6 +102,16 @@ def display_player_stats(stats):
     for row in stats:
         print(f"{row['match_id']:<8}{row['name']:<28}{str(row['game_time'])}") 
 
+def display_player_box_score(player_id, line):
+    """Displays a player's summed box score (career, season or match)."""
+    def pct(made, attempts):
+        return f"{made / attempts * 100:.1f}%" if attempts else "-"
+    print(f"\n--- Box Score for Player {player_id} ({line['games']} games) ---")
+    print(f"{'PTS':<6}{'FG2':<10}{'FG3':<10}{'FT':<10}{'OREB':<6}{'DREB':<6}{'AST':<6}{'STL':<6}{'BLK':<6}{'TOV':<6}{'PF'}")
+    print(f"{line['points']:<6}{line['fg2m']}/{line['fg2a']:<7}{line['fg3m']}/{line['fg3a']:<7}{line['ftm']}/{line['fta']:<7}"
+          f"{line['oreb']:<6}{line['dreb']:<6}{line['ast']:<6}{line['stl']:<6}{line['blk']:<6}{line['tov']:<6}{line['fouls']}")
+    print(f"FG2 {pct(line['fg2m'], line['fg2a'])}   FG3 {pct(line['fg3m'], line['fg3a'])}   FT {pct(line['ftm'], line['fta'])}")
+
 def display_match_stats(stats):
     """Displays a formatted page of match events."""
     print(f"{'ID':<8}{'Team':<24}{'Shirt':<8}{'Player':<20}{'Event':<28}{'Time'}")
@@ -165,10 +175,11 @@ def display_matches_for_team(team_name, matches):
         print("No matches found for this team.")
         return
 
-    print(f"{'ID':<10}{'Date':<15}{'Home Team':<25}{'Away Team':<25}")
-    print("-" * 75)
+    print(f"{'ID':<10}{'Date':<15}{'Status':<12}{'Home Team':<25}{'Away Team':<25}{'Score'}")
+    print("-" * 95)
     for match in matches:
-        print(f"{match['id']:<10}{str(match['match_date']):<15}{match['home_team_name']:<25}{match['away_team_name']:<25}")
+        score = f"{match['home_score']}-{match['away_score']}" if match['home_score'] is not None else ""
+        print(f"{match['id']:<10}{str(match['match_date']):<15}{match['status']:<12}{match['home_team_name']:<25}{match['away_team_name']:<25}{score}")
 
 
 def display_team_stadiums(stadiums):
@@ -374,6 +385,8 @@ def print_referee_creation_success(first_name, last_name): print(f"Referee '{fir
 def print_match_creation_success(match_id): print(f"Match created successfully with ID: {match_id}")
 def print_player_creation_success(first_name, last_name): print(f"Player '{first_name} {last_name}' created successfully.")
 def print_update_success(item): print(f"Successfully updated {item}.")
+def print_rebuild_success(item, count): print(f"Successfully rebuilt {item} ({count} rows).")
+def print_rebuild_failed(item): print(f"Failed to rebuild {item}. A database error occurred.")
 def print_update_failed(item): print(f"Failed to update {item}. The value may be a duplicate or a database error occurred.")
 def print_delete_success(item_type, item_id): print(f"Successfully deleted {item_type} with ID {item_id}.")
 def print_delete_failed(item_type, item_id, note=None):
@@ -408,6 +421,19 @@ def get_admin_password_input():
 def print_login_success(username): print(f"\nLogin successful! Welcome, {username}.")
 
 def print_login_failed(): print("\nLogin failed! Invalid username or password. Please try again.")
+def display_leaderboard(label, year, leaders):
+    """Displays a leaderboard returned by get_leaderboard()."""
+    print(f"\n--- {label} Leaders ({year if year else 'Career'}) ---")
+    if not leaders:
+        print("No players qualify for this leaderboard.")
+        return
+    shooting = 'attempts' in leaders[0]
+    print(f"{'#':<4}{'Player':<30}{'Games':<8}{label:<14}{'Made/Att' if shooting else ''}")
+    for rank, row in enumerate(leaders, 1):
+        name = f"{row['first_name']} {row['last_name']}"
+        extra = f"{row['made']}/{row['attempts']}" if shooting else ""
+        print(f"{rank:<4}{name:<30}{row['games']:<8}{str(row['value']):<14}{extra}")
+
 def display_season_mvp(year,player): print(f"\nThe {year} MVP is:", f"{player['first_name']} {player['last_name']} with a total of {player['total_points']} points.") 
 def get_new_admin_credentials():
     """Prompts user for new admin username and password."""